@@ -0,0 +1,136 @@
+"""Redis-backed caching utilities."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Callable
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared Redis connection (fail fast so an outage degrades to uncached behaviour)
+redis_client = redis.from_url(settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+
+# Namespaces with a global version counter
+LISTINGS_CACHE = "listings"
+
+# Single-flight lock settings
+LOCK_TTL = 10  # Seconds before a crashed recompute releases its lock
+LOCK_WAIT_ATTEMPTS = 20
+LOCK_WAIT_INTERVAL = 0.05
+
+
+def _version_key(namespace: str) -> str:
+    return f"cache:{namespace}:version"
+
+
+def _entry_key(namespace: str, params: dict) -> str:
+    """Build a cache key from the normalized query parameters."""
+    normalized = json.dumps(
+        {k: v for k, v in params.items() if v is not None}, sort_keys=True, default=str
+    )
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    return f"cache:{namespace}:{digest}"
+
+
+def bump_cache_version(namespace: str) -> None:
+    """
+    Invalidate every cached response in a namespace.
+
+    Entries are not deleted; they become stale and are revalidated on next access.
+
+    Args:
+        namespace: Cache namespace (e.g. LISTINGS_CACHE)
+    """
+    try:
+        redis_client.incr(_version_key(namespace))
+    except redis.RedisError as e:
+        logger.warning(f"Could not bump cache version for {namespace}: {e}")
+
+
+async def get_cached_response(
+    namespace: str,
+    params: dict,
+    compute: Callable[[], Any],
+    ttl: int = settings.listings_cache_ttl,
+    stale_ttl: int = settings.listings_cache_stale_ttl,
+) -> bytes:
+    """
+    Return a JSON response body from cache, recomputing it when needed.
+
+    Each entry records the namespace version it was computed under, so a version bump
+    makes it stale. Stale entries are served while a single caller, holding a Redis
+    lock, recomputes the value (stale-while-revalidate with single-flight). Without a
+    stale entry, other callers briefly wait for that recompute instead of all hitting
+    the database. If Redis is unavailable the value is computed directly.
+
+    Args:
+        namespace: Cache namespace sharing a version counter
+        params: Query parameters identifying the response
+        compute: Callable returning the JSON-serializable response data
+        ttl: Seconds an entry is considered fresh
+        stale_ttl: Extra seconds a stale entry may be served
+
+    Returns:
+        Serialized JSON body
+    """
+    key = _entry_key(namespace, params)
+    lock_key = f"{key}:lock"
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(_version_key(namespace))
+        pipe.hgetall(key)
+        raw_version, entry = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return _serialize(compute())
+
+    version = int(raw_version or 0)
+    if entry and int(entry[b"v"]) == version and float(entry[b"t"]) > time.time():
+        return entry[b"body"]
+
+    try:
+        acquired = redis_client.set(lock_key, "1", nx=True, ex=LOCK_TTL)
+    except redis.RedisError:
+        acquired = False
+
+    if not acquired:
+        if entry:
+            # Another caller is revalidating; serve the stale body meanwhile
+            return entry[b"body"]
+
+        for _ in range(LOCK_WAIT_ATTEMPTS):
+            await asyncio.sleep(LOCK_WAIT_INTERVAL)
+            try:
+                entry = redis_client.hgetall(key)
+            except redis.RedisError:
+                break
+            if entry and int(entry[b"v"]) == version:
+                return entry[b"body"]
+
+    try:
+        body = _serialize(compute())
+        try:
+            pipe = redis_client.pipeline()
+            pipe.hset(key, mapping={"v": version, "t": time.time() + ttl, "body": body})
+            pipe.expire(key, ttl + stale_ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not store cached response: {e}")
+        return body
+    finally:
+        if acquired:
+            try:
+                redis_client.delete(lock_key)
+            except redis.RedisError:
+                pass
+
+
+def _serialize(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
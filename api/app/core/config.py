@@ -25,6 +25,17 @@ class Settings(BaseSettings):
     api_port: int = 8000
     debug: bool = True
 
+    # Response cache
+    listings_cache_ttl: int = 30  # Seconds a cached listing response is served as fresh
+    listings_cache_stale_ttl: int = 300  # Extra seconds it may be served while revalidating
+
+    # Interaction write-behind
+    interactions_write_behind: bool = False  # Append swipes to a Redis Stream instead of the DB
+
+    # Interaction partitions
+    interactions_partitions_ahead: int = 3  # Future monthly partitions kept ready
+    interactions_skip_retention_months: int = 6  # Older skip partitions are archived to S3
+
     # Worker
     redis_queue_url: str = "redis://localhost:6379/1"
 
@@ -0,0 +1,121 @@
+"""Denormalized conversation state maintained on message writes."""
+
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models.match import Match
+from app.models.message import Conversation, Message, UserUnreadCounter
+
+
+def unread_column(match: Match, user_id: int) -> str:
+    """Name of the conversation column holding a participant's unread count."""
+    return "user1_unread" if user_id == match.user1_id else "user2_unread"
+
+
+def counts_toward_badge(match: Match) -> bool:
+    """Whether the match's unread messages are included in the users' unread badge."""
+    return bool(match.is_active) and not match.unmatched
+
+
+def adjust_unread_counter(db: Session, user_id: int, delta: int) -> None:
+    """
+    Add to a user's unread badge counter with one upsert, never going below zero.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        delta: Change in unread messages
+    """
+    stmt = dialect_insert(db, UserUnreadCounter).values(user_id=user_id, unread_count=max(delta, 0))
+    updated = UserUnreadCounter.unread_count + delta
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread_count": case((updated > 0, updated), else_=0)},
+    )
+    db.execute(stmt)
+
+
+def record_message(db: Session, match: Match, message: Message) -> None:
+    """
+    Add a newly inserted message to its conversation summary (caller commits).
+
+    One upsert: the last message moves forward only if this message is newer (so
+    concurrent sends cannot move it back) and the recipient's unread count goes up.
+    The recipient's unread badge counter goes up too while the match is active.
+
+    Args:
+        db: Database session
+        match: Match the message was sent in
+        message: Flushed message
+    """
+    recipient_id = match.user2_id if message.sender_id == match.user1_id else match.user1_id
+    column = unread_column(match, recipient_id)
+
+    stmt = dialect_insert(db, Conversation).values(
+        match_id=match.id,
+        last_message_id=message.id,
+        last_message_at=message.created_at,
+        last_sender_id=message.sender_id,
+        **{column: 1},
+    )
+    newer = stmt.excluded.last_message_id > func.coalesce(Conversation.last_message_id, 0)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["match_id"],
+        set_={
+            **{
+                field: case((newer, stmt.excluded[field]), else_=getattr(Conversation, field))
+                for field in ("last_message_id", "last_message_at", "last_sender_id")
+            },
+            column: getattr(Conversation, column) + 1,
+        },
+    )
+    db.execute(stmt)
+
+    if counts_toward_badge(match):
+        adjust_unread_counter(db, recipient_id, 1)
+
+
+def record_read(db: Session, match: Match, reader_id: int, count: int) -> None:
+    """
+    Take messages that were just marked read off the reader's unread counts.
+
+    Args:
+        db: Database session
+        match: Match the messages belong to
+        reader_id: User who read them
+        count: Number of messages that changed from unread to read
+    """
+    if count <= 0:
+        return
+
+    unread = getattr(Conversation, unread_column(match, reader_id))
+    db.execute(
+        update(Conversation)
+        .where(Conversation.match_id == match.id)
+        .values({unread: case((unread > count, unread - count), else_=0)})
+    )
+
+    if counts_toward_badge(match):
+        adjust_unread_counter(db, reader_id, -count)
+
+
+def record_unmatch(db: Session, match: Match) -> None:
+    """
+    Take an active match's unread messages off both users' badge counters.
+
+    Call before marking the match inactive (caller commits).
+
+    Args:
+        db: Database session
+        match: Match being unmatched
+    """
+    if not counts_toward_badge(match):
+        return
+
+    conversation = db.get(Conversation, match.id)
+    if conversation is None:
+        return
+
+    adjust_unread_counter(db, match.user1_id, -conversation.user1_unread)
+    adjust_unread_counter(db, match.user2_id, -conversation.user2_unread)
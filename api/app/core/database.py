@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
@@ -17,3 +18,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def dialect_insert(db: Session, model):
+    """INSERT supporting ON CONFLICT for the session's database."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
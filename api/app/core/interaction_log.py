@@ -0,0 +1,176 @@
+"""Write-behind log for interactions backed by a Redis Stream."""
+
+import logging
+import uuid
+from datetime import datetime
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.cache import redis_client
+from app.core.database import dialect_insert
+from app.core.matching import create_matches_for_likes
+from app.models.interaction import Interaction, InteractionType, UserInteractionCounter
+from app.models.match import Match
+
+logger = logging.getLogger(__name__)
+
+# Stream holding accepted swipes until the writer flushes them to Postgres
+INTERACTION_STREAM = "interactions:log"
+INTERACTION_WRITERS = "interaction-writers"  # Consumer group
+# Events the writer could not insert, kept for inspection and manual replay
+INTERACTION_DEAD_LETTERS = "interactions:dead"
+DEAD_LETTER_MAXLEN = 10_000
+
+
+def insert_interactions(
+    db: Session, rows: List[dict], ignore_duplicates: bool = False
+) -> Tuple[List[Interaction], Dict[int, Match]]:
+    """
+    Insert interactions with a single multi-row INSERT (caller commits).
+
+    The users' interaction counters are incremented and matches completed by
+    reciprocated likes are created in the same transaction.
+
+    Args:
+        db: Database session
+        rows: Column values for each interaction
+        ignore_duplicates: Skip rows whose idempotency_key was already written
+
+    Returns:
+        Inserted interactions (in input order unless duplicates are ignored), and the
+        matches they created keyed by interaction ID
+    """
+    stmt = dialect_insert(db, Interaction)
+
+    if ignore_duplicates:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=["idempotency_key", "created_at", "action"]
+        )
+        interactions = db.scalars(stmt.returning(Interaction), rows).all()
+    else:
+        interactions = db.scalars(
+            stmt.returning(Interaction, sort_by_parameter_order=True), rows
+        ).all()
+
+    increment_interaction_counters(db, interactions)
+    matches = create_matches_for_likes(interactions, db)
+    return interactions, matches
+
+
+def increment_interaction_counters(db: Session, interactions: List[Interaction]) -> None:
+    """
+    Add newly inserted interactions to their users' counters with one upsert.
+
+    Args:
+        db: Database session
+        interactions: Interactions inserted in the current transaction
+    """
+    totals: Dict[int, Counter] = {}
+    for interaction in interactions:
+        column = UserInteractionCounter.column_for(interaction.action)
+        totals.setdefault(interaction.user_id, Counter())[column] += 1
+
+    if not totals:
+        return
+
+    columns = [UserInteractionCounter.column_for(action) for action in InteractionType]
+    # Sorted so concurrent flushes lock counter rows in the same order
+    rows = [
+        {"user_id": user_id, **{column: counts[column] for column in columns}}
+        for user_id, counts in sorted(totals.items())
+    ]
+
+    stmt = dialect_insert(db, UserInteractionCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            column: getattr(UserInteractionCounter, column) + stmt.excluded[column]
+            for column in columns
+        },
+    )
+    db.execute(stmt)
+
+
+def build_interaction_event(
+    user_id: int, target_type: str, target_id: int, action: InteractionType
+) -> dict:
+    """
+    Build a log event for a validated swipe.
+
+    The event gets its idempotency key and timestamp when accepted, so a redelivered
+    event is written once (to the same partition) and keeps the time the user swiped.
+    """
+    return {
+        "idempotency_key": str(uuid.uuid4()),
+        "user_id": user_id,
+        "target_type": target_type,
+        "target_id": target_id,
+        "action": action.value,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def append_interaction_event(event: dict) -> bool:
+    """
+    Append a swipe event to the interaction log.
+
+    Args:
+        event: Event from build_interaction_event
+
+    Returns:
+        True if the event was appended, False if Redis is unavailable
+    """
+    try:
+        redis_client.xadd(INTERACTION_STREAM, {k: str(v) for k, v in event.items()})
+        return True
+    except redis.RedisError as e:
+        logger.warning(f"Interaction log unavailable, writing synchronously: {e}")
+        return False
+
+
+def parse_interaction_event(fields: dict) -> dict:
+    """
+    Convert raw stream fields into interaction column values.
+
+    Raises:
+        KeyError, ValueError: If the event is malformed
+    """
+    fields = {k.decode(): v.decode() for k, v in fields.items()}
+    return {
+        "idempotency_key": fields["idempotency_key"],
+        "user_id": int(fields["user_id"]),
+        "target_type": fields["target_type"],
+        "target_id": int(fields["target_id"]),
+        "action": InteractionType(fields["action"]),
+        "created_at": datetime.fromisoformat(fields["created_at"]),
+    }
+
+
+def get_interaction_log_stats() -> Optional[dict]:
+    """
+    Report how far the interaction writers are behind.
+
+    Returns:
+        Stream length, pending (delivered but unacknowledged) and lag (not yet delivered)
+        event counts, or None if Redis is unavailable
+    """
+    try:
+        length = redis_client.xlen(INTERACTION_STREAM)
+        groups = redis_client.xinfo_groups(INTERACTION_STREAM) if length else []
+    except redis.ResponseError:
+        # Stream does not exist yet
+        return {"length": 0, "pending": 0, "lag": 0}
+    except redis.RedisError:
+        return None
+
+    for group in groups:
+        name = group["name"]
+        if (name.decode() if isinstance(name, bytes) else name) == INTERACTION_WRITERS:
+            # "lag" is reported by Redis 7+; older servers only know the stream length
+            lag = group.get("lag")
+            return {"length": length, "pending": group["pending"], "lag": lag}
+
+    return {"length": length, "pending": 0, "lag": length}
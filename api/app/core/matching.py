@@ -0,0 +1,166 @@
+"""Match detection on the interaction write path."""
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.core.realtime import publish_event
+from app.core.targets import get_targets
+from app.models.interaction import Interaction, InteractionType
+from app.models.match import Match
+from app.models.profile import Profile
+from app.schemas.match import MatchResponse
+
+
+def match_pair(user_a: int, user_b: int) -> Tuple[int, int]:
+    """Canonical (user1_id, user2_id) of a match between two users."""
+    return (user_a, user_b) if user_a < user_b else (user_b, user_a)
+
+
+def create_matches(
+    pairs: Iterable[Tuple[int, int]], db: Session, match_type: str = "like"
+) -> Dict[Tuple[int, int], Match]:
+    """
+    Create matches for user pairs that do not have one yet (caller commits).
+
+    A single INSERT ... ON CONFLICT DO NOTHING RETURNING on the canonical pair, so
+    the existence check and the creation are one race-free round trip.
+
+    Args:
+        pairs: (user_id, user_id) pairs in any order
+        db: Database session
+        match_type: Type of the new matches
+
+    Returns:
+        Newly created matches keyed by canonical pair; existing pairs are omitted
+    """
+    # Sorted so concurrent writers lock the unique index entries in the same order
+    pairs = sorted({match_pair(*pair) for pair in pairs})
+    if not pairs:
+        return {}
+
+    stmt = dialect_insert(db, Match).on_conflict_do_nothing(index_elements=["user1_id", "user2_id"])
+    matches = db.scalars(
+        stmt.returning(Match),
+        [{"user1_id": a, "user2_id": b, "match_type": match_type} for a, b in pairs],
+    ).all()
+    return {(match.user1_id, match.user2_id): match for match in matches}
+
+
+def find_reverse_likes(pairs: Iterable[Tuple[int, int]], db: Session) -> Set[Tuple[int, int]]:
+    """
+    Find which (user_id, profile_id) pairs are existing profile likes.
+
+    One lookup on the dedupe index, whatever the number of pairs.
+
+    Args:
+        pairs: (user_id, profile_id) pairs to look for
+        db: Database session
+
+    Returns:
+        The pairs for which the user has liked the profile
+    """
+    pairs = list(set(pairs))
+    if not pairs:
+        return set()
+
+    rows = db.execute(
+        select(Interaction.user_id, Interaction.target_id).where(
+            tuple_(Interaction.user_id, Interaction.target_id).in_(pairs),
+            Interaction.target_type == "profile",
+            Interaction.action == InteractionType.LIKE,
+        )
+    ).all()
+    return {tuple(row) for row in rows}
+
+
+def lock_pairs(pairs: Iterable[Tuple[int, int]], db: Session) -> None:
+    """
+    Serialize match detection per user pair until the transaction ends (Postgres only).
+
+    Transaction-scoped advisory locks on the canonical pairs, taken in sorted order
+    (volatile select-list functions are evaluated after ORDER BY) so concurrent
+    writers cannot deadlock on them.
+    """
+    pairs = sorted({match_pair(*pair) for pair in pairs})
+    if not pairs or db.get_bind().dialect.name != "postgresql":
+        return
+
+    db.execute(
+        text(
+            "SELECT pg_advisory_xact_lock(user1_id, user2_id)"
+            " FROM unnest(CAST(:user1_ids AS integer[]), CAST(:user2_ids AS integer[]))"
+            " AS pairs(user1_id, user2_id) ORDER BY user1_id, user2_id"
+        ),
+        {"user1_ids": [a for a, _ in pairs], "user2_ids": [b for _, b in pairs]},
+    )
+
+
+def create_matches_for_likes(interactions: List[Interaction], db: Session) -> Dict[int, Match]:
+    """
+    Create matches for newly inserted profile likes that are reciprocated.
+
+    A like from user A on profile P is reciprocated when P's owner B has liked A's
+    profile. Owners come from the target cache, the reverse likes from one indexed
+    query, and the matches are inserted in the caller's transaction (caller commits).
+
+    Args:
+        interactions: Interactions just inserted in the current transaction
+        db: Database session
+
+    Returns:
+        Mapping of interaction ID to the new match it completed
+    """
+    likes = [
+        i for i in interactions if i.action == InteractionType.LIKE and i.target_type == "profile"
+    ]
+    if not likes:
+        return {}
+
+    owners = get_targets((("profile", i.target_id) for i in likes), db)
+    liker_profiles = dict(
+        db.execute(
+            select(Profile.user_id, Profile.id).where(
+                Profile.user_id.in_({i.user_id for i in likes})
+            )
+        ).all()
+    )
+
+    # interaction id -> (liker, liked profile's owner, liker's profile)
+    candidates = {}
+    for like in likes:
+        target = owners.get(("profile", like.target_id))
+        liker_profile = liker_profiles.get(like.user_id)
+        if target and liker_profile and target.owner_id != like.user_id:
+            candidates[like.id] = (like.user_id, target.owner_id, liker_profile)
+
+    # If A likes B while B likes A, each transaction runs before the other commits,
+    # and under READ COMMITTED neither would see the other's like, so no match would
+    # ever be created (ON CONFLICT only prevents duplicates). Locking the pair makes
+    # the second transaction wait for the first to commit; its reverse-like lookup,
+    # a new statement, then sees the committed like and creates the match.
+    lock_pairs(((liker_id, owner_id) for liker_id, owner_id, _ in candidates.values()), db)
+    reverse = find_reverse_likes(
+        ((owner_id, liker_profile) for _, owner_id, liker_profile in candidates.values()), db
+    )
+
+    reciprocated = {
+        interaction_id: match_pair(liker_id, owner_id)
+        for interaction_id, (liker_id, owner_id, liker_profile) in candidates.items()
+        if (owner_id, liker_profile) in reverse
+    }
+    created = create_matches(reciprocated.values(), db)
+
+    return {
+        interaction_id: created[pair]
+        for interaction_id, pair in reciprocated.items()
+        if pair in created
+    }
+
+
+def publish_matches(matches: Iterable[MatchResponse]) -> None:
+    """Push committed new matches to both users' connected clients."""
+    for match in {match.id: match for match in matches}.values():
+        publish_event([match.user1_id, match.user2_id], "match", match.model_dump(mode="json"))
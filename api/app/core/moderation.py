@@ -124,6 +124,21 @@ def should_auto_flag_listing(listing) -> Tuple[bool, str]:
     return False, ""
 
 
+def moderate_listings(listings: List) -> List[Tuple[bool, str]]:
+    """
+    Run should_auto_flag_listing over a batch of listings.
+
+    Module-level so it can be dispatched to a process pool.
+
+    Args:
+        listings: Listing-like objects to check
+
+    Returns:
+        List of (should_flag, reason) tuples in input order
+    """
+    return [should_auto_flag_listing(listing) for listing in listings]
+
+
 def should_auto_flag_profile(profile) -> Tuple[bool, str]:
     """
     Check if a profile should be auto-flagged.
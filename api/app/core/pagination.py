@@ -0,0 +1,60 @@
+"""Signed keyset pagination cursors."""
+
+import base64
+import hashlib
+import hmac
+import json
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+def _sign(payload: bytes) -> bytes:
+    """Sign a cursor payload with the application secret."""
+    return hmac.new(settings.jwt_secret.encode("utf-8"), payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Encode keyset values into an opaque, tamper-proof cursor.
+
+    Args:
+        values: JSON-serializable keyset values of the last row on a page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(values, separators=(",", ":"), sort_keys=True, default=str).encode()
+    token = _sign(payload) + payload
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """
+    Decode and verify a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page, or None
+
+    Returns:
+        Keyset values, or None if no cursor was given
+
+    Raises:
+        HTTPException: If the cursor is malformed or has been tampered with
+    """
+    if not cursor:
+        return None
+
+    try:
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        signature, payload = token[:16], token[16:]
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("Bad signature")
+        values = json.loads(payload)
+        if not isinstance(values, dict):
+            raise ValueError("Bad payload")
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
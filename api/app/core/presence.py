@@ -0,0 +1,92 @@
+"""Online presence and typing indicators kept in Redis with short TTLs."""
+
+import logging
+import time
+from typing import Iterable, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_PREFIX = "presence:user:"  # Set while the user has a live event connection
+PRESENCE_TTL = 45  # Seconds a user stays online after their last heartbeat
+HEARTBEAT_INTERVAL = 15  # Seconds between heartbeats for connected users
+
+TYPING_PREFIX = "typing:"  # One key per (match, typist) while typing events are coalesced
+TYPING_COALESCE_SECONDS = 3  # At most one typing event per user and match in this window
+
+
+def presence_key(user_id: int) -> str:
+    return f"{PRESENCE_PREFIX}{user_id}"
+
+
+async def heartbeat(client: aioredis.Redis, user_ids: Iterable[int]) -> None:
+    """
+    Mark users online for another PRESENCE_TTL seconds, in one pipeline.
+
+    Called by each process for the users it holds connections for; users whose
+    connections are gone simply expire, so nothing has to be cleaned up.
+
+    Args:
+        client: Async Redis client of the calling event loop
+        user_ids: Users with a live connection
+    """
+    now = int(time.time())
+    pipe = client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.set(presence_key(user_id), now, ex=PRESENCE_TTL)
+    await pipe.execute()
+
+
+def get_online(user_ids: Iterable[int]) -> Set[int]:
+    """
+    Return which of the given users are online, with a single MGET.
+
+    Cheap enough for list endpoints; if Redis is unavailable everyone is reported
+    offline rather than failing the request.
+
+    Args:
+        user_ids: Users to check, e.g. the other party of each match on a page
+
+    Returns:
+        IDs of the users that are online
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return set()
+
+    try:
+        values = redis_client.mget([presence_key(user_id) for user_id in user_ids])
+    except redis.RedisError as e:
+        logger.warning(f"Presence unavailable: {e}")
+        return set()
+
+    return {user_id for user_id, value in zip(user_ids, values) if value is not None}
+
+
+def claim_typing_event(match_id: int, user_id: int) -> bool:
+    """
+    Rate-limit typing events per user and match.
+
+    Keystrokes arrive far more often than anyone needs to be told; the first call in
+    each TYPING_COALESCE_SECONDS window claims it and the rest are coalesced into it.
+
+    Args:
+        match_id: Match being typed in
+        user_id: Typist
+
+    Returns:
+        True if a typing event should be published now
+    """
+    try:
+        return bool(
+            redis_client.set(
+                f"{TYPING_PREFIX}{match_id}:{user_id}", 1, nx=True, ex=TYPING_COALESCE_SECONDS
+            )
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Could not rate-limit typing event: {e}")
+        return False
@@ -0,0 +1,272 @@
+"""Real-time event fan-out to connected clients over Redis pub/sub and streams."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.cache import redis_client
+from app.core.config import settings
+from app.core.presence import HEARTBEAT_INTERVAL, heartbeat
+
+logger = logging.getLogger(__name__)
+
+EVENT_CHANNEL_PREFIX = "events:user:"  # One pub/sub channel per user
+EVENT_STREAM_PREFIX = "events:stream:"  # One Redis Stream per user, for resumable delivery
+EVENT_STREAM_MAXLEN = 500  # Events kept per user stream (approximate trimming)
+EVENT_STREAM_TTL = 86400  # Seconds an idle user's stream is kept (24 hours)
+OUTBOUND_QUEUE_SIZE = 256  # Events buffered per socket before it is dropped as too slow
+LISTEN_TIMEOUT = 1.0  # Seconds the listener waits for a message before checking again
+RECONNECT_DELAY = 1.0  # Seconds to back off after losing the Redis subscription
+
+# WebSocket close code telling a client it fell behind and should resync and reconnect
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def user_channel(user_id: int) -> str:
+    return f"{EVENT_CHANNEL_PREFIX}{user_id}"
+
+
+def user_stream(user_id: int) -> str:
+    return f"{EVENT_STREAM_PREFIX}{user_id}"
+
+
+def publish_event(
+    user_ids: Iterable[int], event_type: str, data: dict, ephemeral: bool = False
+) -> None:
+    """
+    Publish an event to users' connected clients on every node.
+
+    The event is appended to each user's bounded stream before it is published, so
+    Server-Sent Events clients can resume from the last event they saw. Best effort:
+    clients that miss an event catch up through the REST endpoints, so a Redis outage
+    only delays updates until the next poll.
+
+    Args:
+        user_ids: Recipients
+        event_type: Event name, e.g. "message", "read", "match"
+        data: JSON-serializable event payload
+        ephemeral: Only push to connected clients, without adding the event to the
+            replay streams (e.g. typing indicators, stale by the time anyone resumes)
+    """
+    event = {"type": event_type, "data": data}
+    if ephemeral:
+        event["ephemeral"] = True
+    payload = json.dumps(event, default=str)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id in set(user_ids):
+            if not ephemeral:
+                stream = user_stream(user_id)
+                pipe.xadd(
+                    stream, {"payload": payload}, maxlen=EVENT_STREAM_MAXLEN, approximate=True
+                )
+                pipe.expire(stream, EVENT_STREAM_TTL)
+            pipe.publish(user_channel(user_id), payload)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish {event_type} event: {e}")
+
+
+def is_ephemeral(payload: str) -> bool:
+    """Whether a published payload is an ephemeral event, absent from the replay streams."""
+    return json.loads(payload).get("ephemeral", False)
+
+
+class Connection:
+    """One client socket's bounded outbound queue."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self.overflowed = False
+
+    def offer(self, payload: str) -> None:
+        """
+        Queue an event without blocking the fan-out.
+
+        A client that lets its queue fill up is not waited for: its backlog is dropped
+        and a None sentinel tells its sender to close the socket, so the client
+        reconnects and resyncs instead of slowing down everyone else.
+        """
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class RealtimeHub:
+    """
+    Per-process registry of client connections sharing one Redis subscription.
+
+    The process holds a single pub/sub connection, subscribed to the channel of each
+    user with at least one local socket, and a single listener task dispatching
+    events to those sockets' queues. A heartbeat task keeps those users marked online
+    with one pipeline per interval.
+    """
+
+    def __init__(self):
+        self._connections: Dict[int, Set[Connection]] = {}
+        self._pubsub: Optional[aioredis.client.PubSub] = None
+        self._client: Optional[aioredis.Redis] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._heartbeats: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self._connections.values())
+
+    async def connect(self, user_id: int) -> Connection:
+        """Register a socket for a user, subscribing to their channel if needed."""
+        self._ensure_listener()
+        connection = Connection(user_id)
+        connections = self._connections.setdefault(user_id, set())
+        connections.add(connection)
+        if len(connections) == 1:
+            await self._subscribe(user_channel(user_id))
+            await self._heartbeat([user_id])
+        return connection
+
+    async def disconnect(self, connection: Connection) -> None:
+        """Unregister a socket, unsubscribing from its user's channel if it was the last."""
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if not connections:
+            del self._connections[connection.user_id]
+            await self._unsubscribe(user_channel(connection.user_id))
+
+    def dispatch(self, user_id: int, payload: str) -> None:
+        """Queue an event for every local socket of a user."""
+        for connection in list(self._connections.get(user_id, ())):
+            connection.offer(payload)
+
+    async def latest_event_id(self, user_id: int) -> str:
+        """ID of the newest event in a user's stream, or "0-0" if it is empty."""
+        entries = await self._redis().xrevrange(user_stream(user_id), count=1)
+        return entries[0][0].decode() if entries else "0-0"
+
+    async def read_events(
+        self, user_id: int, after_id: str, count: int = EVENT_STREAM_MAXLEN
+    ) -> List[Tuple[str, str]]:
+        """
+        Read the events in a user's stream after an event ID.
+
+        Args:
+            user_id: Recipient
+            after_id: Stream ID of the last event the client saw (exclusive)
+            count: Maximum number of events to return
+
+        Returns:
+            (event ID, payload) pairs, oldest first
+        """
+        entries = await self._redis().xrange(user_stream(user_id), min=f"({after_id}", count=count)
+        return [(entry_id.decode(), fields[b"payload"].decode()) for entry_id, fields in entries]
+
+    async def has_event(self, user_id: int, event_id: str) -> bool:
+        """Whether an event is still in a user's stream (not yet trimmed or expired)."""
+        entries = await self._redis().xrange(user_stream(user_id), min=event_id, max=event_id)
+        return bool(entries)
+
+    def _redis(self) -> aioredis.Redis:
+        self._ensure_listener()
+        if self._client is None:
+            self._client = aioredis.from_url(
+                settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return self._client
+
+    def _ensure_listener(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._listener is None or self._listener.done():
+            # First use, or the previous loop is gone (the pub/sub connection was bound to it)
+            self._loop = loop
+            self._pubsub = None
+            self._client = None
+            self._listener = loop.create_task(self._listen())
+            self._heartbeats = loop.create_task(self._send_heartbeats())
+
+    @staticmethod
+    def _open_pubsub() -> aioredis.client.PubSub:
+        # No socket timeout: the connection is idle between events by design
+        client = aioredis.from_url(settings.redis_url, socket_connect_timeout=0.5)
+        return client.pubsub()
+
+    async def _subscribe(self, channel: str) -> None:
+        try:
+            if self._pubsub is None:
+                self._pubsub = self._open_pubsub()
+            await self._pubsub.subscribe(channel)
+        except (redis.RedisError, OSError) as e:
+            # The listener resubscribes every local user once Redis is back
+            logger.warning(f"Could not subscribe to {channel}: {e}")
+            await self._reset()
+
+    async def _unsubscribe(self, channel: str) -> None:
+        if self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(channel)
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Could not unsubscribe from {channel}: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._pubsub is None and self._connections:
+                    self._pubsub = self._open_pubsub()
+                    await self._pubsub.subscribe(*(user_channel(u) for u in self._connections))
+
+                if self._pubsub is None or not self._pubsub.subscribed:
+                    await asyncio.sleep(LISTEN_TIMEOUT)
+                    continue
+
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=LISTEN_TIMEOUT
+                )
+                if message and message["type"] == "message":
+                    channel = message["channel"].decode()
+                    self.dispatch(
+                        int(channel[len(EVENT_CHANNEL_PREFIX) :]), message["data"].decode()
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Realtime subscription lost, reconnecting: {e}")
+                await self._reset()
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _send_heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            if self._connections:
+                await self._heartbeat(list(self._connections))
+
+    async def _heartbeat(self, user_ids: Iterable[int]) -> None:
+        try:
+            await heartbeat(self._redis(), user_ids)
+        except (redis.RedisError, OSError) as e:
+            logger.warning(f"Could not refresh presence: {e}")
+
+    async def _reset(self) -> None:
+        """Drop the pub/sub connection so the listener opens and resubscribes a new one."""
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+# Shared by all sockets in this process
+hub = RealtimeHub()
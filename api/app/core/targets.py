@@ -0,0 +1,162 @@
+"""Cached owner lookups for profiles and listings targeted by interactions and reports."""
+
+import logging
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import redis_client
+from app.models.listing import Listing
+from app.models.profile import Profile
+
+logger = logging.getLogger(__name__)
+
+TARGET_MODELS = {"profile": Profile, "listing": Listing}
+
+# In-process tier. Other processes only invalidate Redis, so entries are kept briefly.
+LOCAL_TTL = 10
+LOCAL_MAX_ENTRIES = 100_000
+
+# Bounds how long a value written back by a racing read can outlive an invalidation
+REDIS_TTL = 3600
+
+
+class TargetInfo(NamedTuple):
+    """Owner and visibility of a profile or listing (inactive ones cannot be targeted)."""
+
+    owner_id: int
+    is_active: bool
+
+
+_local: Dict[Tuple[str, int], Tuple[TargetInfo, float]] = {}
+
+
+def _redis_key(target_type: str) -> str:
+    return f"targets:{target_type}"
+
+
+def _encode(info: TargetInfo) -> str:
+    return f"{info.owner_id}:{int(info.is_active)}"
+
+
+def _decode(value: bytes) -> TargetInfo:
+    owner_id, is_active = value.split(b":")
+    return TargetInfo(int(owner_id), is_active == b"1")
+
+
+def _remember(key: Tuple[str, int], info: TargetInfo) -> None:
+    if len(_local) >= LOCAL_MAX_ENTRIES:
+        _local.clear()
+    _local[key] = (info, time.monotonic() + LOCAL_TTL)
+
+
+def get_targets(
+    targets: Iterable[Tuple[str, int]], db: Session
+) -> Dict[Tuple[str, int], TargetInfo]:
+    """
+    Resolve the owner and active flag of profiles and listings.
+
+    Lookups go through an in-process tier, then one Redis HMGET per target type, and
+    finally one primary-key query per target type for the remaining ids. Missing
+    targets are not cached, so newly created ones are found immediately.
+
+    Args:
+        targets: (target_type, target_id) pairs
+        db: Database session
+
+    Returns:
+        Mapping of (target_type, target_id) to TargetInfo for targets that exist
+    """
+    now = time.monotonic()
+    found: Dict[Tuple[str, int], TargetInfo] = {}
+    missing_by_type: Dict[str, set] = {}
+
+    for key in set(targets):
+        cached = _local.get(key)
+        if cached and cached[1] > now:
+            found[key] = cached[0]
+        else:
+            missing_by_type.setdefault(key[0], set()).add(key[1])
+
+    for target_type, ids in missing_by_type.items():
+        ids = sorted(ids)
+
+        try:
+            values = redis_client.hmget(_redis_key(target_type), ids)
+        except redis.RedisError as e:
+            logger.warning(f"Target cache unavailable: {e}")
+            values = [None] * len(ids)
+
+        unresolved = []
+        for target_id, value in zip(ids, values):
+            if value is None:
+                unresolved.append(target_id)
+            else:
+                found[(target_type, target_id)] = _decode(value)
+                _remember((target_type, target_id), found[(target_type, target_id)])
+
+        if not unresolved:
+            continue
+
+        model = TARGET_MODELS[target_type]
+        rows = db.execute(
+            select(model.id, model.user_id, model.is_active).where(model.id.in_(unresolved))
+        ).all()
+
+        loaded = {}
+        for target_id, owner_id, is_active in rows:
+            info = TargetInfo(owner_id, bool(is_active))
+            found[(target_type, target_id)] = info
+            _remember((target_type, target_id), info)
+            loaded[target_id] = _encode(info)
+
+        if loaded:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hset(_redis_key(target_type), mapping=loaded)
+                pipe.expire(_redis_key(target_type), REDIS_TTL, nx=True)
+                pipe.execute()
+            except redis.RedisError:
+                pass
+
+    return found
+
+
+def get_target(target_type: str, target_id: int, db: Session) -> Optional[TargetInfo]:
+    """
+    Resolve the owner and active flag of a single profile or listing.
+
+    Args:
+        target_type: "profile" or "listing"
+        target_id: ID of the target
+        db: Database session
+
+    Returns:
+        TargetInfo, or None if the target does not exist
+    """
+    return get_targets([(target_type, target_id)], db).get((target_type, target_id))
+
+
+def invalidate_target(target_type: str, target_id: int) -> None:
+    """
+    Drop a cached target after it is deactivated, reactivated or deleted.
+
+    Call after the change is committed.
+
+    Args:
+        target_type: "profile" or "listing"
+        target_id: ID of the target
+    """
+    _local.pop((target_type, target_id), None)
+    try:
+        redis_client.hdel(_redis_key(target_type), target_id)
+    except redis.RedisError as e:
+        logger.warning(f"Could not invalidate cached {target_type} {target_id}: {e}")
+
+
+def clear_local_targets() -> None:
+    """Empty the in-process tier."""
+    _local.clear()
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.monitoring import MetricsMiddleware, get_metrics_summary
+from app.core.interaction_log import get_interaction_log_stats
 from app.routers import (
     auth,
     profiles,
@@ -14,6 +15,7 @@ from app.routers import (
     reports,
     admin,
     payments,
+    events,
 )
 
 app = FastAPI(
@@ -46,6 +48,7 @@ app.include_router(messages.router)
 app.include_router(reports.router)
 app.include_router(admin.router)
 app.include_router(payments.router)
+app.include_router(events.router)
 
 
 @app.get("/health")
@@ -57,7 +60,7 @@ async def health_check():
 @app.get("/metrics")
 async def metrics_endpoint():
     """Get API metrics for monitoring."""
-    return get_metrics_summary()
+    return {**get_metrics_summary(), "interaction_log": get_interaction_log_stats()}
 
 
 @app.get("/")
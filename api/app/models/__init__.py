@@ -1,9 +1,9 @@
 from app.models.user import User, UserRole
 from app.models.profile import Profile
 from app.models.listing import Listing, ListingStatus
-from app.models.interaction import Interaction, InteractionType
+from app.models.interaction import Interaction, InteractionType, UserInteractionCounter
 from app.models.match import Match
-from app.models.message import Message
+from app.models.message import Message, Conversation, UserUnreadCounter
 from app.models.report import Report, ReportStatus, ReportType
 from app.models.payment import Payment, PaymentStatus, PaymentType
 
@@ -15,8 +15,11 @@ __all__ = [
     "ListingStatus",
     "Interaction",
     "InteractionType",
+    "UserInteractionCounter",
     "Match",
     "Message",
+    "Conversation",
+    "UserUnreadCounter",
     "Report",
     "ReportStatus",
     "ReportType",
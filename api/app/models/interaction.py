@@ -3,13 +3,14 @@
 from sqlalchemy import (
     Column,
     Integer,
+    SmallInteger,
     String,
     ForeignKey,
     DateTime,
-    Enum as SQLEnum,
     Index,
     UniqueConstraint,
 )
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -25,35 +26,134 @@ class InteractionType(str, enum.Enum):
     SUPER_LIKE = "super_like"  # Future enhancement
 
 
+# Stored smallint codes. Codes are persisted: never renumber, only append.
+TARGET_TYPE_CODES = {"profile": 1, "listing": 2}
+ACTION_CODES = {
+    InteractionType.LIKE: 1,
+    InteractionType.SKIP: 2,
+    InteractionType.APPLY: 3,
+    InteractionType.SUPER_LIKE: 4,
+}
+
+
+class CodedValue(TypeDecorator):
+    """Store a small fixed set of values as smallint codes (see subclasses)."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    codes: dict = {}
+    decoded: dict = {}
+    value_type = str
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.decoded = {code: value for value, code in cls.codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self.codes[self.value_type(value)]
+        except (KeyError, ValueError):
+            raise ValueError(f"{value!r} has no stored code")
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.decoded[value]
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+
+class TargetTypeCode(CodedValue):
+    """Interaction target type ("profile" or "listing") stored as a smallint."""
+
+    # SQLAlchemy only honours cache_ok set on the class itself
+    cache_ok = True
+    codes = TARGET_TYPE_CODES
+
+
+class ActionCode(CodedValue):
+    """InteractionType stored as a smallint."""
+
+    cache_ok = True
+    codes = ACTION_CODES
+    value_type = InteractionType
+
+
 class Interaction(Base):
-    """Interaction model for user actions."""
+    """
+    Interaction model for user actions.
+
+    In Postgres the table is range partitioned by month on created_at, and each month
+    is list partitioned by action so skips can be archived separately. Partitions are
+    created by migrations and app.tasks.interactions, not by create_all; the primary
+    key there is (id, created_at, action).
+    """
 
     __tablename__ = "interactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Columns are ordered widest first so rows pack without alignment padding
+    id = Column(Integer, primary_key=True)
 
     # User who performed the action
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
     # Target could be a profile or listing
-    target_type = Column(String(20), nullable=False)  # "profile" or "listing"
-    target_id = Column(Integer, nullable=False, index=True)
+    target_id = Column(Integer, nullable=False)
+    target_type = Column(TargetTypeCode, nullable=False)  # "profile" or "listing"
 
     # Action type
-    action = Column(SQLEnum(InteractionType, native_enum=False), nullable=False, index=True)
+    action = Column(ActionCode, nullable=False)
 
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Set for swipes written through the interaction log so redelivered events are ignored
+    idempotency_key = Column(String(36), nullable=True)
 
     # Relationships - use backref to avoid circular imports
     user = relationship("User", foreign_keys=[user_id])
 
-    # Composite unique constraint to prevent duplicates
     __table_args__ = (
-        Index("idx_user_target_type_action", "user_id", "target_type", "target_id", "action"),
+        # Duplicate-swipe checks: an index-only scan, with created_at read from the index
+        Index(
+            "idx_interactions_dedupe",
+            "user_id",
+            "target_type",
+            "target_id",
+            "action",
+            postgresql_include=["created_at"],
+        ),
+        # Unique constraints on a partitioned table must include the partition keys
+        UniqueConstraint(
+            "idempotency_key", "created_at", "action", name="uq_interactions_idempotency_key"
+        ),
     )
 
     def __repr__(self):
         return f"<Interaction {self.id}: {self.user_id} {self.action} {self.target_type} {self.target_id}>"
+
+
+class UserInteractionCounter(Base):
+    """Per-user interaction totals, maintained alongside every interaction insert."""
+
+    __tablename__ = "user_interaction_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    skip_count = Column(Integer, nullable=False, default=0, server_default="0")
+    apply_count = Column(Integer, nullable=False, default=0, server_default="0")
+    super_like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Skips moved to cold storage with their partitions; included in skip_count
+    archived_skip_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    @staticmethod
+    def column_for(action: InteractionType) -> str:
+        """Name of the counter column for an action."""
+        return f"{action.value}_count"
+
+    def __repr__(self):
+        return f"<UserInteractionCounter {self.user_id}>"
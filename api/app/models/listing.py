@@ -10,12 +10,17 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Enum as SQLEnum,
+    Index,
+    and_,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.core.database import Base
 
+# Hourly rates are annualized as 40 hours/week for 50 weeks/year
+ANNUAL_HOURS = 40 * 50
+
 
 class ListingStatus(str, enum.Enum):
     """Listing status enum."""
@@ -51,14 +56,18 @@ class Listing(Base):
     hourly_rate = Column(Numeric(10, 2), nullable=True)
     equity_offered = Column(Boolean, default=False)
 
+    # Annualized compensation bounds used by the salary filters (see update_annual_compensation)
+    comp_annual_min = Column(Numeric(12, 2), nullable=True)
+    comp_annual_max = Column(Numeric(12, 2), nullable=True)
+
     # Listing metadata
     status = Column(
         SQLEnum(ListingStatus, native_enum=False), default=ListingStatus.DRAFT, index=True
     )
     media_refs = Column(String(1000), nullable=True)  # JSON array as string
 
-    # Boost/sponsor
-    is_boosted = Column(Boolean, default=False, index=True)
+    # Boost/sponsor (is_boosted is cleared by the expire_boosts job once boosted_until passes)
+    is_boosted = Column(Boolean, default=False)
     boosted_until = Column(DateTime, nullable=True)
 
     # Moderation
@@ -74,5 +83,68 @@ class Listing(Base):
     user = relationship("User", back_populates="listings")
     # interactions handled dynamically based on target_type and target_id
 
+    __table_args__ = (
+        Index("idx_listings_status_active_comp_max", "status", "is_active", "comp_annual_max"),
+        Index("idx_listings_status_active_comp_min", "status", "is_active", "comp_annual_min"),
+    )
+
+    def update_annual_compensation(self):
+        """
+        Recompute the annualized compensation bounds.
+
+        Must be called whenever salary_min, salary_max or hourly_rate change so the
+        salary filters can seek on comp_annual_min/comp_annual_max.
+        """
+        self.comp_annual_min, self.comp_annual_max = annualize_compensation(
+            self.salary_min, self.salary_max, self.hourly_rate
+        )
+
+    @classmethod
+    def boost_active(cls, now):
+        """SQL expression that is true while a listing's boost is in effect."""
+        return and_(cls.is_boosted.is_(True), cls.boosted_until > now)
+
     def __repr__(self):
         return f"<Listing {self.id}: {self.title}>"
+
+
+def annualize_compensation(salary_min, salary_max, hourly_rate):
+    """
+    Compute the annualized (min, max) compensation of a listing.
+
+    A listing matches a minimum salary if either its salary_max or its annualized
+    hourly rate reaches it, and a maximum salary if either its salary_min or its
+    annualized hourly rate stays under it. Storing the larger and smaller of those
+    values lets both filters become single range predicates.
+
+    Args:
+        salary_min: Minimum annual salary
+        salary_max: Maximum annual salary
+        hourly_rate: Hourly rate
+
+    Returns:
+        Tuple of (comp_annual_min, comp_annual_max)
+    """
+    hourly_annual = hourly_rate * ANNUAL_HOURS if hourly_rate is not None else None
+
+    lows = [v for v in (salary_min, hourly_annual) if v is not None]
+    highs = [v for v in (salary_max, hourly_annual) if v is not None]
+
+    return (min(lows) if lows else None, max(highs) if highs else None)
+
+
+# Serves the non-boosted part of the feed in order (status filter, newest first)
+Index(
+    "idx_listings_active_feed",
+    Listing.status,
+    Listing.created_at.desc(),
+    Listing.id.desc(),
+    postgresql_where=Listing.is_active.is_(True),
+)
+
+# Small index over boosted listings only, used by the feed and by boost expiry
+Index(
+    "idx_listings_boosted_until",
+    Listing.boosted_until,
+    postgresql_where=Listing.is_boosted.is_(True),
+)
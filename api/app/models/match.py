@@ -1,6 +1,15 @@
 """Match model for mutual connections."""
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    Boolean,
+    DateTime,
+    CheckConstraint,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -13,10 +22,8 @@ class Match(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    # Two users in the match
-    user1_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    # Two users in the match, stored as a canonical pair (user1_id < user2_id)
+    user1_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     user2_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -38,5 +45,11 @@ class Match(Base):
     user2 = relationship("User", foreign_keys=[user2_id])
     messages = relationship("Message", back_populates="match", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # One match per pair; also serves lookups by user1_id
+        UniqueConstraint("user1_id", "user2_id", name="uq_matches_pair"),
+        CheckConstraint("user1_id < user2_id", name="ck_matches_canonical_pair"),
+    )
+
     def __repr__(self):
         return f"<Match {self.id}: {self.user1_id} <-> {self.user2_id}>"
@@ -30,3 +30,35 @@ class Message(Base):
 
     def __repr__(self):
         return f"<Message {self.id}: {self.sender_id} -> {self.match_id}>"
+
+
+class Conversation(Base):
+    """
+    Per-match summary of the chat, maintained alongside every message write.
+
+    Unread counters are per participant, following the match's user1/user2.
+    """
+
+    __tablename__ = "conversations"
+
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True)
+    last_message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"))
+    last_message_at = Column(DateTime(timezone=True), nullable=True)
+    last_sender_id = Column(Integer, nullable=True)
+    user1_unread = Column(Integer, nullable=False, default=0, server_default="0")
+    user2_unread = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<Conversation {self.match_id}>"
+
+
+class UserUnreadCounter(Base):
+    """Per-user unread message total over active matches, for the unread badge."""
+
+    __tablename__ = "user_unread_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<UserUnreadCounter {self.user_id}: {self.unread_count}>"
@@ -1,14 +1,20 @@
 """Admin endpoints for content management."""
 
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.cache import LISTINGS_CACHE, bump_cache_version
+from app.core.targets import invalidate_target
 from app.models.user import User, UserRole
 from app.models.profile import Profile
 from app.models.listing import Listing, ListingStatus
+from app.models.interaction import Interaction
+from app.routers.interactions import iter_interactions_ndjson
 from app.schemas.user import UserResponse
 from app.schemas.profile import ProfileResponse
 from app.schemas.listing import ListingResponse
@@ -149,6 +155,7 @@ async def activate_profile(
 
     profile.is_active = True
     db.commit()
+    invalidate_target("profile", profile_id)
 
     return {"message": "Profile activated successfully", "profile_id": profile_id}
 
@@ -165,6 +172,7 @@ async def deactivate_profile(
 
     profile.is_active = False
     db.commit()
+    invalidate_target("profile", profile_id)
 
     return {"message": "Profile deactivated successfully", "profile_id": profile_id}
 
@@ -219,6 +227,8 @@ async def publish_listing(
     listing.status = ListingStatus.ACTIVE
     listing.is_active = True
     db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+    invalidate_target("listing", listing_id)
 
     return {"message": "Listing published successfully", "listing_id": listing_id}
 
@@ -236,6 +246,8 @@ async def unpublish_listing(
     listing.status = ListingStatus.DRAFT
     listing.is_active = False
     db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+    invalidate_target("listing", listing_id)
 
     return {"message": "Listing unpublished successfully", "listing_id": listing_id}
 
@@ -256,6 +268,8 @@ async def flag_listing(
     listing.flagged = True
     listing.flag_reason = flag_reason
     db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+    invalidate_target("listing", listing_id)
 
     return {"message": "Listing flagged successfully", "listing_id": listing_id}
 
@@ -273,6 +287,8 @@ async def unflag_listing(
     listing.flagged = False
     listing.flag_reason = None
     db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+    invalidate_target("listing", listing_id)
 
     return {"message": "Listing unflagged successfully", "listing_id": listing_id}
 
@@ -289,10 +305,35 @@ async def delete_listing(
 
     db.delete(listing)
     db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+    invalidate_target("listing", listing_id)
 
     return {"message": "Listing deleted successfully", "listing_id": listing_id}
 
 
+# Interaction Export
+
+
+@router.get("/interactions/export")
+async def export_all_interactions(
+    start: datetime = Query(..., description="Export interactions at or after this time"),
+    end: datetime = Query(..., description="Export interactions before this time"),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Export all users' interactions in a date range as NDJSON (admin only)."""
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start"
+        )
+
+    return StreamingResponse(
+        iter_interactions_ndjson(db, Interaction.created_at >= start, Interaction.created_at < end),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="interactions.ndjson"'},
+    )
+
+
 # Statistics
 
 
@@ -0,0 +1,202 @@
+"""Real-time event endpoints."""
+
+import asyncio
+import json
+import logging
+import re
+from typing import AsyncIterator, Optional
+
+import redis
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.realtime import CLOSE_TRY_AGAIN_LATER, Connection, hub, is_ephemeral
+from app.core.security import decode_token
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+SSE_KEEPALIVE_INTERVAL = 15.0  # Seconds between comments keeping proxies from timing out
+SSE_RETRY_MS = 3000  # Reconnect delay suggested to EventSource clients
+STREAM_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+
+def authenticate_token(token: Optional[str], db: Session) -> Optional[int]:
+    """
+    Resolve an access token to an active user's ID.
+
+    Args:
+        token: JWT access token
+        db: Database session
+
+    Returns:
+        User ID, or None if the token is invalid or the user is inactive
+    """
+    payload = decode_token(token) if token else None
+    if payload is None or payload.get("type") != "access" or payload.get("sub") is None:
+        return None
+
+    user = db.query(User).filter(User.id == int(payload["sub"])).first()
+    if user is None or not user.is_active:
+        return None
+    return user.id
+
+
+async def _send_events(websocket: WebSocket, connection: Connection) -> None:
+    while True:
+        payload = await connection.queue.get()
+        if payload is None:
+            # The client fell behind; it resyncs over REST and reconnects
+            await websocket.close(code=CLOSE_TRY_AGAIN_LATER)
+            return
+        await websocket.send_text(payload)
+
+
+async def _receive_until_closed(websocket: WebSocket) -> None:
+    # Clients only send keepalive pings; reading detects disconnects
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        return
+
+
+@router.websocket("/ws")
+async def event_socket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None, description="JWT access token"),
+    db: Session = Depends(get_db),
+):
+    """
+    Push the user's real-time events: new messages, read receipts and matches.
+
+    Browsers cannot set headers on WebSocket requests, so the access token is passed
+    as the token query parameter. Each event is a JSON text frame
+    {"type": ..., "data": ...}. Sockets of one process share a single Redis
+    subscription; a socket that falls OUTBOUND_QUEUE_SIZE events behind is closed
+    with code 1013 and should resync over REST before reconnecting.
+    """
+    user_id = authenticate_token(token, db)
+    # Release the database connection; the socket may stay open for hours
+    db.close()
+
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    connection = await hub.connect(user_id)
+    tasks = [
+        asyncio.create_task(_send_events(websocket, connection)),
+        asyncio.create_task(_receive_until_closed(websocket)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await hub.disconnect(connection)
+
+
+def format_event(event_id: str, payload: str) -> str:
+    """Format a Server-Sent Events frame carrying an event and its stream ID."""
+    return f"id: {event_id}\ndata: {payload}\n\n"
+
+
+async def _stream_events(user_id: int, last_event_id: Optional[str]) -> AsyncIterator[str]:
+    # Subscribe before reading the stream so no event falls between the two. This
+    # happens here rather than in the endpoint: a generator that never starts (the
+    # client left before the first chunk) never runs its finally, which would leak
+    # the subscription and keep the user marked online.
+    connection = await hub.connect(user_id)
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+
+        if last_event_id == "0-0" or (
+            last_event_id is not None and await hub.has_event(user_id, last_event_id)
+        ):
+            cursor = last_event_id
+        else:
+            cursor = await hub.latest_event_id(user_id)
+            if last_event_id is None:
+                # An ID-only frame sets the client's Last-Event-ID without an event
+                yield f"id: {cursor}\n\n"
+            else:
+                # Events after the client's last one were trimmed; it resyncs over REST
+                yield format_event(cursor, json.dumps({"type": "resync", "data": {}}))
+
+        while True:
+            for event_id, payload in await hub.read_events(user_id, cursor):
+                yield format_event(event_id, payload)
+                cursor = event_id
+
+            # Published events only wake the stream up; it reads them from the Redis
+            # stream so their IDs match what a reconnecting client resumes from
+            try:
+                wakeup = await asyncio.wait_for(connection.queue.get(), SSE_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            wakeups = [wakeup]
+            while not connection.queue.empty():
+                wakeups.append(connection.queue.get_nowait())
+            if None in wakeups:
+                # Fell behind; the client reconnects and resumes from its last event
+                return
+            for payload in wakeups:
+                if is_ephemeral(payload):
+                    # Not in the stream: sent as is, without an ID to resume from
+                    yield f"data: {payload}\n\n"
+    except (redis.RedisError, OSError) as e:
+        logger.warning(f"Event stream for user {user_id} interrupted: {e}")
+    finally:
+        await hub.disconnect(connection)
+
+
+@router.get("/stream")
+async def event_stream(
+    token: Optional[str] = Query(None, description="JWT access token"),
+    last_event_id: Optional[str] = Header(
+        None, description="ID of the last event received, sent by EventSource on reconnect"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream the user's real-time events as Server-Sent Events.
+
+    Fallback for networks that block WebSockets, carrying the same events as
+    /events/ws. Every event is kept in a bounded per-user Redis Stream and sent with
+    its stream ID, so a reconnecting EventSource resumes after its Last-Event-ID
+    without re-querying messages. If that event has already been trimmed, a
+    {"type": "resync"} event tells the client to refetch over REST.
+    """
+    user_id = authenticate_token(token, db)
+    # Release the database connection; the stream may stay open for hours
+    db.close()
+
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials"
+        )
+    if last_event_id is not None and not STREAM_ID_PATTERN.match(last_event_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+
+    return StreamingResponse(
+        _stream_events(user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
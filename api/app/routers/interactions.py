@@ -1,18 +1,47 @@
 """Interaction endpoints for swipe/like/apply actions."""
 
-from typing import List, Optional
+import json
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+import redis
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import exists, select, tuple_
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.cache import redis_client
+from app.core.targets import get_target, get_targets
+from app.core.matching import publish_matches
+from app.core.interaction_log import (
+    append_interaction_event,
+    build_interaction_event,
+    insert_interactions,
+)
 from app.models.user import User
-from app.models.interaction import Interaction, InteractionType
-from app.schemas.interaction import InteractionCreate, InteractionResponse
+from app.models.interaction import Interaction, InteractionType, UserInteractionCounter
+from app.schemas.match import MatchResponse
+from app.schemas.interaction import (
+    InteractionCreate,
+    InteractionResponse,
+    InteractionQueued,
+    InteractionBatchCreate,
+    InteractionBatchResult,
+    InteractionBatchResponse,
+)
 
 router = APIRouter(prefix="/interactions", tags=["interactions"])
 
+# Window in which repeating the same action on the same target is rejected
+DUPLICATE_WINDOW = timedelta(hours=24)
+
+# Rows fetched per round trip from the server-side cursor when exporting
+EXPORT_BATCH_SIZE = 1000
+
 
 def check_duplicate_interaction(
     user_id: int, target_type: str, target_id: int, action: str, db: Session
@@ -30,15 +59,13 @@ def check_duplicate_interaction(
     Returns:
         True if duplicate exists, False otherwise
     """
-    from datetime import datetime, timedelta
-
     # Check for existing interaction within 24 hours
-    time_threshold = datetime.utcnow() - timedelta(hours=24)
+    time_threshold = datetime.utcnow() - DUPLICATE_WINDOW
 
-    existing = (
-        db.query(Interaction)
-        .filter(
-            and_(
+    # EXISTS over indexed columns only, so the dedupe index answers it without the heap
+    return db.scalar(
+        select(
+            exists().where(
                 Interaction.user_id == user_id,
                 Interaction.target_type == target_type,
                 Interaction.target_id == target_id,
@@ -46,13 +73,132 @@ def check_duplicate_interaction(
                 Interaction.created_at >= time_threshold,
             )
         )
-        .first()
     )
 
-    return existing is not None
 
+def find_recent_interactions(
+    user_id: int, keys: Iterable[Tuple[str, int, InteractionType]], db: Session
+) -> Set[Tuple[str, int, InteractionType]]:
+    """
+    Find which (target_type, target_id, action) keys the user performed within 24 hours.
+
+    Args:
+        user_id: User ID
+        keys: Candidate (target_type, target_id, action) keys
+        db: Database session
+
+    Returns:
+        Set of keys that already exist within the duplicate window
+    """
+    keys = list(set(keys))
+    if not keys:
+        return set()
+
+    rows = db.execute(
+        select(Interaction.target_type, Interaction.target_id, Interaction.action)
+        .where(
+            Interaction.user_id == user_id,
+            Interaction.created_at >= datetime.utcnow() - DUPLICATE_WINDOW,
+            tuple_(Interaction.target_type, Interaction.target_id, Interaction.action).in_(keys),
+        )
+        .distinct()
+    ).all()
+
+    return {tuple(row) for row in rows}
+
+
+def _guard_key(user_id: int, target_type: str, target_id: int, action: InteractionType) -> str:
+    return f"swipe:{user_id}:{target_type}:{target_id}:{action.value}"
+
+
+def claim_interactions(
+    user_id: int, keys: List[Tuple[str, int, InteractionType]]
+) -> Optional[List[bool]]:
+    """
+    Claim swipes in the Redis duplicate guard.
+
+    Each (target_type, target_id, action) key is set with NX and a 24-hour expiry, so
+    the first claim within the window wins and repeats are duplicates without a
+    database query. Swipes written while Redis was unavailable are not in the guard.
+
+    Args:
+        user_id: User ID
+        keys: (target_type, target_id, action) keys in order
+
+    Returns:
+        Whether each key was newly claimed, or None if the guard is unavailable and
+        the database check must be used instead
+    """
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(_guard_key(user_id, *key), 1, nx=True, ex=DUPLICATE_WINDOW)
+        return [bool(claimed) for claimed in pipe.execute()]
+    except redis.RedisError:
+        return None
+
+
+def release_interactions(user_id: int, keys: List[Tuple[str, int, InteractionType]]) -> None:
+    """Release claims for swipes that were not written."""
+    try:
+        redis_client.delete(*(_guard_key(user_id, *key) for key in keys))
+    except redis.RedisError:
+        pass
+
+
+def interaction_response(interaction: Interaction, matches: dict) -> InteractionResponse:
+    """Serialize a newly inserted interaction with the match it created, if any."""
+    response = InteractionResponse.model_validate(interaction)
+    match = matches.get(interaction.id)
+    if match is not None:
+        response.match = MatchResponse.model_validate(match)
+    return response
+
+
+def iter_interactions_ndjson(db: Session, *filters) -> Iterator[str]:
+    """
+    Stream interactions matching the filters as NDJSON lines, oldest first.
+
+    Args:
+        db: Database session
+        filters: SQLAlchemy filter expressions on Interaction
+
+    Yields:
+        One JSON object per line
+    """
+    stmt = (
+        select(
+            Interaction.id,
+            Interaction.user_id,
+            Interaction.target_type,
+            Interaction.target_id,
+            Interaction.action,
+            Interaction.created_at,
+        )
+        .where(*filters)
+        .order_by(Interaction.created_at, Interaction.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
 
-@router.post("", response_model=InteractionResponse, status_code=status.HTTP_201_CREATED)
+    for row in db.execute(stmt):
+        yield json.dumps(
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "target_type": row.target_type,
+                "target_id": row.target_id,
+                "action": row.action.value,
+                "created_at": row.created_at.isoformat(),
+            }
+        ) + "\n"
+
+
+@router.post(
+    "",
+    response_model=InteractionResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": InteractionQueued}},
+)
 async def create_interaction(
     interaction_data: InteractionCreate,
     current_user: User = Depends(get_current_active_user),
@@ -61,75 +207,176 @@ async def create_interaction(
     """
     Create a new interaction (like, skip, apply, etc.).
 
-    Prevents duplicate interactions within 24 hours.
+    Prevents duplicate interactions within 24 hours. A like that reciprocates a like
+    creates the match in the same transaction and returns it with the interaction.
+    With write-behind enabled the validated swipe is appended to the interaction log
+    and 202 is returned; the worker writes it (and creates any match) to the database.
+    If Redis is unavailable it is written synchronously.
     """
-    # Check for duplicate within 24 hours
-    if check_duplicate_interaction(
-        current_user.id,
-        interaction_data.target_type,
-        interaction_data.target_id,
-        interaction_data.action.value,
-        db,
-    ):
+    # Validate target exists and is visible
+    target = get_target(interaction_data.target_type, interaction_data.target_id, db)
+    if not target or not target.is_active:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"You have already {interaction_data.action.value}d this {interaction_data.target_type} recently",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{interaction_data.target_type.capitalize()} not found",
         )
 
-    # Validate target exists
-    if interaction_data.target_type == "profile":
-        from app.models.profile import Profile
-
-        target = db.query(Profile).filter(Profile.id == interaction_data.target_id).first()
-    elif interaction_data.target_type == "listing":
-        from app.models.listing import Listing
+    # Check if user is interacting with their own content
+    if target.owner_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"You cannot interact with your own {interaction_data.target_type}",
+        )
 
-        target = db.query(Listing).filter(Listing.id == interaction_data.target_id).first()
+    # Check for duplicate within 24 hours, in the Redis guard when available
+    key = (interaction_data.target_type, interaction_data.target_id, interaction_data.action)
+    claimed = claim_interactions(current_user.id, [key])
+    if claimed is None:
+        duplicate = check_duplicate_interaction(
+            current_user.id,
+            interaction_data.target_type,
+            interaction_data.target_id,
+            interaction_data.action.value,
+            db,
+        )
     else:
+        duplicate = not claimed[0]
+
+    if duplicate:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid target_type. Must be 'profile' or 'listing'",
+            detail=(
+                f"You have already {interaction_data.action.value}d"
+                f" this {interaction_data.target_type} recently"
+            ),
         )
 
-    if not target:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"{interaction_data.target_type.capitalize()} not found",
+    event = build_interaction_event(
+        current_user.id,
+        interaction_data.target_type,
+        interaction_data.target_id,
+        interaction_data.action,
+    )
+
+    if settings.interactions_write_behind and append_interaction_event(event):
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(InteractionQueued(**event)),
         )
 
-    # Check if user is interacting with their own content
-    if interaction_data.target_type == "profile":
-        from app.models.profile import Profile
-
-        target = db.query(Profile).filter(Profile.id == interaction_data.target_id).first()
-        if target and target.user_id == current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You cannot interact with your own profile",
+    # Create interaction
+    try:
+        (new_interaction,), matches = insert_interactions(
+            db, [{**event, "action": interaction_data.action}]
+        )
+        response = interaction_response(new_interaction, matches)
+        db.commit()
+    except Exception:
+        release_interactions(current_user.id, [key])
+        raise
+
+    if response.match is not None:
+        publish_matches([response.match])
+
+    return response
+
+
+@router.post("/batch", response_model=InteractionBatchResponse)
+async def create_interactions_batch(
+    batch_data: InteractionBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Create several interactions at once.
+
+    Targets are resolved through the target cache and duplicates are claimed in the
+    Redis guard with one pipeline (or one set-based query if it is unavailable). All
+    accepted swipes are written with a single multi-row INSERT. Each item gets its own
+    result; rejected items do not fail the batch.
+    """
+    items = batch_data.items
+    targets = get_targets(((i.target_type, i.target_id) for i in items), db)
+
+    results: List[Optional[InteractionBatchResult]] = [None] * len(items)
+    valid = []
+
+    for index, item in enumerate(items):
+        target = targets.get((item.target_type, item.target_id))
+
+        if target is None or not target.is_active:
+            results[index] = InteractionBatchResult(
+                index=index, status="not_found", detail=f"{item.target_type.capitalize()} not found"
+            )
+        elif target.owner_id == current_user.id:
+            results[index] = InteractionBatchResult(
+                index=index,
+                status="own_target",
+                detail=f"You cannot interact with your own {item.target_type}",
             )
-    elif interaction_data.target_type == "listing":
-        from app.models.listing import Listing
-
-        target = db.query(Listing).filter(Listing.id == interaction_data.target_id).first()
-        if target and target.user_id == current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You cannot interact with your own listing",
+        else:
+            valid.append(index)
+
+    keys = [(items[i].target_type, items[i].target_id, items[i].action) for i in valid]
+    claimed = claim_interactions(current_user.id, keys)
+    if claimed is None:
+        recent = find_recent_interactions(current_user.id, keys, db)
+        seen = set()
+        claimed = []
+        for key in keys:
+            claimed.append(key not in recent and key not in seen)
+            seen.add(key)
+
+    accepted = []
+    for index, is_new in zip(valid, claimed):
+        if is_new:
+            accepted.append(index)
+        else:
+            item = items[index]
+            results[index] = InteractionBatchResult(
+                index=index,
+                status="duplicate",
+                detail=f"You have already {item.action.value}d this {item.target_type} recently",
             )
 
-    # Create interaction
-    new_interaction = Interaction(
-        user_id=current_user.id,
-        target_type=interaction_data.target_type,
-        target_id=interaction_data.target_id,
-        action=interaction_data.action,
-    )
+    if accepted:
+        try:
+            new_interactions, matches = insert_interactions(
+                db,
+                [
+                    {
+                        "user_id": current_user.id,
+                        "target_type": items[index].target_type,
+                        "target_id": items[index].target_id,
+                        "action": items[index].action,
+                    }
+                    for index in accepted
+                ],
+            )
 
-    db.add(new_interaction)
-    db.commit()
-    db.refresh(new_interaction)
+            # Serialize before commit expires the returned rows
+            for index, interaction in zip(accepted, new_interactions):
+                results[index] = InteractionBatchResult(
+                    index=index,
+                    status="created",
+                    interaction=interaction_response(interaction, matches),
+                )
+
+            db.commit()
+        except Exception:
+            release_interactions(
+                current_user.id,
+                [(items[i].target_type, items[i].target_id, items[i].action) for i in accepted],
+            )
+            raise
+
+        publish_matches(
+            result.interaction.match
+            for result in results
+            if result is not None and result.interaction and result.interaction.match
+        )
 
-    return InteractionResponse.model_validate(new_interaction)
+    return InteractionBatchResponse(results=results)
 
 
 @router.get("", response_model=List[InteractionResponse])
@@ -156,25 +403,45 @@ async def get_interactions(
     return [InteractionResponse.model_validate(i) for i in interactions]
 
 
+@router.get("/export")
+async def export_interactions(
+    since: Optional[datetime] = Query(None, description="Only interactions at or after this time"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Export the current user's interaction history as NDJSON, oldest first.
+
+    Rows are streamed from a server-side cursor, so memory use does not grow with the
+    size of the history.
+    """
+    filters = [Interaction.user_id == current_user.id]
+    if since:
+        filters.append(Interaction.created_at >= since)
+
+    return StreamingResponse(
+        iter_interactions_ndjson(db, *filters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="interactions.ndjson"'},
+    )
+
+
 @router.get("/stats")
 async def get_interaction_stats(
     current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
 ):
     """
     Get interaction statistics for the current user.
+
+    Reads the counters maintained alongside each interaction insert.
     """
-    # Count by action type
-    stats = {}
+    counters = db.get(UserInteractionCounter, current_user.id)
 
-    for action in InteractionType:
-        count = (
-            db.query(Interaction)
-            .filter(and_(Interaction.user_id == current_user.id, Interaction.action == action))
-            .count()
+    stats = {
+        action.value: (
+            getattr(counters, UserInteractionCounter.column_for(action)) if counters else 0
         )
-        stats[action.value] = count
-
-    # Total interactions
-    total = db.query(Interaction).filter(Interaction.user_id == current_user.id).count()
+        for action in InteractionType
+    }
 
-    return {"total_interactions": total, "by_action": stats}
+    return {"total_interactions": sum(stats.values()), "by_action": stats}
@@ -1,27 +1,61 @@
 """Listing endpoints for job postings."""
 
+import asyncio
+import csv
 import json
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, insert, tuple_
+from sqlalchemy.exc import SQLAlchemyError
 from decimal import Decimal
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
-from app.core.moderation import should_auto_flag_listing
+from app.core.cache import LISTINGS_CACHE, bump_cache_version, get_cached_response
+from app.core.targets import invalidate_target
+from app.core.moderation import moderate_listings, should_auto_flag_listing
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models.user import User
-from app.models.listing import Listing, ListingStatus
+from app.models.listing import Listing, ListingStatus, annualize_compensation
 from app.schemas.listing import (
     ListingCreate,
     ListingUpdate,
     ListingResponse,
     ListingCard,
+    ListingPage,
     ListingFilter,
 )
 
 router = APIRouter(prefix="/listings", tags=["listings"])
 
+# Bulk import settings
+BULK_BATCH_SIZE = 500  # Rows validated, moderated and inserted together
+BULK_MAX_ROWS = 10_000  # Rows accepted per request
+BULK_MODERATION_WORKERS = 4
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_moderation_pool: Optional[ProcessPoolExecutor] = None
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose content is produced while reading the request body.
+
+    StreamingResponse normally watches for client disconnects by reading receive(),
+    which would swallow the request body chunks the content iterator still needs.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
 
 def parse_json_field(field_value: str):
     """Parse JSON string field."""
@@ -77,6 +111,7 @@ async def create_listing(
         media_refs=serialize_json_field(listing_data.media_refs or {}),
         status=listing_data.status,
     )
+    new_listing.update_annual_compensation()
 
     # Auto-moderation: Check if listing should be flagged
     should_flag, flag_reason = should_auto_flag_listing(new_listing)
@@ -88,6 +123,7 @@ async def create_listing(
     db.add(new_listing)
     db.commit()
     db.refresh(new_listing)
+    bump_cache_version(LISTINGS_CACHE)
 
     # Parse JSON fields for response
     listing_dict = {
@@ -99,7 +135,252 @@ async def create_listing(
     return ListingResponse(**listing_dict)
 
 
-@router.get("", response_model=List[ListingCard])
+@router.post("/bulk", status_code=status.HTTP_200_OK)
+async def bulk_create_listings(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Import many listings from a streamed NDJSON or CSV body.
+
+    NDJSON bodies hold one ListingCreate object per line. CSV bodies start with a
+    header row of ListingCreate field names; skills_required is separated by ";" and
+    media_refs is a JSON object. Rows are validated, moderated and inserted in
+    batches, and the response streams one NDJSON result per row followed by a summary.
+    """
+    if current_user.role not in ["hirer", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Only hirers can create listings"
+        )
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        rows = iter_ndjson_rows(request.stream())
+    elif content_type == "text/csv":
+        rows = iter_csv_rows(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Body must be NDJSON (application/x-ndjson) or CSV (text/csv)",
+        )
+
+    return RequestStreamingResponse(
+        import_listings(rows, current_user.id, db), media_type="application/x-ndjson"
+    )
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+async def iter_ndjson_rows(stream: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Yield one row per non-empty NDJSON line (parse errors are yielded as strings)."""
+    async for line in iter_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"Invalid JSON: {e.msg}"
+            continue
+        yield row if isinstance(row, dict) else "Row must be a JSON object"
+
+
+async def iter_csv_rows(stream: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Yield one row per CSV record, keyed by the header row."""
+    header = None
+    pending = ""
+    async for line in iter_lines(stream):
+        # A record is complete once its quotes are balanced (quoted newlines continue it)
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = next(csv.reader([pending])), ""
+
+        if header is None:
+            header = [name.strip() for name in record]
+            continue
+        if not any(value.strip() for value in record):
+            continue
+
+        row = {name: value for name, value in zip(header, record) if value != ""}
+        if "skills_required" in row:
+            row["skills_required"] = [
+                skill.strip() for skill in row["skills_required"].split(";") if skill.strip()
+            ]
+        if "media_refs" in row:
+            try:
+                row["media_refs"] = json.loads(row["media_refs"])
+            except json.JSONDecodeError:
+                pass  # Reported by validation
+        yield row
+
+
+async def import_listings(rows: AsyncIterator, user_id: int, db: Session) -> AsyncIterator[str]:
+    """Validate, moderate and insert streamed rows in batches, yielding NDJSON results."""
+    batch = []
+    created = failed = 0
+    row_number = 0
+    truncated = False
+
+    try:
+        async for row in rows:
+            row_number += 1
+            if row_number > BULK_MAX_ROWS:
+                truncated = True
+                break
+
+            batch.append((row_number, row))
+            if len(batch) >= BULK_BATCH_SIZE:
+                async for line, ok in import_listing_batch(batch, user_id, db):
+                    created += ok
+                    failed += not ok
+                    yield line
+                batch = []
+
+        if batch:
+            async for line, ok in import_listing_batch(batch, user_id, db):
+                created += ok
+                failed += not ok
+                yield line
+
+        if truncated:
+            failed += 1
+            yield result_line(
+                row_number,
+                "error",
+                errors=[f"Limit of {BULK_MAX_ROWS} rows reached; remaining rows were skipped"],
+            )
+    finally:
+        if created:
+            bump_cache_version(LISTINGS_CACHE)
+
+    yield json.dumps({"summary": {"created": created, "failed": failed}}) + "\n"
+
+
+async def import_listing_batch(batch: List[tuple], user_id: int, db: Session):
+    """Import one batch of rows, yielding (result line, succeeded) pairs in row order."""
+    results = {}
+    valid = []
+
+    # Validate against the same schema and rules as POST /listings
+    for row_number, row in batch:
+        if isinstance(row, str):
+            results[row_number] = (result_line(row_number, "error", errors=[row]), False)
+            continue
+        try:
+            listing_data = ListingCreate.model_validate(row)
+        except ValidationError as e:
+            errors = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+            results[row_number] = (result_line(row_number, "error", errors=errors), False)
+            continue
+        if (
+            listing_data.salary_min
+            and listing_data.salary_max
+            and listing_data.salary_min > listing_data.salary_max
+        ):
+            results[row_number] = (
+                result_line(
+                    row_number,
+                    "error",
+                    errors=["Minimum salary cannot be greater than maximum salary"],
+                ),
+                False,
+            )
+            continue
+        valid.append((row_number, listing_data))
+
+    if valid:
+        moderation = await moderate_batch([listing_data for _, listing_data in valid])
+
+        values = []
+        for (_, listing_data), (should_flag, flag_reason) in zip(valid, moderation):
+            comp_annual_min, comp_annual_max = annualize_compensation(
+                listing_data.salary_min, listing_data.salary_max, listing_data.hourly_rate
+            )
+            values.append(
+                {
+                    "user_id": user_id,
+                    "title": listing_data.title,
+                    "company": listing_data.company,
+                    "description": listing_data.description,
+                    "skills_required": serialize_json_field(listing_data.skills_required),
+                    "location": listing_data.location,
+                    "remote_preference": listing_data.remote_preference,
+                    "salary_min": listing_data.salary_min,
+                    "salary_max": listing_data.salary_max,
+                    "hourly_rate": listing_data.hourly_rate,
+                    "comp_annual_min": comp_annual_min,
+                    "comp_annual_max": comp_annual_max,
+                    "equity_offered": listing_data.equity_offered or False,
+                    "media_refs": serialize_json_field(listing_data.media_refs or {}),
+                    "status": listing_data.status,
+                    "flagged": should_flag,
+                    "flag_reason": f"Auto-moderated: {flag_reason}" if should_flag else None,
+                    "is_active": not should_flag,  # Deactivate flagged listings
+                }
+            )
+
+        # One multi-row INSERT per batch
+        try:
+            ids = db.scalars(
+                insert(Listing).returning(Listing.id, sort_by_parameter_order=True), values
+            ).all()
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            for row_number, _ in valid:
+                results[row_number] = (
+                    result_line(row_number, "error", errors=["Could not save listing"]),
+                    False,
+                )
+        else:
+            for (row_number, _), listing_id, row_values in zip(valid, ids, values):
+                results[row_number] = (
+                    result_line(
+                        row_number, "created", id=listing_id, flagged=row_values["flagged"]
+                    ),
+                    True,
+                )
+
+    for row_number, _ in batch:
+        yield results[row_number]
+
+
+async def moderate_batch(listings: List[ListingCreate]) -> List[tuple]:
+    """Run listing moderation for a batch across the moderation process pool."""
+    global _moderation_pool
+    if _moderation_pool is None:
+        # Spawned (not forked) workers: forking a threaded server process can deadlock
+        _moderation_pool = ProcessPoolExecutor(
+            max_workers=BULK_MODERATION_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    chunk_size = max(1, -(-len(listings) // BULK_MODERATION_WORKERS))
+    chunks = [listings[i : i + chunk_size] for i in range(0, len(listings), chunk_size)]
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(_moderation_pool, moderate_listings, chunk) for chunk in chunks)
+    )
+    return [result for chunk_results in results for result in chunk_results]
+
+
+def result_line(row_number: int, outcome: str, **fields) -> str:
+    """Format one per-row NDJSON result."""
+    return json.dumps({"row": row_number, "status": outcome, **fields}) + "\n"
+
+
+@router.get("", response_model=ListingPage)
 async def get_listings(
     status_filter: Optional[ListingStatus] = Query(None, alias="status"),
     skills: Optional[str] = Query(None, description="Comma-separated list of skills"),
@@ -107,11 +388,47 @@ async def get_listings(
     remote_preference: Optional[str] = Query(None, pattern="^(remote|onsite|hybrid)$"),
     min_salary: Optional[Decimal] = Query(None, ge=0),
     max_salary: Optional[Decimal] = Query(None, ge=0),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=50),
     db: Session = Depends(get_db),
 ):
-    """Get listings with optional filters."""
+    """
+    Get listings with optional filters.
+
+    Results are ordered with currently boosted listings first, then newest first, and
+    paginated with keyset cursors so deep pages cost the same as the first one.
+    Responses are served from the listings response cache.
+    """
+    filters = {
+        "status_filter": status_filter,
+        "skills": skills,
+        "location": location,
+        "remote_preference": remote_preference,
+        "min_salary": min_salary,
+        "max_salary": max_salary,
+        "cursor": cursor,
+        "limit": limit,
+    }
+    body = await get_cached_response(
+        LISTINGS_CACHE,
+        {"endpoint": "browse", **filters},
+        lambda: browse_listings(db, **filters).model_dump(mode="json"),
+    )
+    return Response(content=body, media_type="application/json")
+
+
+def browse_listings(
+    db: Session,
+    status_filter: Optional[ListingStatus] = None,
+    skills: Optional[str] = None,
+    location: Optional[str] = None,
+    remote_preference: Optional[str] = None,
+    min_salary: Optional[Decimal] = None,
+    max_salary: Optional[Decimal] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> ListingPage:
+    """Query a page of the listing feed."""
     query = db.query(Listing).filter(Listing.is_active == True)
 
     # Apply filters
@@ -126,18 +443,12 @@ async def get_listings(
     if remote_preference:
         query = query.filter(Listing.remote_preference == remote_preference)
 
+    # Salary filters seek on the stored annualized bounds (hourly rates included)
     if min_salary:
-        query = query.filter(
-            or_(
-                Listing.salary_max >= min_salary,
-                Listing.hourly_rate * 40 * 50 >= min_salary,  # Approximate annual from hourly
-            )
-        )
+        query = query.filter(Listing.comp_annual_max >= min_salary)
 
     if max_salary:
-        query = query.filter(
-            or_(Listing.salary_min <= max_salary, Listing.hourly_rate * 40 * 50 <= max_salary)
-        )
+        query = query.filter(Listing.comp_annual_min <= max_salary)
 
     # Skills filter - check if any of the required skills match
     if skills:
@@ -147,17 +458,56 @@ async def get_listings(
             skill_conditions.append(Listing.skills_required.ilike(f"%{skill}%"))
         query = query.filter(or_(*skill_conditions))
 
-    # Order by boosted first, then by created_at desc
-    listings = (
-        query.order_by(Listing.is_boosted.desc(), Listing.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    # The feed is two keyset segments: listings with an active boost, then the rest.
+    # Boosts are judged against boosted_until so ranking is correct between expiry runs.
+    now = datetime.utcnow()
+    boosted = Listing.boost_active(now)
+    not_boosted = or_(
+        Listing.is_boosted.isnot(True),
+        Listing.boosted_until.is_(None),
+        Listing.boosted_until <= now,
     )
 
+    # Resume after the last row of the previous page
+    after = decode_cursor(cursor)
+    if after:
+        try:
+            after_boosted = bool(after["b"])
+            position = (datetime.fromisoformat(after["c"]), int(after["i"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    segments = [(True, boosted), (False, not_boosted)]
+    if after and not after_boosted:
+        segments = segments[1:]  # Already past the boosted segment
+
+    rows = []
+    for segment_boosted, condition in segments:
+        segment = query.filter(condition)
+        if after and after_boosted == segment_boosted:
+            segment = segment.filter(tuple_(Listing.created_at, Listing.id) < position)
+
+        # Newest first within each segment (id breaks ties)
+        listings = (
+            segment.order_by(Listing.created_at.desc(), Listing.id.desc())
+            .limit(limit + 1 - len(rows))
+            .all()
+        )
+        rows.extend((segment_boosted, listing) for listing in listings)
+        if len(rows) > limit:
+            break
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_boosted, last = rows[-1]
+        next_cursor = encode_cursor(
+            {"b": last_boosted, "c": last.created_at.isoformat(), "i": last.id}
+        )
+
     # Parse JSON fields
     result = []
-    for listing in listings:
+    for is_boosted, listing in rows:
         listing_dict = {
             "id": listing.id,
             "title": listing.title,
@@ -169,11 +519,11 @@ async def get_listings(
             "salary_min": listing.salary_min,
             "salary_max": listing.salary_max,
             "created_at": listing.created_at,
-            "is_boosted": listing.is_boosted,
+            "is_boosted": is_boosted,
         }
         result.append(ListingCard(**listing_dict))
 
-    return result
+    return ListingPage(items=result, next_cursor=next_cursor)
 
 
 @router.get("/my-listings", response_model=List[ListingResponse])
@@ -198,18 +548,25 @@ async def get_my_listings(
 @router.get("/{listing_id}", response_model=ListingResponse)
 async def get_listing(listing_id: int, db: Session = Depends(get_db)):
     """Get a specific listing by ID."""
-    listing = db.query(Listing).filter(Listing.id == listing_id).first()
 
-    if not listing:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
+    def load_listing():
+        listing = db.query(Listing).filter(Listing.id == listing_id).first()
 
-    listing_dict = {
-        **{k: v for k, v in listing.__dict__.items() if not k.startswith("_")},
-        "skills_required": parse_json_field(listing.skills_required),
-        "media_refs": parse_json_field(listing.media_refs or "{}"),
-    }
+        if not listing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
 
-    return ListingResponse(**listing_dict)
+        listing_dict = {
+            **{k: v for k, v in listing.__dict__.items() if not k.startswith("_")},
+            "skills_required": parse_json_field(listing.skills_required),
+            "media_refs": parse_json_field(listing.media_refs or "{}"),
+        }
+
+        return ListingResponse(**listing_dict).model_dump(mode="json")
+
+    body = await get_cached_response(
+        LISTINGS_CACHE, {"endpoint": "detail", "listing_id": listing_id}, load_listing
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.put("/{listing_id}", response_model=ListingResponse)
@@ -251,8 +608,12 @@ async def update_listing(
                 detail="Minimum salary cannot be greater than maximum salary",
             )
 
+    if update_data.keys() & {"salary_min", "salary_max", "hourly_rate"}:
+        listing.update_annual_compensation()
+
     db.commit()
     db.refresh(listing)
+    bump_cache_version(LISTINGS_CACHE)
 
     listing_dict = {
         **{k: v for k, v in listing.__dict__.items() if not k.startswith("_")},
@@ -284,5 +645,7 @@ async def delete_listing(
 
     db.delete(listing)
     db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+    invalidate_target("listing", listing_id)
 
     return {"message": "Listing deleted successfully", "listing_id": listing_id}
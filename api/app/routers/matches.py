@@ -1,134 +1,62 @@
 """Match endpoints for mutual connections."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import case, func, or_, select, tuple_
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.conversations import record_unmatch
+from app.core.presence import get_online
+from app.core.realtime import publish_event
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models.user import User
-from app.models.interaction import Interaction, InteractionType
 from app.models.match import Match
-from app.schemas.match import MatchResponse, MatchCreate
+from app.models.message import Message, Conversation
+from app.models.profile import Profile
+from app.schemas.match import MatchResponse, InboxEntry, InboxPage, InboxProfile
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+# How far back POST /matches looks for new matches by default
+NEW_MATCH_WINDOW = timedelta(hours=24)
 
-def check_for_mutual_like(user1_id: int, user2_id: int, db: Session) -> bool:
-    """
-    Check if two users have mutually liked each other.
-
-    Args:
-        user1_id: First user ID
-        user2_id: Second user ID
-        db: Database session
-
-    Returns:
-        True if both users have liked each other, False otherwise
-    """
-    # Check if user1 has liked user2
-    user1_liked = (
-        db.query(Interaction)
-        .filter(
-            and_(
-                Interaction.user_id == user1_id,
-                Interaction.target_type == "profile",
-                Interaction.target_id == user2_id,
-                Interaction.action == InteractionType.LIKE,
-            )
-        )
-        .first()
-    )
-
-    # Check if user2 has liked user1
-    user2_liked = (
-        db.query(Interaction)
-        .filter(
-            and_(
-                Interaction.user_id == user2_id,
-                Interaction.target_type == "profile",
-                Interaction.target_id == user1_id,
-                Interaction.action == InteractionType.LIKE,
-            )
-        )
-        .first()
-    )
-
-    return user1_liked is not None and user2_liked is not None
-
-
-def check_existing_match(user1_id: int, user2_id: int, db: Session) -> Match:
-    """
-    Check if a match already exists between two users.
-
-    Args:
-        user1_id: First user ID
-        user2_id: Second user ID
-        db: Database session
-
-    Returns:
-        Existing Match or None
-    """
-    return (
-        db.query(Match)
-        .filter(
-            or_(
-                and_(Match.user1_id == user1_id, Match.user2_id == user2_id),
-                and_(Match.user1_id == user2_id, Match.user2_id == user1_id),
-            )
-        )
-        .first()
-    )
+# Characters of the last message returned in inbox entries
+INBOX_PREVIEW_LENGTH = 100
 
 
 @router.post("", response_model=MatchResponse, status_code=status.HTTP_201_CREATED)
 async def check_and_create_match(
-    current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+    since: Optional[datetime] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
     """
-    Check for new matches and create them.
+    Get the user's newest match created since the given time (default: 24 hours ago).
 
-    This should be called after each interaction to detect mutual likes.
+    Matches are created when the reciprocating like is written, so this no longer
+    scans the user's likes; it is kept for clients that poll after swiping.
     """
-    new_matches = []
+    since = since or datetime.utcnow() - NEW_MATCH_WINDOW
 
-    # Get user's interactions where they liked someone
-    user_likes = (
-        db.query(Interaction)
+    match = (
+        db.query(Match)
         .filter(
-            and_(
-                Interaction.user_id == current_user.id,
-                Interaction.target_type == "profile",
-                Interaction.action == InteractionType.LIKE,
-            )
+            or_(Match.user1_id == current_user.id, Match.user2_id == current_user.id),
+            Match.is_active == True,
+            Match.created_at >= since,
         )
-        .all()
+        .order_by(Match.created_at.desc())
+        .first()
     )
 
-    for interaction in user_likes:
-        target_user_id = interaction.target_id
-
-        # Check if target user has liked back
-        if check_for_mutual_like(current_user.id, target_user_id, db):
-            # Check if match already exists
-            existing_match = check_existing_match(current_user.id, target_user_id, db)
-
-            if not existing_match:
-                # Create new match
-                match = Match(user1_id=current_user.id, user2_id=target_user_id, match_type="like")
-                db.add(match)
-                new_matches.append(match)
-
-    if new_matches:
-        db.commit()
-        for match in new_matches:
-            db.refresh(match)
-        # Return the first new match
-        return MatchResponse.model_validate(new_matches[0])
-    else:
+    if not match:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No new matches found")
 
+    return MatchResponse.model_validate(match)
+
 
 @router.get("", response_model=List[MatchResponse])
 async def get_matches(
@@ -137,7 +65,7 @@ async def get_matches(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Get all matches for the current user."""
+    """Get all matches for the current user, with whether each other user is online."""
     matches = (
         db.query(Match)
         .filter(
@@ -150,7 +78,109 @@ async def get_matches(
         .all()
     )
 
-    return [MatchResponse.model_validate(m) for m in matches]
+    responses = [MatchResponse.model_validate(m) for m in matches]
+    other_user_ids = [
+        m.user2_id if m.user1_id == current_user.id else m.user1_id for m in responses
+    ]
+    online = get_online(other_user_ids)
+    for response, other_user_id in zip(responses, other_user_ids):
+        response.other_user_online = other_user_id in online
+
+    return responses
+
+
+@router.get("/inbox", response_model=InboxPage)
+async def get_inbox(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the chat list: active matches with the other party's card, the last message
+    and the unread count, most recent activity first.
+
+    One query for the whole page, reading each match's conversation summary and
+    last message by primary key, plus one Redis lookup for who is online. Paginated
+    with keyset cursors on (last activity, match id).
+    """
+    other_user_id = case((Match.user1_id == current_user.id, Match.user2_id), else_=Match.user1_id)
+    unread_count = case(
+        (Match.user1_id == current_user.id, Conversation.user1_unread),
+        else_=Conversation.user2_unread,
+    )
+    last_activity = func.coalesce(Conversation.last_message_at, Match.created_at)
+
+    stmt = (
+        select(
+            Match.id,
+            Match.match_type,
+            other_user_id.label("other_user_id"),
+            Profile.id.label("profile_id"),
+            Profile.headline,
+            Profile.media_refs,
+            func.substr(Message.content, 1, INBOX_PREVIEW_LENGTH).label("preview"),
+            Conversation.last_message_at,
+            Conversation.last_sender_id,
+            func.coalesce(unread_count, 0).label("unread_count"),
+            last_activity.label("last_activity_at"),
+        )
+        .select_from(Match)
+        .outerjoin(Conversation, Conversation.match_id == Match.id)
+        .outerjoin(Message, Message.id == Conversation.last_message_id)
+        .outerjoin(Profile, Profile.user_id == other_user_id)
+        .where(
+            or_(Match.user1_id == current_user.id, Match.user2_id == current_user.id),
+            Match.is_active == True,
+            Match.unmatched == False,
+        )
+    )
+
+    # Resume after the last row of the previous page
+    after = decode_cursor(cursor)
+    if after:
+        try:
+            position = (datetime.fromisoformat(after["a"]), int(after["i"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(last_activity, Match.id) < position)
+
+    rows = db.execute(stmt.order_by(last_activity.desc(), Match.id.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"a": rows[-1].last_activity_at.isoformat(), "i": rows[-1].id})
+
+    online = get_online(row.other_user_id for row in rows)
+
+    items = []
+    for row in rows:
+        other_profile = None
+        if row.profile_id is not None:
+            media_refs = row.media_refs if isinstance(row.media_refs, dict) else {}
+            other_profile = InboxProfile(
+                id=row.profile_id,
+                headline=row.headline,
+                thumbnail_url=media_refs.get("profile_image"),
+            )
+
+        items.append(
+            InboxEntry(
+                match_id=row.id,
+                match_type=row.match_type,
+                other_user_id=row.other_user_id,
+                other_profile=other_profile,
+                last_message_preview=row.preview,
+                last_message_at=row.last_message_at,
+                last_sender_id=row.last_sender_id,
+                unread_count=row.unread_count,
+                other_user_online=row.other_user_id in online,
+                last_activity_at=row.last_activity_at,
+            )
+        )
+
+    return InboxPage(items=items, next_cursor=next_cursor)
 
 
 @router.get("/{match_id}", response_model=MatchResponse)
@@ -194,10 +224,15 @@ async def unmatch(
             detail="You don't have permission to unmatch this user",
         )
 
-    # Mark as unmatched
+    # Mark as unmatched; its unread messages leave both users' badges
+    record_unmatch(db, match)
     match.unmatched = True
     match.is_active = False
 
     db.commit()
 
+    publish_event(
+        [match.user1_id, match.user2_id], "unmatch", {"match_id": match_id, "by": current_user.id}
+    )
+
     return {"message": "Match unmatched successfully", "match_id": match_id}
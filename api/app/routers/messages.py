@@ -1,16 +1,25 @@
 """Message endpoints for chat."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import select, tuple_, update
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.conversations import record_message, record_read
+from app.core.presence import TYPING_COALESCE_SECONDS, claim_typing_event
+from app.core.realtime import publish_event
 from app.models.user import User
 from app.models.match import Match
-from app.models.message import Message
-from app.schemas.message import MessageCreate, MessageResponse, MessageUpdate
+from app.models.message import Message, UserUnreadCounter
+from app.schemas.message import (
+    MessageCreate,
+    MessageResponse,
+    MessageUpdate,
+    MessagesReadResponse,
+)
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
@@ -21,7 +30,7 @@ async def create_message(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Send a message in a match."""
+    """Send a message in a match and push it to both users."""
     # Verify match exists and user is part of it
     match = db.query(Match).filter(Match.id == message_data.match_id).first()
 
@@ -40,21 +49,42 @@ async def create_message(
     )
 
     db.add(new_message)
+    db.flush()
+    record_message(db, match, new_message)
     db.commit()
     db.refresh(new_message)
 
-    return MessageResponse.model_validate(new_message)
+    response = MessageResponse.model_validate(new_message)
+    publish_event([match.user1_id, match.user2_id], "message", response.model_dump(mode="json"))
+
+    return response
 
 
 @router.get("/match/{match_id}", response_model=List[MessageResponse])
 async def get_messages(
     match_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    before_id: Optional[int] = Query(None, description="Load older messages than this one"),
+    after_id: Optional[int] = Query(None, description="Load newer messages than this one"),
+    since: Optional[datetime] = Query(None, description="Load messages sent after this time"),
+    limit: int = Query(100, ge=1, le=200),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Get all messages in a match."""
+    """
+    Get messages in a match, oldest first within the page.
+
+    Without a cursor, or with before_id, the page holds the newest messages before the
+    cursor, so a chat opens at its latest messages and scrolls back. With after_id or
+    since, it holds the oldest messages after the cursor, so a reconnecting client
+    fetches only what it missed (repeating while a full page comes back). Each page is
+    one range scan of the (match_id, created_at) index.
+    """
+    if before_id is not None and (after_id is not None or since is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before_id cannot be combined with after_id or since",
+        )
+
     # Verify match exists and user is part of it
     match = db.query(Match).filter(Match.id == match_id).first()
 
@@ -67,15 +97,34 @@ async def get_messages(
             status_code=status.HTTP_403_FORBIDDEN, detail="You are not part of this match"
         )
 
-    # Get messages
-    messages = (
-        db.query(Message)
-        .filter(Message.match_id == match_id)
-        .order_by(Message.created_at.asc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    def cursor_position(message_id: int):
+        created_at = db.scalar(
+            select(Message.created_at).where(Message.id == message_id, Message.match_id == match_id)
+        )
+        if created_at is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        return created_at, message_id
+
+    query = db.query(Message).filter(Message.match_id == match_id)
+    position = tuple_(Message.created_at, Message.id)
+
+    # The plain created_at bounds let the index range scan; the row comparisons break
+    # ties between messages sent in the same instant
+    if after_id is not None or since is not None:
+        if since is not None:
+            query = query.filter(Message.created_at > since)
+        if after_id is not None:
+            after = cursor_position(after_id)
+            query = query.filter(Message.created_at >= after[0], position > after)
+
+        messages = query.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit).all()
+    else:
+        if before_id is not None:
+            before = cursor_position(before_id)
+            query = query.filter(Message.created_at <= before[0], position < before)
+
+        messages = query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit).all()
+        messages.reverse()
 
     return [MessageResponse.model_validate(m) for m in messages]
 
@@ -109,45 +158,135 @@ async def mark_as_read(
             detail="You cannot mark your own message as read",
         )
 
-    # Mark as read
-    message.read = True
-    from datetime import datetime
-
-    message.read_at = datetime.utcnow()
+    # Mark as read; only the request that flips the flag updates the unread count
+    result = db.execute(
+        update(Message)
+        .where(Message.id == message.id, Message.read == False)
+        .values(read=True, read_at=datetime.utcnow())
+    )
+    record_read(db, match, current_user.id, result.rowcount)
 
     db.commit()
     db.refresh(message)
 
+    if result.rowcount:
+        publish_event(
+            [message.sender_id],
+            "read",
+            {"match_id": match.id, "reader_id": current_user.id, "message_id": message.id},
+        )
+
     return MessageResponse.model_validate(message)
 
 
-@router.get("/unread/count")
-async def get_unread_count(
-    current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+@router.put("/match/{match_id}/read", response_model=MessagesReadResponse)
+async def mark_match_as_read(
+    match_id: int,
+    up_to: Optional[int] = Query(
+        None, ge=1, description="Last message ID read; all messages if omitted"
+    ),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
-    """Get count of unread messages for the current user."""
-    # Get all matches where user is involved
-    matches = (
-        db.query(Match)
-        .filter(
-            or_(Match.user1_id == current_user.id, Match.user2_id == current_user.id),
-            Match.is_active == True,
-            Match.unmatched == False,
+    """
+    Mark every message received in a match up to a message as read.
+
+    One UPDATE over the match's messages, with the conversation and badge unread
+    counters reduced by the number of messages it changed in the same transaction.
+    """
+    match = db.query(Match).filter(Match.id == match_id).first()
+
+    if not match:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match not found")
+
+    # Verify user is part of the match
+    if match.user1_id != current_user.id and match.user2_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not part of this match"
         )
-        .all()
+
+    stmt = update(Message).where(
+        Message.match_id == match_id,
+        Message.sender_id != current_user.id,
+        Message.read.isnot(True),
     )
+    if up_to is not None:
+        stmt = stmt.where(Message.id <= up_to)
 
-    match_ids = [m.id for m in matches]
+    result = db.execute(
+        stmt.values(read=True, read_at=datetime.utcnow()).execution_options(
+            synchronize_session=False
+        )
+    )
+    record_read(db, match, current_user.id, result.rowcount)
+
+    db.commit()
+
+    if result.rowcount:
+        other_user_id = match.user2_id if current_user.id == match.user1_id else match.user1_id
+        publish_event(
+            [other_user_id],
+            "read",
+            {"match_id": match_id, "reader_id": current_user.id, "up_to": up_to},
+        )
+
+    return MessagesReadResponse(match_id=match_id, up_to=up_to, marked_read=result.rowcount)
+
+
+@router.post("/match/{match_id}/typing", status_code=status.HTTP_204_NO_CONTENT)
+async def send_typing(
+    match_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Tell the other user in a match that the current user is typing.
+
+    Clients may call this on every keystroke: once the caller is checked against the
+    match, calls are coalesced in Redis to at most one "typing" event per user and
+    match every TYPING_COALESCE_SECONDS. Clients show the indicator until expires_in
+    seconds after the last event, or until the message arrives.
+    """
+    match = db.query(Match).filter(Match.id == match_id).first()
+
+    if not match:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match not found")
+
+    # Verify user is part of the match
+    if match.user1_id != current_user.id and match.user2_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not part of this match"
+        )
 
-    # Count unread messages where user is NOT the sender
-    unread_count = (
-        db.query(Message)
-        .filter(
-            Message.match_id.in_(match_ids),
-            Message.sender_id != current_user.id,
-            Message.read == False,
+    if not match.is_active or match.unmatched:
+        return
+
+    if claim_typing_event(match_id, current_user.id):
+        other_user_id = match.user2_id if current_user.id == match.user1_id else match.user1_id
+        publish_event(
+            [other_user_id],
+            "typing",
+            {
+                "match_id": match_id,
+                "user_id": current_user.id,
+                "expires_in": TYPING_COALESCE_SECONDS * 2,
+            },
+            ephemeral=True,
         )
-        .count()
+
+
+@router.get("/unread/count")
+async def get_unread_count(
+    current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+):
+    """
+    Get count of unread messages for the current user.
+
+    Read from the user's unread counter, maintained on every send, read and unmatch
+    and reconciled periodically.
+    """
+    unread_count = db.scalar(
+        select(UserUnreadCounter.unread_count).where(UserUnreadCounter.user_id == current_user.id)
     )
 
-    return {"unread_count": unread_count}
+    return {"unread_count": unread_count or 0}
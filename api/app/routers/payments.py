@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.cache import LISTINGS_CACHE, bump_cache_version
 from app.core.config import settings
 from app.models.user import User
 from app.models.listing import Listing, ListingStatus
@@ -92,6 +93,8 @@ async def confirm_boost(
     payment.completed_at = datetime.utcnow()
 
     db.commit()
+    if listing:
+        bump_cache_version(LISTINGS_CACHE)
 
     return {"message": "Boost activated successfully", "boosted_until": listing.boosted_until}
 
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.targets import invalidate_target
 from app.models.user import User
 from app.models.profile import Profile
 from app.schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse, ProfileCard
@@ -133,8 +134,10 @@ async def delete_profile(
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
 
+    profile_id = profile.id
     db.delete(profile)
     db.commit()
+    invalidate_target("profile", profile_id)
 
     return None
 
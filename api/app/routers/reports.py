@@ -7,6 +7,7 @@ from datetime import datetime
 
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.targets import TARGET_MODELS, get_target
 from app.models.user import User, UserRole
 from app.models.report import Report, ReportStatus, ReportType
 from app.schemas.report import ReportCreate, ReportResponse, ReportUpdate
@@ -37,6 +38,20 @@ async def create_report(
             detail=f"Invalid report type. Must be one of: {[e.value for e in ReportType]}",
         )
 
+    # Validate profile and listing targets exist and are visible
+    if report_type.value in TARGET_MODELS:
+        target = get_target(report_type.value, report_data.target_id, db)
+        if not target or not target.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{report_type.value.capitalize()} not found",
+            )
+        if target.owner_id == current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"You cannot report your own {report_type.value}",
+            )
+
     # Create report
     new_report = Report(
         reporter_id=current_user.id,
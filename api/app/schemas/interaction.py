@@ -1,9 +1,13 @@
 """Interaction schemas."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.models.interaction import InteractionType
+from app.schemas.match import MatchResponse
+
+# Maximum number of swipes accepted by POST /interactions/batch
+MAX_BATCH_INTERACTIONS = 50
 
 
 class InteractionCreate(BaseModel):
@@ -27,11 +31,46 @@ class InteractionResponse(BaseModel):
     target_id: int
     action: InteractionType
     created_at: datetime
+    match: Optional[MatchResponse] = Field(None, description="Match created by this like")
 
     class Config:
         from_attributes = True
 
 
+class InteractionQueued(BaseModel):
+    """Response schema for an interaction accepted into the write-behind log."""
+
+    idempotency_key: str
+    user_id: int
+    target_type: str
+    target_id: int
+    action: InteractionType
+    created_at: datetime
+
+
+class InteractionBatchCreate(BaseModel):
+    """Schema for creating several interactions at once."""
+
+    items: List[InteractionCreate] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_INTERACTIONS, description="Swipes in order"
+    )
+
+
+class InteractionBatchResult(BaseModel):
+    """Outcome of one item in an interaction batch."""
+
+    index: int
+    status: str = Field(..., description="created, duplicate, not_found or own_target")
+    detail: Optional[str] = None
+    interaction: Optional[InteractionResponse] = None
+
+
+class InteractionBatchResponse(BaseModel):
+    """Response schema for an interaction batch."""
+
+    results: List[InteractionBatchResult]
+
+
 class InteractionFilter(BaseModel):
     """Schema for filtering interactions."""
 
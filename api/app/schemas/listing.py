@@ -84,6 +84,15 @@ class ListingCard(BaseModel):
         from_attributes = True
 
 
+class ListingPage(BaseModel):
+    """A page of listing cards with a cursor for the next page."""
+
+    items: List[ListingCard]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+
 class ListingFilter(BaseModel):
     """Schema for listing filters."""
 
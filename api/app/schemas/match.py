@@ -1,7 +1,7 @@
 """Match schemas."""
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -16,6 +16,9 @@ class MatchResponse(BaseModel):
     unmatched: bool
     unmatched_at: Optional[datetime]
     created_at: datetime
+    other_user_online: Optional[bool] = Field(
+        None, description="Whether the other user is online; set by GET /matches"
+    )
 
     class Config:
         from_attributes = True
@@ -26,3 +29,35 @@ class MatchCreate(BaseModel):
 
     user2_id: int
     match_type: str
+
+
+class InboxProfile(BaseModel):
+    """The other party's card in an inbox entry."""
+
+    id: int
+    headline: Optional[str]
+    thumbnail_url: Optional[str]
+
+
+class InboxEntry(BaseModel):
+    """A match in the chat list with its latest message and unread count."""
+
+    match_id: int
+    match_type: str
+    other_user_id: int
+    other_profile: Optional[InboxProfile]
+    last_message_preview: Optional[str]
+    last_message_at: Optional[datetime]
+    last_sender_id: Optional[int]
+    unread_count: int
+    other_user_online: bool = False
+    last_activity_at: datetime
+
+
+class InboxPage(BaseModel):
+    """A page of the inbox with a cursor for the next page."""
+
+    items: List[InboxEntry]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
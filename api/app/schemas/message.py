@@ -31,3 +31,11 @@ class MessageUpdate(BaseModel):
     """Schema for updating a message (mark as read)."""
 
     read: Optional[bool] = None
+
+
+class MessagesReadResponse(BaseModel):
+    """Result of marking a match's messages as read."""
+
+    match_id: int
+    up_to: Optional[int] = Field(None, description="Last message ID covered, or null for all")
+    marked_read: int = Field(..., description="Messages that changed from unread to read")
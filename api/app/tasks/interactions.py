@@ -0,0 +1,386 @@
+"""Interaction log writer, counter and partition maintenance tasks."""
+
+import gzip
+import logging
+import os
+import re
+import socket
+import tempfile
+import time
+from datetime import date
+from typing import List, Tuple
+
+import redis
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import SessionLocal, dialect_insert, engine
+from app.core.interaction_log import (
+    DEAD_LETTER_MAXLEN,
+    INTERACTION_DEAD_LETTERS,
+    INTERACTION_STREAM,
+    INTERACTION_WRITERS,
+    insert_interactions,
+    parse_interaction_event,
+)
+from app.core.matching import publish_matches
+from app.core.storage import s3_client
+from app.models.interaction import (
+    ACTION_CODES,
+    Interaction,
+    InteractionType,
+    UserInteractionCounter,
+)
+from app.schemas.match import MatchResponse
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 1000  # Events written per INSERT transaction
+FLUSH_BLOCK_MS = 1000  # How long a writer waits for new events
+CLAIM_IDLE_MS = 60_000  # Events pending this long are taken over from a dead writer
+RETRY_DELAY = 5  # Seconds to back off after a failed flush
+REBUILD_CHUNK_USERS = 1000  # User id range recounted per transaction
+
+PARTITION_NAME = re.compile(r"^interactions_(\d{4})_(\d{2})$")
+SKIP_ARCHIVE_PREFIX = "archive/interactions/skip"
+
+
+def ensure_writer_group(conn: redis.Redis) -> None:
+    """Create the interaction writers consumer group if it does not exist."""
+    try:
+        conn.xgroup_create(INTERACTION_STREAM, INTERACTION_WRITERS, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _insert_batch(rows: List[dict]) -> Tuple[int, List[MatchResponse]]:
+    """Insert rows in one transaction; returns rows written and matches created."""
+    db = SessionLocal()
+    try:
+        written, matches = insert_interactions(db, rows, ignore_duplicates=True)
+        new_matches = [MatchResponse.model_validate(m) for m in matches.values()]
+        db.commit()
+        return len(written), new_matches
+    finally:
+        db.close()
+
+
+def _write_events(events: List[tuple]) -> Tuple[int, List[MatchResponse], List[tuple]]:
+    """
+    Insert (entry ID, fields, row) events, isolating rows the database rejects.
+
+    A batch failing on its data (e.g. a deleted user or a missing partition) is split
+    in half and retried, so one bad event costs O(log n) extra transactions instead of
+    stalling the whole batch. Connection errors are raised for the caller to retry.
+
+    Returns:
+        Rows written, matches created, and (entry ID, fields, error) for rejected events
+    """
+    try:
+        written, matches = _insert_batch([row for _, _, row in events])
+        return written, matches, []
+    except (IntegrityError, DataError) as e:
+        if len(events) == 1:
+            entry_id, fields, _ = events[0]
+            return 0, [], [(entry_id, fields, e)]
+
+    middle = len(events) // 2
+    written, matches, rejected = _write_events(events[:middle])
+    more_written, more_matches, more_rejected = _write_events(events[middle:])
+    return written + more_written, matches + more_matches, rejected + more_rejected
+
+
+def flush_interaction_log(conn: redis.Redis, consumer: str) -> int:
+    """
+    Write one batch of logged swipes to the interactions table.
+
+    Events left pending by a writer that died are reclaimed first, then new events
+    are read. The batch is inserted in one transaction and only acknowledged after
+    commit, so delivery is at-least-once; the idempotency key makes a redelivered
+    event a no-op. Events the database rejects are moved to the dead-letter stream
+    so they do not block the ones behind them.
+
+    Args:
+        conn: Redis connection (without a socket timeout, reads block)
+        consumer: Name of this writer within the consumer group
+
+    Returns:
+        Number of events acknowledged
+    """
+    _, entries, *_ = conn.xautoclaim(
+        INTERACTION_STREAM,
+        INTERACTION_WRITERS,
+        consumer,
+        min_idle_time=CLAIM_IDLE_MS,
+        start_id="0-0",
+        count=FLUSH_BATCH_SIZE,
+    )
+    if not entries:
+        response = conn.xreadgroup(
+            INTERACTION_WRITERS,
+            consumer,
+            {INTERACTION_STREAM: ">"},
+            count=FLUSH_BATCH_SIZE,
+            block=FLUSH_BLOCK_MS,
+        )
+        entries = response[0][1] if response else []
+
+    ids = []
+    events = []
+    for entry_id, fields in entries:
+        ids.append(entry_id)
+        try:
+            events.append((entry_id, fields, parse_interaction_event(fields)))
+        except (KeyError, ValueError, UnicodeDecodeError) as e:
+            # Acknowledge malformed events so they do not block the stream
+            logger.error(f"Dropping malformed interaction event {entry_id}: {e}")
+
+    if not ids:
+        return 0
+
+    pipe = conn.pipeline()
+    if events:
+        written, new_matches, rejected = _write_events(events)
+        publish_matches(new_matches)
+        logger.info(
+            f"Flushed {written} interactions ({len(events) - written - len(rejected)}"
+            f" duplicates, {len(new_matches)} matches, {len(rejected)} rejected)"
+        )
+
+        for entry_id, fields, error in rejected:
+            logger.error(f"Dead-lettering interaction event {entry_id}: {error}")
+            pipe.xadd(
+                INTERACTION_DEAD_LETTERS,
+                {**fields, "entry_id": entry_id, "error": str(error.orig)[:500]},
+                maxlen=DEAD_LETTER_MAXLEN,
+                approximate=True,
+            )
+
+    pipe.xack(INTERACTION_STREAM, INTERACTION_WRITERS, *ids)
+    pipe.xdel(INTERACTION_STREAM, *ids)
+    pipe.execute()
+    return len(ids)
+
+
+def run_interaction_writer():
+    """Run the interaction log writer loop."""
+    conn = redis.from_url(settings.redis_url)
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+
+    while True:
+        try:
+            ensure_writer_group(conn)
+            while True:
+                flush_interaction_log(conn, consumer)
+        except (redis.RedisError, SQLAlchemyError) as e:
+            # Unacknowledged events stay pending and are retried
+            logger.warning(f"Interaction writer failed, retrying: {e}")
+            time.sleep(RETRY_DELAY)
+
+
+def rebuild_interaction_counters() -> int:
+    """
+    Recompute every user's interaction counters from the interactions table.
+
+    Users are processed in id ranges, each replaced in its own short transaction, so
+    counters drifted by a bug or manual data fix are repaired without a long lock.
+    Skips in archived partitions are no longer in the table; they are kept in
+    archived_skip_count, which the rebuild leaves alone and adds to skip_count.
+
+    Returns:
+        Number of users with counters
+    """
+    db = SessionLocal()
+    try:
+        max_user_id = db.scalar(select(func.max(Interaction.user_id))) or 0
+        max_counter_id = db.scalar(select(func.max(UserInteractionCounter.user_id))) or 0
+        upper = max(max_user_id, max_counter_id)
+
+        columns = {
+            UserInteractionCounter.column_for(action): func.count().filter(
+                Interaction.action == action
+            )
+            for action in InteractionType
+        }
+
+        skip_column = UserInteractionCounter.column_for(InteractionType.SKIP)
+
+        rebuilt = 0
+        for start in range(0, upper + 1, REBUILD_CHUNK_USERS):
+            end = start + REBUILD_CHUNK_USERS - 1
+
+            in_chunk = UserInteractionCounter.user_id.between(start, end)
+            db.execute(
+                delete(UserInteractionCounter).where(
+                    in_chunk, UserInteractionCounter.archived_skip_count == 0
+                )
+            )
+            # Users with archived skips keep their row, reset to the archived baseline
+            db.execute(
+                update(UserInteractionCounter)
+                .where(in_chunk)
+                .values(
+                    {
+                        column: (
+                            UserInteractionCounter.archived_skip_count
+                            if column == skip_column
+                            else 0
+                        )
+                        for column in columns
+                    }
+                )
+            )
+
+            stmt = dialect_insert(db, UserInteractionCounter).from_select(
+                ["user_id", *columns],
+                select(Interaction.user_id, *columns.values())
+                .where(Interaction.user_id.between(start, end))
+                .group_by(Interaction.user_id),
+            )
+            result = db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={
+                        column: (
+                            UserInteractionCounter.archived_skip_count + stmt.excluded[column]
+                            if column == skip_column
+                            else stmt.excluded[column]
+                        )
+                        for column in columns
+                    },
+                )
+            )
+            db.commit()
+            rebuilt += result.rowcount
+
+        logger.info(f"Rebuilt interaction counters for {rebuilt} users")
+        return rebuilt
+    finally:
+        db.close()
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after `month`."""
+    years, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the monthly interactions partition starting at `month`."""
+    return f"interactions_{month:%Y_%m}"
+
+
+def create_interaction_partition(conn, month: date) -> None:
+    """
+    Create the partition for one month, sub-partitioned into skips and other actions.
+
+    Args:
+        conn: SQLAlchemy connection
+        month: First day of the month
+    """
+    name = partition_name(month)
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF interactions"
+            f" FOR VALUES FROM ('{month} 00:00:00+00') TO ('{add_months(month, 1)} 00:00:00+00')"
+            " PARTITION BY LIST (action)"
+        )
+    )
+    skip = ACTION_CODES[InteractionType.SKIP]
+    conn.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {name}_skip PARTITION OF {name} FOR VALUES IN ({skip})")
+    )
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name}_other PARTITION OF {name} DEFAULT"))
+
+
+def ensure_interaction_partitions() -> List[str]:
+    """
+    Create monthly interaction partitions for the current and upcoming months.
+
+    Returns:
+        Names of the monthly partitions that now exist ahead of time
+    """
+    this_month = date.today().replace(day=1)
+    months = [add_months(this_month, i) for i in range(settings.interactions_partitions_ahead + 1)]
+
+    with engine.begin() as conn:
+        for month in months:
+            create_interaction_partition(conn, month)
+
+    return [partition_name(month) for month in months]
+
+
+def archive_skip_partitions() -> List[str]:
+    """
+    Archive skip sub-partitions of months past the retention period.
+
+    Each cold skip partition is detached, copied as gzipped CSV to object storage and
+    dropped. Its per-user skip totals are added to archived_skip_count in the same
+    transaction as the drop, so counter rebuilds keep counting them. A partition
+    detached by a run that failed later is picked up again.
+
+    Returns:
+        Object keys of the archives written
+    """
+    cutoff = add_months(date.today().replace(day=1), -settings.interactions_skip_retention_months)
+
+    with engine.connect() as conn:
+        tables = conn.execute(
+            text("SELECT tablename FROM pg_tables WHERE tablename LIKE 'interactions%'")
+        ).scalars()
+        months = sorted(
+            date(int(m.group(1)), int(m.group(2)), 1)
+            for m in map(PARTITION_NAME.match, tables)
+            if m
+        )
+
+    archived = []
+    for month in months:
+        if add_months(month, 1) > cutoff:
+            break
+        skip_table = f"{partition_name(month)}_skip"
+
+        with engine.begin() as conn:
+            if conn.scalar(text(f"SELECT to_regclass('{skip_table}')")) is None:
+                continue
+            attached = conn.scalar(
+                text(
+                    "SELECT count(*) FROM pg_inherits" f" WHERE inhrelid = '{skip_table}'::regclass"
+                )
+            )
+            if attached:
+                conn.execute(
+                    text(f"ALTER TABLE {partition_name(month)} DETACH PARTITION {skip_table}")
+                )
+
+        key = f"{SKIP_ARCHIVE_PREFIX}/{skip_table}.csv.gz"
+        with tempfile.TemporaryFile() as archive:
+            raw = engine.raw_connection()
+            try:
+                with gzip.GzipFile(fileobj=archive, mode="wb") as gz:
+                    raw.cursor().copy_expert(f"COPY {skip_table} TO STDOUT WITH CSV HEADER", gz)
+            finally:
+                raw.close()
+            archive.seek(0)
+            s3_client.upload_fileobj(archive, settings.s3_bucket_name, key)
+
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    # skip_count already includes these skips; only the baseline moves
+                    "INSERT INTO user_interaction_counters"
+                    " (user_id, skip_count, archived_skip_count)"
+                    f" SELECT user_id, count(*), count(*) FROM {skip_table} GROUP BY user_id"
+                    " ON CONFLICT (user_id) DO UPDATE SET archived_skip_count ="
+                    " user_interaction_counters.archived_skip_count"
+                    " + excluded.archived_skip_count"
+                )
+            )
+            conn.execute(text(f"DROP TABLE {skip_table}"))
+
+        logger.info(f"Archived {skip_table} to {key}")
+        archived.append(key)
+
+    return archived
@@ -0,0 +1,40 @@
+"""Listing maintenance tasks."""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.core.cache import LISTINGS_CACHE, bump_cache_version
+from app.core.database import SessionLocal
+from app.models.listing import Listing
+
+logger = logging.getLogger(__name__)
+
+
+def expire_boosts() -> int:
+    """
+    Clear the boost flag on listings whose boost period has ended.
+
+    Runs as a single UPDATE over the partial boosted_until index.
+
+    Returns:
+        Number of listings whose boost was expired
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(Listing)
+            .where(Listing.is_boosted.is_(True), Listing.boosted_until <= datetime.utcnow())
+            .values(is_boosted=False)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        expired = result.rowcount
+        if expired:
+            bump_cache_version(LISTINGS_CACHE)
+            logger.info(f"Expired {expired} listing boosts")
+        return expired
+    finally:
+        db.close()
@@ -0,0 +1,273 @@
+"""Match and conversation maintenance tasks."""
+
+import logging
+from typing import Optional
+
+import redis
+from rq import get_current_job
+from sqlalchemy import delete, exists, func, select, union_all, update
+from sqlalchemy.orm import aliased
+
+from app.core.cache import redis_client
+from app.core.database import SessionLocal, dialect_insert
+from app.core.matching import create_matches
+from app.models.interaction import Interaction, InteractionType
+from app.models.match import Match
+from app.models.message import Conversation, Message, UserUnreadCounter
+from app.models.profile import Profile
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_CHUNK_USERS = 1000  # Liker id range joined per transaction
+BACKFILL_INSERT_BATCH = 500  # Matches created per INSERT
+BACKFILL_CHECKPOINT = "matches:backfill:checkpoint"  # Last liker id completed
+BACKFILL_CHECKPOINT_TTL = 7 * 86400
+REBUILD_CHUNK_MATCHES = 1000  # Match id range rebuilt per transaction
+RECONCILE_CHUNK_USERS = 1000  # User id range of unread counters reconciled per transaction
+
+
+def _get_checkpoint() -> Optional[int]:
+    try:
+        value = redis_client.get(BACKFILL_CHECKPOINT)
+    except redis.RedisError as e:
+        logger.warning(f"Could not read match backfill checkpoint: {e}")
+        return None
+    return int(value) if value is not None else None
+
+
+def _set_checkpoint(user_id: Optional[int]) -> None:
+    try:
+        if user_id is None:
+            redis_client.delete(BACKFILL_CHECKPOINT)
+        else:
+            redis_client.set(BACKFILL_CHECKPOINT, user_id, ex=BACKFILL_CHECKPOINT_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Could not save match backfill checkpoint: {e}")
+
+
+def _report_progress(done: int, total: int, created: int) -> None:
+    """Log progress and publish it on the rq job, if running as one."""
+    logger.info(f"Match backfill: likers up to {done} of {total}, {created} matches created")
+    job = get_current_job()
+    if job is not None:
+        job.meta["progress"] = {"user_id": done, "max_user_id": total, "created": created}
+        job.save_meta()
+
+
+def backfill_matches(restart: bool = False) -> int:
+    """
+    Create the matches missing for reciprocal profile likes across all users.
+
+    Liking users are processed in id ranges. One self-join over interactions per
+    range finds the likes whose profile owner liked the liker's profile back,
+    resolving profile ids to user ids in the same query, and the missing matches are
+    inserted in batches. Each range commits and then saves its last user id as a
+    checkpoint in Redis, so a stopped or failed run resumes where it left off.
+
+    Long-running; enqueue without a job timeout:
+        task_queue.enqueue("app.tasks.matches.backfill_matches", job_timeout=-1)
+
+    Args:
+        restart: Ignore the checkpoint and start from the first user
+
+    Returns:
+        Number of matches created
+    """
+    liked = aliased(Interaction)
+    liked_back = aliased(Interaction)
+    target_profile = aliased(Profile)
+    liker_profile = aliased(Profile)
+
+    db = SessionLocal()
+    try:
+        upper = db.scalar(select(func.max(Interaction.user_id))) or 0
+        checkpoint = None if restart else _get_checkpoint()
+        start = checkpoint + 1 if checkpoint is not None else 0
+        if checkpoint is not None:
+            logger.info(f"Resuming match backfill after user {checkpoint}")
+
+        created = 0
+        while start <= upper:
+            end = start + BACKFILL_CHUNK_USERS - 1
+
+            # Each pair is found once, from the side of its lower user id
+            pairs = db.execute(
+                select(liked.user_id, target_profile.user_id)
+                .join(target_profile, target_profile.id == liked.target_id)
+                .join(liker_profile, liker_profile.user_id == liked.user_id)
+                .join(
+                    liked_back,
+                    (liked_back.user_id == target_profile.user_id)
+                    & (liked_back.target_type == "profile")
+                    & (liked_back.target_id == liker_profile.id)
+                    & (liked_back.action == InteractionType.LIKE),
+                )
+                .where(
+                    liked.user_id.between(start, end),
+                    liked.target_type == "profile",
+                    liked.action == InteractionType.LIKE,
+                    liked.user_id < target_profile.user_id,
+                )
+                .distinct()
+            ).all()
+
+            for i in range(0, len(pairs), BACKFILL_INSERT_BATCH):
+                created += len(create_matches(pairs[i : i + BACKFILL_INSERT_BATCH], db))
+            db.commit()
+
+            _set_checkpoint(end)
+            _report_progress(min(end, upper), upper, created)
+            start = end + 1
+
+        _set_checkpoint(None)
+        logger.info(f"Match backfill complete: {created} matches created")
+        return created
+    finally:
+        db.close()
+
+
+def rebuild_conversations() -> int:
+    """
+    Recompute every conversation summary from the messages table.
+
+    Matches are processed in id ranges, each upserted in its own short transaction,
+    so summaries drifted by a bug or manual data fix are repaired without a long
+    lock. The last message is the one with the highest id.
+
+    Returns:
+        Number of conversations rebuilt
+    """
+    db = SessionLocal()
+    try:
+        upper = db.scalar(select(func.max(Match.id))) or 0
+
+        unread = Message.read.isnot(True)
+        summary = (
+            select(
+                Message.match_id,
+                func.max(Message.id).label("last_message_id"),
+                func.count(Message.id)
+                .filter(unread, Message.sender_id == Match.user2_id)
+                .label("user1_unread"),
+                func.count(Message.id)
+                .filter(unread, Message.sender_id == Match.user1_id)
+                .label("user2_unread"),
+            )
+            .join(Match, Match.id == Message.match_id)
+            .group_by(Message.match_id)
+        )
+
+        fields = [
+            "last_message_id",
+            "last_message_at",
+            "last_sender_id",
+            "user1_unread",
+            "user2_unread",
+        ]
+
+        rebuilt = 0
+        for start in range(0, upper + 1, REBUILD_CHUNK_MATCHES):
+            end = start + REBUILD_CHUNK_MATCHES - 1
+            chunk = summary.where(Message.match_id.between(start, end)).subquery()
+
+            # Summaries of matches left without messages go; the rest are upserted in
+            # place, so a message sent mid-rebuild cannot collide with the insert
+            db.execute(
+                delete(Conversation).where(
+                    Conversation.match_id.between(start, end),
+                    ~exists().where(Message.match_id == Conversation.match_id),
+                )
+            )
+            stmt = dialect_insert(db, Conversation).from_select(
+                ["match_id", *fields],
+                select(
+                    chunk.c.match_id,
+                    chunk.c.last_message_id,
+                    Message.created_at,
+                    Message.sender_id,
+                    chunk.c.user1_unread,
+                    chunk.c.user2_unread,
+                ).join(Message, Message.id == chunk.c.last_message_id),
+            )
+            result = db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["match_id"],
+                    set_={field: stmt.excluded[field] for field in fields},
+                )
+            )
+            db.commit()
+            rebuilt += result.rowcount
+
+        logger.info(f"Rebuilt {rebuilt} conversation summaries")
+        return rebuilt
+    finally:
+        db.close()
+
+
+def reconcile_unread_counters() -> int:
+    """
+    Recompute every user's unread badge counter from the messages table.
+
+    Counts unread messages received in active matches, the same set the counters
+    track. Users are processed in id ranges, each upserted in its own short
+    transaction, so counters drifted by a bug, a failed request or a match
+    deactivated outside the unmatch endpoint are repaired.
+
+    Returns:
+        Number of users with unread messages
+    """
+    db = SessionLocal()
+    try:
+        # Pairs are canonical, so user2_id is the higher id of every match
+        upper = db.scalar(select(func.max(Match.user2_id))) or 0
+
+        def received(user_column, sender_column, start: int, end: int):
+            return (
+                select(user_column.label("user_id"), func.count(Message.id).label("unread"))
+                .join(Message, Message.match_id == Match.id)
+                .where(
+                    user_column.between(start, end),
+                    Message.sender_id == sender_column,
+                    Message.read.isnot(True),
+                    Match.is_active == True,
+                    Match.unmatched.isnot(True),
+                )
+                .group_by(user_column)
+            )
+
+        reconciled = 0
+        for start in range(0, upper + 1, RECONCILE_CHUNK_USERS):
+            end = start + RECONCILE_CHUNK_USERS - 1
+            unread = union_all(
+                received(Match.user1_id, Match.user2_id, start, end),
+                received(Match.user2_id, Match.user1_id, start, end),
+            ).subquery()
+
+            # Counters are reset and upserted in place rather than deleted and
+            # re-inserted, so a message sent mid-reconcile cannot collide with the insert
+            db.execute(
+                update(UserUnreadCounter)
+                .where(
+                    UserUnreadCounter.user_id.between(start, end),
+                    UserUnreadCounter.unread_count != 0,
+                    UserUnreadCounter.user_id.not_in(select(unread.c.user_id)),
+                )
+                .values(unread_count=0)
+            )
+            stmt = dialect_insert(db, UserUnreadCounter).from_select(
+                ["user_id", "unread_count"],
+                select(unread.c.user_id, func.sum(unread.c.unread)).group_by(unread.c.user_id),
+            )
+            result = db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={"unread_count": stmt.excluded.unread_count},
+                )
+            )
+            db.commit()
+            reconciled += result.rowcount
+
+        logger.info(f"Reconciled unread counters for {reconciled} users")
+        return reconciled
+    finally:
+        db.close()
@@ -1,12 +1,69 @@
 """Background worker for processing tasks."""
 
-import os
+import logging
+import sys
+import time
+
 import redis
 from rq import Worker, Queue
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Initialize Redis connection
 redis_conn = redis.from_url(settings.redis_queue_url)
 
 # Create queues
 task_queue = Queue("default", connection=redis_conn)
+
+# Periodic jobs: name -> (task path, interval in seconds)
+PERIODIC_JOBS = {
+    "expire_boosts": ("app.tasks.listings.expire_boosts", 300),
+    "ensure_interaction_partitions": (
+        "app.tasks.interactions.ensure_interaction_partitions",
+        86400,
+    ),
+    "archive_skip_partitions": ("app.tasks.interactions.archive_skip_partitions", 86400),
+    "reconcile_unread_counters": ("app.tasks.matches.reconcile_unread_counters", 3600),
+}
+
+SCHEDULER_TICK = 10  # Seconds between scheduler checks
+
+
+def schedule_periodic_jobs():
+    """
+    Enqueue periodic jobs that are due.
+
+    A Redis key per job, set with NX and the job interval as expiry, ensures each job
+    is enqueued once per interval even with several schedulers running.
+    """
+    for name, (task, interval) in PERIODIC_JOBS.items():
+        if redis_conn.set(f"periodic:{name}", int(time.time()), nx=True, ex=interval):
+            task_queue.enqueue(task)
+            logger.info(f"Enqueued periodic job {name}")
+
+
+def run_scheduler():
+    """Run the periodic job scheduler loop."""
+    while True:
+        try:
+            schedule_periodic_jobs()
+        except redis.RedisError as e:
+            logger.warning(f"Scheduler could not reach Redis: {e}")
+        time.sleep(SCHEDULER_TICK)
+
+
+if __name__ == "__main__":
+    # python -m app.worker            -> process queued jobs
+    # python -m app.worker scheduler  -> enqueue periodic jobs
+    # python -m app.worker interaction-writer -> flush the interaction log to Postgres
+    logging.basicConfig(level=logging.INFO)
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+    if mode == "scheduler":
+        run_scheduler()
+    elif mode == "interaction-writer":
+        from app.tasks.interactions import run_interaction_writer
+
+        run_interaction_writer()
+    else:
+        Worker([task_queue], connection=redis_conn).work()
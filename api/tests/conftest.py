@@ -1,5 +1,9 @@
 """Pytest configuration and fixtures."""
 
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import fakeredis
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -7,6 +11,12 @@ from sqlalchemy.pool import StaticPool
 
 from app.core.database import Base, get_db
 from app.core.config import settings
+from app.core.matching import match_pair
+from app.core.security import create_access_token, get_password_hash
+from app.core.targets import clear_local_targets
+from app.models.match import Match
+from app.models.profile import Profile
+from app.models.user import User, UserRole
 
 # Create in-memory SQLite database for testing
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -18,6 +28,62 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Modules holding the shared Redis client under their own name
+REDIS_CLIENT_MODULES = [
+    "app.core.cache",
+    "app.core.interaction_log",
+    "app.core.presence",
+    "app.core.realtime",
+    "app.core.targets",
+    "app.routers.interactions",
+    "app.tasks.matches",
+]
+
+
+@pytest.fixture(autouse=True)
+def redis_server():
+    """Give each test an empty in-memory Redis, whatever runs at settings.redis_url."""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server)
+    with ExitStack() as stack:
+        for module in REDIS_CLIENT_MODULES:
+            stack.enter_context(patch(f"{module}.redis_client", client))
+        yield server
+
+
+@pytest.fixture
+def redis(redis_server):
+    """Client on the test's Redis, for inspecting or seeding keys."""
+    return fakeredis.FakeRedis(server=redis_server)
+
+
+@pytest.fixture
+def redis_down(redis_server):
+    """Make every Redis call fail as if the server were unreachable."""
+    redis_server.connected = False
+
+
+def make_user(db, email: str, role: UserRole = UserRole.DESIGNER) -> User:
+    """Create a user with a profile."""
+    user = User(email=email, password_hash=get_password_hash("testpass123"), role=role)
+    db.add(user)
+    db.commit()
+    db.add(Profile(user_id=user.id, headline=f"{email} headline"))
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def auth_headers(user: User) -> dict:
+    """Authorization headers for a user."""
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def make_match(user_a: User, user_b: User, **fields) -> Match:
+    """Build (without adding) a match between two users, stored as a canonical pair."""
+    user1_id, user2_id = match_pair(user_a.id, user_b.id)
+    return Match(user1_id=user1_id, user2_id=user2_id, match_type="like", **fields)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -34,6 +100,8 @@ def db_session():
         db.close()
         # Drop all tables
         Base.metadata.drop_all(bind=engine)
+        # Ids are reused by the next test's database
+        clear_local_targets()
 
 
 @pytest.fixture(scope="function")
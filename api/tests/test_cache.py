@@ -0,0 +1,64 @@
+"""Tests for the Redis response cache."""
+
+import json
+
+
+from app.core.cache import _entry_key, bump_cache_version, get_cached_response
+
+NAMESPACE = "test"
+PARAMS = {"page": 1}
+
+
+def counting_compute():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"version": len(calls)}
+
+    return compute, calls
+
+
+async def test_fresh_entry_is_served_from_cache(redis):
+    """A fresh entry is returned without recomputing."""
+    compute, calls = counting_compute()
+
+    first = await get_cached_response(NAMESPACE, PARAMS, compute)
+    second = await get_cached_response(NAMESPACE, PARAMS, compute)
+
+    assert json.loads(first) == json.loads(second) == {"version": 1}
+    assert len(calls) == 1
+
+
+async def test_version_bump_makes_entries_stale(redis):
+    """After bump_cache_version the next request recomputes."""
+    compute, calls = counting_compute()
+    await get_cached_response(NAMESPACE, PARAMS, compute)
+
+    bump_cache_version(NAMESPACE)
+
+    assert json.loads(await get_cached_response(NAMESPACE, PARAMS, compute)) == {"version": 2}
+    assert len(calls) == 2
+
+
+async def test_stale_entry_is_served_while_another_request_recomputes(redis):
+    """Without the lock, a request serves the stale body instead of recomputing."""
+    compute, calls = counting_compute()
+    await get_cached_response(NAMESPACE, PARAMS, compute)
+    bump_cache_version(NAMESPACE)
+
+    # Another request is revalidating the entry
+    redis.set(f"{_entry_key(NAMESPACE, PARAMS)}:lock", "1")
+
+    assert json.loads(await get_cached_response(NAMESPACE, PARAMS, compute)) == {"version": 1}
+    assert len(calls) == 1
+
+
+async def test_computes_directly_when_redis_is_down(redis_down):
+    """With Redis unavailable every request is computed and nothing fails."""
+    compute, calls = counting_compute()
+
+    for _ in range(2):
+        body = await get_cached_response(NAMESPACE, PARAMS, compute)
+        assert json.loads(body) == {"version": len(calls)}
+    assert len(calls) == 2
@@ -0,0 +1,137 @@
+"""Tests for real-time event sockets."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import Response
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.realtime import CLOSE_TRY_AGAIN_LATER, OUTBOUND_QUEUE_SIZE, Connection, hub
+from app.core.security import create_access_token
+from app.models.user import UserRole
+from app.routers.events import SSE_RETRY_MS, _stream_events, format_event
+from tests.conftest import make_user
+
+
+def wait_for_connections(count: int) -> None:
+    deadline = time.monotonic() + 5
+    while hub.connection_count != count:
+        assert time.monotonic() < deadline, "socket was not registered"
+        time.sleep(0.01)
+
+
+def dispatch(user_id: int, payloads) -> None:
+    """Deliver events as the Redis listener would, on the app's event loop."""
+    hub._loop.call_soon_threadsafe(lambda: [hub.dispatch(user_id, p) for p in payloads])
+
+
+def test_socket_requires_valid_token(client):
+    """Sockets without a valid access token are closed before they are accepted."""
+    for url in ("/events/ws", "/events/ws?token=not-a-token"):
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect(url) as websocket:
+                websocket.receive_text()
+
+
+def test_socket_receives_events_and_drops_slow_consumers(client, db: Session):
+    """Events reach the user's socket; a socket that falls too far behind is closed."""
+    user = make_user(db, "alice@example.com", UserRole.HIRER)
+    user_id = user.id
+    token = create_access_token({"sub": str(user_id)})
+
+    with client.websocket_connect(f"/events/ws?token={token}") as websocket:
+        wait_for_connections(1)
+
+        dispatch(user_id, ['{"type": "message", "data": {"id": 1}}'])
+        assert websocket.receive_json() == {"type": "message", "data": {"id": 1}}
+
+        dispatch(user_id, ["{}"] * (OUTBOUND_QUEUE_SIZE + 1))
+        with pytest.raises(WebSocketDisconnect) as closed:
+            while True:
+                websocket.receive_text()
+        assert closed.value.code == CLOSE_TRY_AGAIN_LATER
+
+    wait_for_connections(0)
+
+
+def test_stream_requires_valid_token(client, db: Session):
+    """The event stream rejects missing tokens and malformed Last-Event-IDs."""
+    assert client.get("/events/stream").status_code == 401
+
+    user = make_user(db, "alice@example.com", UserRole.HIRER)
+    token = create_access_token({"sub": str(user.id)})
+    response = client.get(f"/events/stream?token={token}", headers={"Last-Event-ID": "x"})
+    assert response.status_code == 400
+
+
+def fake_connect(connection: Connection):
+    async def connect(user_id):
+        return connection
+
+    return connect
+
+
+async def collect_stream(monkeypatch, last_event_id, has_event: bool):
+    events = {"1-0": '{"type": "message"}', "2-0": '{"type": "match"}'}
+
+    async def read_events(user_id, after_id, count=None):
+        return [(i, p) for i, p in events.items() if i > after_id]
+
+    async def event_exists(user_id, event_id):
+        return has_event
+
+    async def latest_event_id(user_id):
+        return "2-0"
+
+    monkeypatch.setattr(hub, "read_events", read_events)
+    monkeypatch.setattr(hub, "has_event", event_exists)
+    monkeypatch.setattr(hub, "latest_event_id", latest_event_id)
+
+    connection = Connection(1)
+    connection.queue.put_nowait(None)  # End the stream after the catch-up read
+    monkeypatch.setattr(hub, "connect", fake_connect(connection))
+    return [frame async for frame in _stream_events(1, last_event_id)]
+
+
+async def test_stream_resumes_after_last_event_id(monkeypatch):
+    """A reconnecting client gets the events after its Last-Event-ID, or a resync."""
+    frames = await collect_stream(monkeypatch, "1-0", has_event=True)
+    assert frames[1:] == [format_event("2-0", '{"type": "match"}')]
+
+    # The client's last event was trimmed from the stream
+    frames = await collect_stream(monkeypatch, "1-0", has_event=False)
+    assert frames[1:] == [format_event("2-0", '{"type": "resync", "data": {}}')]
+
+    # A new client starts at the end of the stream
+    frames = await collect_stream(monkeypatch, None, has_event=False)
+    assert frames[1:] == ["id: 2-0\n\n"]
+
+
+async def test_stream_forwards_ephemeral_events(monkeypatch):
+    """Ephemeral events are sent straight from pub/sub, without an event ID."""
+    connection = Connection(1)
+    connection.queue.put_nowait('{"type": "typing", "ephemeral": true}')
+    frames = _stream_events(1, "0-0")
+
+    async def no_events(user_id, after_id, count=None):
+        return []
+
+    monkeypatch.setattr(hub, "read_events", no_events)
+    monkeypatch.setattr(hub, "connect", fake_connect(connection))
+    assert await anext(frames) == f"retry: {SSE_RETRY_MS}\n\n"
+    assert await anext(frames) == 'data: {"type": "typing", "ephemeral": true}\n\n'
+    await frames.aclose()
+
+
+def test_stream_registers_connection_only_once_started(client, db: Session):
+    """A stream that never starts sending holds no hub connection."""
+    user = make_user(db, "alice@example.com", UserRole.HIRER)
+    token = create_access_token({"sub": str(user.id)})
+
+    with patch("app.routers.events.StreamingResponse") as streaming_response:
+        streaming_response.return_value = Response()
+        assert client.get(f"/events/stream?token={token}").status_code == 200
+
+    assert hub.connection_count == 0
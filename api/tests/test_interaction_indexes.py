@@ -0,0 +1,117 @@
+"""
+Query plan tests for the interaction indexes.
+
+These need a real Postgres database and are skipped unless TEST_POSTGRES_URL points
+at a scratch database (all tables are created and dropped).
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.matching import find_reverse_likes
+from app.models.interaction import Interaction, InteractionType
+from app.models.user import User, UserRole
+from app.routers.interactions import check_duplicate_interaction
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    engine = create_engine(POSTGRES_URL)
+    Base.metadata.create_all(engine)
+
+    session = sessionmaker(bind=engine)()
+    users = [
+        User(email=f"user{i}@example.com", password_hash="x", role=UserRole.DESIGNER)
+        for i in range(50)
+    ]
+    session.add_all(users)
+    session.commit()
+
+    now = datetime.utcnow()
+    session.execute(
+        Interaction.__table__.insert(),
+        [
+            {
+                "user_id": users[i % 50].id,
+                "target_type": "profile" if i % 3 else "listing",
+                "target_id": i % 997,
+                "action": list(InteractionType)[i % 4],
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(20000)
+        ],
+    )
+    session.commit()
+    session.close()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Sets the visibility map so index-only scans need no heap fetches
+        conn.execute(text("VACUUM ANALYZE interactions"))
+
+    yield engine
+
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def explain_scans(engine, run) -> list:
+    """Run a lookup and return the (node type, index name) pairs of its query plan."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    session = sessionmaker(bind=engine)()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = cursor.fetchone()[0][0]["Plan"]
+    finally:
+        raw.close()
+        session.close()
+
+    scans = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            scans.append((node["Node Type"], node["Index Name"]))
+        stack.extend(node.get("Plans", []))
+    return scans
+
+
+def test_duplicate_check_is_index_only(pg_engine):
+    """The 24-hour duplicate check reads only the covering dedupe index."""
+    scans = explain_scans(
+        pg_engine,
+        lambda db: check_duplicate_interaction(1, "profile", 10, InteractionType.LIKE, db),
+    )
+
+    assert scans == [("Index Only Scan", "idx_interactions_dedupe")]
+
+
+def test_reverse_like_lookup_is_index_only(pg_engine):
+    """The reverse-like lookup on the write path reads only the dedupe index."""
+    scans = explain_scans(pg_engine, lambda db: find_reverse_likes([(1, 10), (2, 11)], db))
+
+    assert scans
+    assert all(scan == ("Index Only Scan", "idx_interactions_dedupe") for scan in scans)
+
@@ -0,0 +1,381 @@
+"""Tests for interaction endpoints."""
+
+import json
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.interaction_log import (
+    INTERACTION_DEAD_LETTERS,
+    INTERACTION_STREAM,
+    INTERACTION_WRITERS,
+    build_interaction_event,
+    insert_interactions,
+    parse_interaction_event,
+)
+from app.core.targets import invalidate_target
+from app.models.interaction import Interaction, InteractionType, UserInteractionCounter
+from app.models.user import UserRole
+from app.routers.interactions import DUPLICATE_WINDOW
+from app.tasks.interactions import (
+    add_months,
+    ensure_writer_group,
+    flush_interaction_log,
+    partition_name,
+    rebuild_interaction_counters,
+)
+from tests.conftest import TestingSessionLocal, auth_headers, make_user
+
+
+@pytest.fixture
+def swiper(db: Session):
+    return make_user(db, "swiper@example.com", UserRole.HIRER)
+
+
+@pytest.fixture
+def designers(db: Session):
+    return [make_user(db, f"designer{i}@example.com") for i in range(3)]
+
+
+def test_create_interaction(client, db: Session, swiper, designers):
+    """A single swipe is recorded."""
+    target = designers[0].profile
+
+    response = client.post(
+        "/interactions",
+        json={"target_type": "profile", "target_id": target.id, "action": "like"},
+        headers=auth_headers(swiper),
+    )
+
+    assert response.status_code == 201
+    assert response.json()["target_id"] == target.id
+
+
+def test_create_interaction_rejects_duplicate(client, db: Session, swiper, designers):
+    """Repeating a swipe within 24 hours is rejected."""
+    payload = {"target_type": "profile", "target_id": designers[0].profile.id, "action": "like"}
+
+    client.post("/interactions", json=payload, headers=auth_headers(swiper))
+    response = client.post("/interactions", json=payload, headers=auth_headers(swiper))
+
+    assert response.status_code == 400
+
+
+def test_deleted_target_is_invalidated(client, db: Session, swiper, designers):
+    """Once a cached profile is deleted, swipes on it are rejected."""
+    payload = {"target_type": "profile", "target_id": designers[0].profile.id, "action": "like"}
+    assert (
+        client.post("/interactions", json=payload, headers=auth_headers(swiper)).status_code == 201
+    )
+
+    assert client.delete("/profiles/me", headers=auth_headers(designers[0])).status_code == 204
+
+    response = client.post(
+        "/interactions", json={**payload, "action": "skip"}, headers=auth_headers(swiper)
+    )
+    assert response.status_code == 404
+
+
+def test_inactive_target_is_rejected(client, db: Session, redis, swiper, designers):
+    """Swipes on a deactivated profile are rejected as not found."""
+    profile = designers[0].profile
+    payload = {"target_type": "profile", "target_id": profile.id, "action": "like"}
+    assert (
+        client.post("/interactions", json=payload, headers=auth_headers(swiper)).status_code == 201
+    )
+    owner = f"{designers[0].id}:1".encode()
+    assert redis.hget("targets:profile", profile.id) == owner
+
+    profile.is_active = False
+    db.commit()
+    invalidate_target("profile", profile.id)
+    assert redis.hget("targets:profile", profile.id) is None
+
+    payload["action"] = "skip"
+    response = client.post("/interactions", json=payload, headers=auth_headers(swiper))
+    assert response.status_code == 404
+
+    response = client.post(
+        "/interactions/batch", json={"items": [payload]}, headers=auth_headers(swiper)
+    )
+    assert response.json()["results"][0]["status"] == "not_found"
+
+
+def test_duplicate_guard_rejects_without_database(client, db: Session, redis, swiper, designers):
+    """A swipe already claimed in the Redis guard is rejected without a database check."""
+    profile_id = designers[0].profile.id
+    payload = {"target_type": "profile", "target_id": profile_id, "action": "like"}
+
+    assert (
+        client.post("/interactions", json=payload, headers=auth_headers(swiper)).status_code == 201
+    )
+    key = f"swipe:{swiper.id}:profile:{profile_id}:like"
+    assert 0 < redis.ttl(key) <= DUPLICATE_WINDOW.total_seconds()
+
+    # Only the guard knows about the first swipe now
+    db.query(Interaction).delete()
+    db.commit()
+    response = client.post("/interactions", json=payload, headers=auth_headers(swiper))
+
+    assert response.status_code == 400
+    assert db.query(Interaction).count() == 0
+
+
+def test_duplicate_check_falls_back_to_database(client, db: Session, redis_down, swiper, designers):
+    """With Redis down, swipes already in the database are still rejected as duplicates."""
+    db.add(
+        Interaction(
+            user_id=swiper.id,
+            target_type="profile",
+            target_id=designers[0].profile.id,
+            action=InteractionType.LIKE,
+        )
+    )
+    db.commit()
+    items = [
+        {"target_type": "profile", "target_id": designers[0].profile.id, "action": "like"},
+        {"target_type": "profile", "target_id": designers[1].profile.id, "action": "like"},
+        {"target_type": "profile", "target_id": designers[1].profile.id, "action": "like"},
+    ]
+
+    response = client.post("/interactions", json=items[0], headers=auth_headers(swiper))
+    assert response.status_code == 400
+
+    response = client.post(
+        "/interactions/batch", json={"items": items}, headers=auth_headers(swiper)
+    )
+    assert [r["status"] for r in response.json()["results"]] == [
+        "duplicate",
+        "created",
+        "duplicate",
+    ]
+    assert db.query(Interaction).filter(Interaction.user_id == swiper.id).count() == 2
+
+
+def test_interactions_store_smallint_codes(client, db: Session, swiper, designers):
+    """target_type and action are stored as codes and read back as before."""
+    client.post(
+        "/interactions",
+        json={"target_type": "profile", "target_id": designers[0].profile.id, "action": "skip"},
+        headers=auth_headers(swiper),
+    )
+
+    assert db.execute(text("SELECT target_type, action FROM interactions")).one() == (1, 2)
+    stored = db.query(Interaction).filter(Interaction.action == InteractionType.SKIP).one()
+    assert (stored.target_type, stored.action) == ("profile", InteractionType.SKIP)
+
+
+def test_coded_columns_keep_statement_caching():
+    """Queries filtering on the coded columns still get a compiled-statement cache key."""
+    stmt = select(Interaction).where(
+        Interaction.target_type == "profile", Interaction.action == InteractionType.LIKE
+    )
+    assert stmt._generate_cache_key() is not None
+
+
+def test_write_behind_falls_back_when_redis_unavailable(
+    client, db: Session, swiper, designers, monkeypatch
+):
+    """With write-behind enabled but Redis down, the swipe is written synchronously."""
+    monkeypatch.setattr(settings, "interactions_write_behind", True)
+    monkeypatch.setattr("app.routers.interactions.append_interaction_event", lambda event: False)
+
+    response = client.post(
+        "/interactions",
+        json={"target_type": "profile", "target_id": designers[0].profile.id, "action": "like"},
+        headers=auth_headers(swiper),
+    )
+
+    assert response.status_code == 201
+    assert db.query(Interaction).filter(Interaction.user_id == swiper.id).count() == 1
+
+
+def test_flushing_redelivered_event_is_idempotent(db: Session, swiper, designers):
+    """An event written twice, as after a redelivery, produces a single row."""
+    event = build_interaction_event(
+        swiper.id, "profile", designers[0].profile.id, InteractionType.SKIP
+    )
+    fields = {k.encode(): str(v).encode() for k, v in event.items()}
+
+    assert len(insert_interactions(db, [parse_interaction_event(fields)], True)[0]) == 1
+    assert len(insert_interactions(db, [parse_interaction_event(fields)], True)[0]) == 0
+    db.commit()
+
+    stored = db.query(Interaction).filter(Interaction.user_id == swiper.id).one()
+    assert stored.idempotency_key == event["idempotency_key"]
+    assert stored.action == InteractionType.SKIP
+
+
+def test_rejected_event_is_dead_lettered(db: Session, redis, swiper, designers):
+    """An event the database rejects is moved aside instead of stalling its batch."""
+    conn = redis
+    ensure_writer_group(conn)
+    poison_user_id = 999
+    for user_id, designer in ((swiper.id, designers[0]), (poison_user_id, designers[1])):
+        event = build_interaction_event(
+            user_id, "profile", designer.profile.id, InteractionType.SKIP
+        )
+        conn.xadd(INTERACTION_STREAM, {k: str(v) for k, v in event.items()})
+
+    def insert_checking_users(db, rows, ignore_duplicates=False):
+        # SQLite does not enforce the user foreign key; fail as Postgres would
+        if any(row["user_id"] == poison_user_id for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        return insert_interactions(db, rows, ignore_duplicates)
+
+    with (
+        patch("app.tasks.interactions.SessionLocal", TestingSessionLocal),
+        patch("app.tasks.interactions.insert_interactions", insert_checking_users),
+    ):
+        assert flush_interaction_log(conn, "writer") == 2
+
+    assert db.query(Interaction).filter(Interaction.user_id == swiper.id).count() == 1
+    assert conn.xpending(INTERACTION_STREAM, INTERACTION_WRITERS)["pending"] == 0
+    [(_, dead)] = conn.xrange(INTERACTION_DEAD_LETTERS)
+    assert dead[b"user_id"] == str(poison_user_id).encode()
+    assert b"foreign key" in dead[b"error"]
+
+
+def test_batch_interactions(client, db: Session, swiper, designers):
+    """Each batch item gets its own result and accepted items are stored."""
+    client.post(
+        "/interactions",
+        json={"target_type": "profile", "target_id": designers[1].profile.id, "action": "like"},
+        headers=auth_headers(swiper),
+    )
+
+    items = [
+        {"target_type": "profile", "target_id": designers[0].profile.id, "action": "like"},
+        {"target_type": "profile", "target_id": designers[1].profile.id, "action": "like"},
+        {"target_type": "profile", "target_id": 9999, "action": "skip"},
+        {"target_type": "profile", "target_id": swiper.profile.id, "action": "like"},
+        {"target_type": "profile", "target_id": designers[2].profile.id, "action": "skip"},
+        {"target_type": "profile", "target_id": designers[2].profile.id, "action": "skip"},
+    ]
+
+    response = client.post(
+        "/interactions/batch", json={"items": items}, headers=auth_headers(swiper)
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [
+        "created",
+        "duplicate",
+        "not_found",
+        "own_target",
+        "created",
+        "duplicate",
+    ]
+    assert results[0]["interaction"]["target_id"] == designers[0].profile.id
+    assert db.query(Interaction).filter(Interaction.user_id == swiper.id).count() == 3
+
+
+def test_interaction_stats_use_counters(client, db: Session, swiper, designers):
+    """Stats reflect counters maintained on insert and match a rebuild from the log."""
+    headers = auth_headers(swiper)
+    items = [
+        {"target_type": "profile", "target_id": designers[0].profile.id, "action": "like"},
+        {"target_type": "profile", "target_id": designers[1].profile.id, "action": "skip"},
+        {"target_type": "profile", "target_id": designers[2].profile.id, "action": "skip"},
+    ]
+    client.post("/interactions/batch", json={"items": items}, headers=headers)
+
+    expected = {
+        "total_interactions": 3,
+        "by_action": {"like": 1, "skip": 2, "apply": 0, "super_like": 0},
+    }
+    response = client.get("/interactions/stats", headers=headers)
+    assert response.json() == expected
+
+    db.query(UserInteractionCounter).delete()
+    db.commit()
+    with patch("app.tasks.interactions.SessionLocal", TestingSessionLocal):
+        rebuild_interaction_counters()
+
+    response = client.get("/interactions/stats", headers=headers)
+    assert response.json() == expected
+
+
+def test_rebuild_keeps_archived_skips(db: Session, swiper, designers):
+    """Skips archived with their partitions stay counted after a rebuild."""
+    insert_interactions(
+        db,
+        [
+            build_interaction_event(
+                swiper.id, "profile", designers[0].profile.id, InteractionType.SKIP
+            ),
+            build_interaction_event(
+                designers[1].id, "profile", designers[2].profile.id, InteractionType.LIKE
+            ),
+        ],
+    )
+    db.commit()
+    # As left by archive_skip_partitions: 4 skips moved to cold storage
+    counters = db.get(UserInteractionCounter, swiper.id)
+    counters.skip_count += 4
+    counters.archived_skip_count = 4
+    db.add(UserInteractionCounter(user_id=designers[0].id, skip_count=2, archived_skip_count=2))
+    db.commit()
+
+    with patch("app.tasks.interactions.SessionLocal", TestingSessionLocal):
+        rebuild_interaction_counters()
+
+    db.expire_all()
+    totals = {
+        c.user_id: (c.like_count, c.skip_count, c.archived_skip_count)
+        for c in db.query(UserInteractionCounter)
+    }
+    assert totals == {swiper.id: (0, 5, 4), designers[0].id: (0, 2, 2), designers[1].id: (1, 0, 0)}
+
+
+def test_batch_interactions_size_limit(client, swiper):
+    """Batches larger than the limit are rejected."""
+    items = [{"target_type": "profile", "target_id": i, "action": "skip"} for i in range(51)]
+
+    response = client.post(
+        "/interactions/batch", json={"items": items}, headers=auth_headers(swiper)
+    )
+
+    assert response.status_code == 422
+
+
+def test_partition_months():
+    """Monthly partition names and bounds roll over year ends."""
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name(date(2027, 1, 1)) == "interactions_2027_01"
+
+
+def test_export_interactions(client, db: Session, swiper, designers):
+    """The export streams the user's interactions as NDJSON, honouring since."""
+    start = datetime(2026, 1, 1)
+    for i, designer in enumerate(designers):
+        db.add(
+            Interaction(
+                user_id=swiper.id,
+                target_type="profile",
+                target_id=designer.profile.id,
+                action=InteractionType.LIKE,
+                created_at=start + timedelta(days=i),
+            )
+        )
+    db.commit()
+
+    response = client.get("/interactions/export", headers=auth_headers(swiper))
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["target_id"] for r in rows] == [d.profile.id for d in designers]
+    assert rows[0]["action"] == "like"
+
+    response = client.get(
+        "/interactions/export",
+        params={"since": (start + timedelta(days=1)).isoformat()},
+        headers=auth_headers(swiper),
+    )
+    assert len(response.text.splitlines()) == 2
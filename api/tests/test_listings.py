@@ -0,0 +1,255 @@
+"""Tests for listing endpoints."""
+
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.cache import LISTINGS_CACHE, bump_cache_version
+from app.core.security import create_access_token, get_password_hash
+from app.models.listing import Listing, ListingStatus, annualize_compensation
+from app.models.user import User, UserRole
+from app.tasks.listings import expire_boosts
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def hirer(db: Session):
+    """Create a hirer user."""
+    user = User(
+        email="hirer@example.com",
+        password_hash=get_password_hash("testpass123"),
+        role=UserRole.HIRER,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def hirer_headers(hirer: User):
+    """Authorization headers for the hirer."""
+    token = create_access_token({"sub": str(hirer.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def make_listing(db: Session, owner: User, **fields) -> Listing:
+    """Insert an active listing with sensible defaults."""
+    data = {
+        "user_id": owner.id,
+        "title": "Product Designer",
+        "company": "Acme",
+        "description": "Design things",
+        "skills_required": '["Figma"]',
+        "status": ListingStatus.ACTIVE,
+        **fields,
+    }
+    listing = Listing(**data)
+    listing.update_annual_compensation()
+    db.add(listing)
+    db.commit()
+    db.refresh(listing)
+    bump_cache_version(LISTINGS_CACHE)
+    return listing
+
+
+def test_annualize_compensation():
+    """Hourly rates are annualized and combined with the salary range."""
+    assert annualize_compensation(None, None, None) == (None, None)
+    assert annualize_compensation(Decimal("50000"), Decimal("90000"), None) == (
+        Decimal("50000"),
+        Decimal("90000"),
+    )
+    assert annualize_compensation(None, None, Decimal("50")) == (
+        Decimal("100000"),
+        Decimal("100000"),
+    )
+    assert annualize_compensation(Decimal("80000"), Decimal("90000"), Decimal("50")) == (
+        Decimal("80000"),
+        Decimal("100000"),
+    )
+
+
+def test_create_listing_sets_annual_compensation(client, db: Session, hirer_headers):
+    """Creating a listing stores its annualized compensation bounds."""
+    response = client.post(
+        "/listings",
+        json={
+            "title": "Contract Designer",
+            "company": "Acme",
+            "description": "Short contract",
+            "skills_required": ["Figma"],
+            "hourly_rate": "60",
+            "status": "active",
+        },
+        headers=hirer_headers,
+    )
+
+    assert response.status_code == 201
+    listing = db.query(Listing).filter(Listing.id == response.json()["id"]).first()
+    assert listing.comp_annual_min == Decimal("120000")
+    assert listing.comp_annual_max == Decimal("120000")
+
+
+def test_update_listing_refreshes_annual_compensation(client, db: Session, hirer, hirer_headers):
+    """Changing compensation fields recomputes the annualized bounds."""
+    listing = make_listing(db, hirer, salary_min=Decimal("50000"), salary_max=Decimal("60000"))
+
+    response = client.put(
+        f"/listings/{listing.id}", json={"salary_max": "150000"}, headers=hirer_headers
+    )
+
+    assert response.status_code == 200
+    db.refresh(listing)
+    assert listing.comp_annual_max == Decimal("150000")
+
+
+def test_salary_filters_include_hourly_listings(client, db: Session, hirer):
+    """Salary filters match both salaried and hourly listings."""
+    salaried = make_listing(db, hirer, salary_min=Decimal("70000"), salary_max=Decimal("90000"))
+    hourly = make_listing(db, hirer, hourly_rate=Decimal("30"))  # 60k/year
+    make_listing(db, hirer)  # No compensation listed
+
+    response = client.get("/listings", params={"min_salary": "80000"})
+    assert [listing["id"] for listing in response.json()["items"]] == [salaried.id]
+
+    response = client.get("/listings", params={"max_salary": "65000"})
+    assert [listing["id"] for listing in response.json()["items"]] == [hourly.id]
+
+    response = client.get("/listings", params={"min_salary": "50000", "max_salary": "75000"})
+    assert {listing["id"] for listing in response.json()["items"]} == {salaried.id, hourly.id}
+
+
+def test_listing_feed_keyset_pagination(client, db: Session, hirer):
+    """Feed pages follow boosted-first, newest-first order via next_cursor."""
+    start = datetime(2026, 1, 1)
+    listings = [make_listing(db, hirer, created_at=start + timedelta(hours=i)) for i in range(5)]
+    listings[1].is_boosted = True
+    listings[1].boosted_until = datetime.utcnow() + timedelta(days=7)
+    db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+
+    expected = [listings[1].id] + [
+        listing.id for listing in reversed(listings) if listing.id != listings[1].id
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/listings", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_listing_feed_rejects_tampered_cursor(client):
+    """A cursor that fails signature verification is rejected."""
+    response = client.get("/listings", params={"cursor": "bm90LWEtcmVhbC1jdXJzb3I"})
+
+    assert response.status_code == 400
+
+
+def test_expired_boost_is_not_ranked_first(client, db: Session, hirer):
+    """A boost past boosted_until no longer ranks first, even before the expiry job runs."""
+    older = make_listing(db, hirer, created_at=datetime(2026, 1, 1))
+    newer = make_listing(db, hirer, created_at=datetime(2026, 1, 2))
+    older.is_boosted = True
+    older.boosted_until = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+    bump_cache_version(LISTINGS_CACHE)
+
+    page = client.get("/listings").json()
+
+    assert [item["id"] for item in page["items"]] == [newer.id, older.id]
+    assert page["items"][1]["is_boosted"] is False
+
+
+def test_expire_boosts(db: Session, hirer, redis):
+    """The expiry job clears ended boosts, keeps live ones and invalidates the browse cache."""
+    now = datetime.utcnow()
+    expired = make_listing(db, hirer, is_boosted=True, boosted_until=now - timedelta(hours=1))
+    live = make_listing(db, hirer, is_boosted=True, boosted_until=now + timedelta(days=1))
+    version = int(redis.get("cache:listings:version"))
+
+    with patch("app.tasks.listings.SessionLocal", TestingSessionLocal):
+        assert expire_boosts() == 1
+        assert expire_boosts() == 0
+
+    db.expire_all()
+    assert expired.is_boosted is False
+    assert live.is_boosted is True
+    # Bumped for the run that expired a boost, not for the one that found none
+    assert int(redis.get("cache:listings:version")) == version + 1
+
+
+def test_bulk_import_ndjson(client, db: Session, hirer_headers):
+    """NDJSON rows are imported in order with a per-row result stream."""
+    rows = [
+        {"title": "Designer 1", "company": "Acme", "description": "d", "skills_required": ["UI"]},
+        {"title": "Designer 2", "company": "Acme"},
+        {
+            "title": "Designer 3",
+            "company": "Acme",
+            "description": "Click here to buy now",
+            "skills_required": ["UX"],
+            "hourly_rate": "40",
+        },
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+
+    response = client.post(
+        "/listings/bulk",
+        content=body,
+        headers={**hirer_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r.get("status") for r in results[:4]] == ["created", "error", "created", "error"]
+    assert results[2]["flagged"] is True
+    assert results[-1] == {"summary": {"created": 2, "failed": 2}}
+
+    flagged = db.query(Listing).filter(Listing.id == results[2]["id"]).first()
+    assert flagged.is_active is False
+    assert flagged.comp_annual_max == Decimal("80000")
+
+
+def test_bulk_import_csv(client, db: Session, hirer_headers):
+    """CSV rows use a header row and ';'-separated skills."""
+    body = (
+        "title,company,description,skills_required,salary_min,salary_max\n"
+        'Brand Designer,Acme,"Logos, and\nmore",Branding;Illustrator,50000,70000\n'
+        "Bad Range,Acme,desc,UI,90000,10000\n"
+    )
+
+    response = client.post(
+        "/listings/bulk",
+        content=body,
+        headers={**hirer_headers, "Content-Type": "text/csv"},
+    )
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r.get("status") for r in results[:2]] == ["created", "error"]
+
+    listing = db.query(Listing).filter(Listing.id == results[0]["id"]).first()
+    assert listing.description == "Logos, and\nmore"
+    assert json.loads(listing.skills_required) == ["Branding", "Illustrator"]
+
+
+def test_bulk_import_rejects_unknown_content_type(client, hirer_headers):
+    """Only NDJSON and CSV bodies are accepted."""
+    response = client.post(
+        "/listings/bulk", content="{}", headers={**hirer_headers, "Content-Type": "text/plain"}
+    )
+
+    assert response.status_code == 415
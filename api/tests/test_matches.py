@@ -0,0 +1,177 @@
+"""Tests for match detection and match endpoints."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from app.core.interaction_log import build_interaction_event, insert_interactions
+from app.core.matching import create_matches
+from app.models.interaction import Interaction, InteractionType
+from app.models.match import Match
+from app.models.message import Conversation, Message
+from app.models.user import UserRole
+from app.tasks.matches import backfill_matches, rebuild_conversations
+from tests.conftest import TestingSessionLocal, auth_headers, make_match, make_user
+
+
+def like(client, user, profile):
+    return client.post(
+        "/interactions",
+        json={"target_type": "profile", "target_id": profile.id, "action": "like"},
+        headers=auth_headers(user),
+    )
+
+
+def test_reciprocated_like_creates_match(client, db: Session):
+    """The like that completes a pair creates the match and returns it."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    alice_headers, bob_headers = auth_headers(alice), auth_headers(bob)
+    alice_profile, bob_profile = alice.profile, bob.profile
+
+    first = like(client, alice, bob_profile)
+    assert first.status_code == 201
+    assert first.json()["match"] is None
+
+    second = like(client, bob, alice_profile)
+    assert second.status_code == 201
+    match = second.json()["match"]
+    assert {match["user1_id"], match["user2_id"]} == {alice.id, bob.id}
+
+    assert client.post("/matches", headers=alice_headers).json()["id"] == match["id"]
+    assert client.post("/matches", headers=bob_headers).json()["id"] == match["id"]
+
+
+def test_one_sided_like_creates_no_match(client, db: Session):
+    """A like that is not reciprocated leaves no match to find."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    alice_headers = auth_headers(alice)
+
+    assert like(client, alice, bob.profile).status_code == 201
+
+    assert client.post("/matches", headers=alice_headers).status_code == 404
+    assert db.query(Match).count() == 0
+
+
+def test_pair_liked_in_one_flush_creates_one_match(db: Session):
+    """Both likes arriving in the same write create a single match."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    rows = [
+        build_interaction_event(alice.id, "profile", bob.profile.id, InteractionType.LIKE),
+        build_interaction_event(bob.id, "profile", alice.profile.id, InteractionType.LIKE),
+    ]
+    for row in rows:
+        row["action"] = InteractionType.LIKE
+
+    interactions, matches = insert_interactions(db, rows, ignore_duplicates=True)
+    db.commit()
+
+    assert len(interactions) == 2
+    assert len({match.id for match in matches.values()}) == 1
+    assert db.query(Match).count() == 1
+
+
+def test_create_matches_stores_canonical_pair_once(db: Session):
+    """A pair gets one match whichever order its users are given in."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+
+    created = create_matches([(bob.id, alice.id)], db)
+    assert list(created) == [(min(alice.id, bob.id), max(alice.id, bob.id))]
+
+    assert create_matches([(alice.id, bob.id), (bob.id, alice.id)], db) == {}
+    db.commit()
+
+    assert db.query(Match).count() == 1
+
+
+def test_backfill_creates_missing_matches(db: Session):
+    """Reciprocal likes written without match detection are matched by the backfill."""
+    users = [make_user(db, f"user{i}@example.com") for i in range(4)]
+    profiles = [user.profile.id for user in users]
+    ids = [user.id for user in users]
+
+    def likes(liker, liked):
+        return Interaction(
+            user_id=ids[liker],
+            target_type="profile",
+            target_id=profiles[liked],
+            action=InteractionType.LIKE,
+        )
+
+    # 0 <-> 1 and 2 <-> 3 are mutual, 0 -> 2 is one-sided; 2 <-> 3 is already matched
+    db.add_all([likes(0, 1), likes(1, 0), likes(2, 3), likes(3, 2), likes(0, 2)])
+    create_matches([(ids[2], ids[3])], db)
+    db.commit()
+
+    with patch("app.tasks.matches.SessionLocal", TestingSessionLocal):
+        assert backfill_matches() == 1
+        assert backfill_matches() == 0
+
+    pairs = {(m.user1_id, m.user2_id) for m in db.query(Match).all()}
+    assert pairs == {tuple(sorted((ids[0], ids[1]))), tuple(sorted((ids[2], ids[3])))}
+
+
+def test_inbox_orders_by_activity_with_last_message(client, db: Session):
+    """The inbox lists matches by last activity with previews and unread counts."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    carol = make_user(db, "carol@example.com")
+    headers = auth_headers(alice)
+    now = datetime.utcnow()
+
+    with_bob = make_match(alice, bob, created_at=now - timedelta(days=3))
+    with_carol = make_match(alice, carol, created_at=now - timedelta(days=2))
+    db.add_all([with_bob, with_carol])
+    db.flush()
+    db.add_all(
+        [
+            Message(
+                match_id=with_bob.id,
+                sender_id=alice.id,
+                content="Hi Bob",
+                read=True,
+                created_at=now - timedelta(hours=2),
+            ),
+            Message(
+                match_id=with_bob.id,
+                sender_id=bob.id,
+                content="Hello!" * 50,
+                created_at=now - timedelta(hours=1),
+            ),
+        ]
+    )
+    # A drifted summary for Bob and a stale one for Carol, who has no messages
+    db.add_all(
+        [
+            Conversation(match_id=with_bob.id, user1_unread=7),
+            Conversation(match_id=with_carol.id, user1_unread=2),
+        ]
+    )
+    db.commit()
+    bob_id, carol_id, carol_match_id = bob.id, carol.id, with_carol.id
+
+    # Messages were inserted directly, so the summaries come from the repair job
+    with patch("app.tasks.matches.SessionLocal", TestingSessionLocal):
+        assert rebuild_conversations() == 1
+    assert db.get(Conversation, carol_match_id) is None
+
+    first = client.get("/matches/inbox?limit=1", headers=headers).json()
+    (entry,) = first["items"]
+    assert entry["other_user_id"] == bob_id
+    assert entry["other_profile"]["headline"] == "bob@example.com headline"
+    assert entry["last_message_preview"] == ("Hello!" * 50)[:100]
+    assert entry["last_sender_id"] == bob_id
+    assert entry["unread_count"] == 1
+
+    second = client.get(
+        "/matches/inbox", params={"limit": 1, "cursor": first["next_cursor"]}, headers=headers
+    ).json()
+    (entry,) = second["items"]
+    assert entry["other_user_id"] == carol_id
+    assert entry["last_message_preview"] is None
+    assert entry["unread_count"] == 0
+    assert second["next_cursor"] is None
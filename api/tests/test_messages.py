@@ -0,0 +1,156 @@
+"""Tests for message endpoints."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from app.models.message import Conversation, Message, UserUnreadCounter
+from app.models.user import UserRole
+from app.tasks.matches import reconcile_unread_counters
+from tests.conftest import TestingSessionLocal, auth_headers, make_match, make_user
+
+
+def test_conversation_summary_follows_sends_and_reads(client, db: Session):
+    """Sending updates the summary and unread count; reading takes it off once."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    match = make_match(alice, bob)
+    db.add(match)
+    db.commit()
+    match_id, bob_id = match.id, bob.id
+    alice_unread = "user1_unread" if alice.id == match.user1_id else "user2_unread"
+    alice_headers, bob_headers = auth_headers(alice), auth_headers(bob)
+
+    sent = [
+        client.post(
+            "/messages", json={"match_id": match_id, "content": text}, headers=bob_headers
+        ).json()
+        for text in ("Hi", "Are you free?")
+    ]
+
+    summary = db.get(Conversation, match_id)
+    assert summary.last_message_id == sent[-1]["id"]
+    assert summary.last_sender_id == bob_id
+    assert getattr(summary, alice_unread) == 2
+
+    for _ in range(2):
+        response = client.put(f"/messages/{sent[0]['id']}/read", headers=alice_headers)
+        assert response.status_code == 200
+        assert response.json()["read"] is True
+
+    db.refresh(summary)
+    assert getattr(summary, alice_unread) == 1
+
+
+def test_unread_badge_counter(client, db: Session):
+    """The badge follows sends, reads and unmatches, and reconciles to the same value."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    carol = make_user(db, "carol@example.com")
+    with_bob, with_carol = make_match(alice, bob), make_match(alice, carol)
+    db.add_all([with_bob, with_carol])
+    db.commit()
+    match_ids = {"bob": with_bob.id, "carol": with_carol.id}
+    bob_id = bob.id
+    alice_headers = auth_headers(alice)
+    senders = {"bob": auth_headers(bob), "carol": auth_headers(carol)}
+
+    def send(sender):
+        return client.post(
+            "/messages",
+            json={"match_id": match_ids[sender], "content": "Hello"},
+            headers=senders[sender],
+        ).json()
+
+    def badge():
+        return client.get("/messages/unread/count", headers=alice_headers).json()["unread_count"]
+
+    first = send("bob")
+    send("bob")
+    send("carol")
+    assert badge() == 3
+
+    client.put(f"/messages/{first['id']}/read", headers=alice_headers)
+    assert badge() == 2
+
+    client.delete(f"/matches/{match_ids['carol']}", headers=alice_headers)
+    assert badge() == 1
+
+    # Drift Alice's counter and give Bob one though he has nothing unread
+    db.query(UserUnreadCounter).update({"unread_count": 9})
+    db.add(UserUnreadCounter(user_id=bob_id, unread_count=5))
+    db.commit()
+    with patch("app.tasks.matches.SessionLocal", TestingSessionLocal):
+        assert reconcile_unread_counters() == 1
+    assert badge() == 1
+    bob_badge = client.get("/messages/unread/count", headers=senders["bob"]).json()
+    assert bob_badge["unread_count"] == 0
+
+
+def test_mark_match_read_up_to(client, db: Session):
+    """Reading up to a message marks everything before it in one request."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    match = make_match(alice, bob)
+    db.add(match)
+    db.commit()
+    match_id = match.id
+    alice_headers, bob_headers = auth_headers(alice), auth_headers(bob)
+
+    sent = [
+        client.post(
+            "/messages", json={"match_id": match_id, "content": f"#{i}"}, headers=bob_headers
+        ).json()
+        for i in range(5)
+    ]
+    client.post("/messages", json={"match_id": match_id, "content": "Hi"}, headers=alice_headers)
+
+    response = client.put(
+        f"/messages/match/{match_id}/read", params={"up_to": sent[2]["id"]}, headers=alice_headers
+    )
+    assert response.json()["marked_read"] == 3
+    assert client.get("/messages/unread/count", headers=alice_headers).json()["unread_count"] == 2
+
+    response = client.put(f"/messages/match/{match_id}/read", headers=alice_headers)
+    assert response.json()["marked_read"] == 2
+    assert client.get("/messages/unread/count", headers=alice_headers).json()["unread_count"] == 0
+    assert client.get("/messages/unread/count", headers=bob_headers).json()["unread_count"] == 1
+
+
+def test_message_history_keyset_pagination(client, db: Session):
+    """History loads newest first by before_id and syncs forward by after_id and since."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    match = make_match(alice, bob)
+    db.add(match)
+    db.flush()
+    start = datetime.utcnow() - timedelta(hours=1)
+    # Pairs of messages share a timestamp, so pages must break ties by id
+    messages = [
+        Message(
+            match_id=match.id,
+            sender_id=bob.id,
+            content=f"#{i}",
+            created_at=start + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    ]
+    db.add_all(messages)
+    db.commit()
+    match_id, ids = match.id, [m.id for m in messages]
+    url, headers = f"/messages/match/{match_id}", auth_headers(alice)
+
+    def page(**params):
+        return [m["id"] for m in client.get(url, params=params, headers=headers).json()]
+
+    assert page(limit=3) == ids[4:]
+    assert page(limit=3, before_id=ids[4]) == ids[1:4]
+    assert page(limit=3, before_id=ids[1]) == ids[:1]
+
+    assert page(limit=3, after_id=ids[2]) == ids[3:6]
+    assert page(limit=3, after_id=ids[5]) == ids[6:]
+    assert page(since=(start + timedelta(minutes=2)).isoformat()) == ids[6:]
+
+    response = client.get(url, params={"before_id": ids[3], "after_id": ids[1]}, headers=headers)
+    assert response.status_code == 400
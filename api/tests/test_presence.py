@@ -0,0 +1,91 @@
+"""Tests for presence and typing indicators."""
+
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+from app.core.presence import TYPING_COALESCE_SECONDS, TYPING_PREFIX, get_online, presence_key
+from app.core.realtime import is_ephemeral, publish_event, user_channel, user_stream
+from app.models.user import UserRole
+from tests.conftest import auth_headers, make_match, make_user
+
+
+def test_get_online_reads_all_users_at_once(redis_server):
+    """One MGET answers for the whole page; a Redis outage reports everyone offline."""
+    with patch("app.core.presence.redis_client.mget", return_value=[b"1", None]) as mget:
+        assert get_online([3, 4, 3]) == {3}
+    mget.assert_called_once_with([presence_key(3), presence_key(4)])
+
+    redis_server.connected = False
+    assert get_online([3, 4]) == set()
+
+
+def test_match_lists_include_presence(client, db: Session):
+    """GET /matches and the inbox mark which other users are online."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    carol = make_user(db, "carol@example.com")
+    db.add_all([make_match(alice, bob), make_match(alice, carol)])
+    db.commit()
+    bob_id, headers = bob.id, auth_headers(alice)
+
+    with patch("app.routers.matches.get_online", return_value={bob_id}):
+        matches = client.get("/matches", headers=headers).json()
+        inbox = client.get("/matches/inbox", headers=headers).json()["items"]
+
+    assert {m["user1_id"] + m["user2_id"] - alice.id: m["other_user_online"] for m in matches} == {
+        bob_id: True,
+        carol.id: False,
+    }
+    assert {e["other_user_id"]: e["other_user_online"] for e in inbox} == {
+        bob_id: True,
+        carol.id: False,
+    }
+
+
+def test_typing_events_are_coalesced(client, db: Session, redis):
+    """Only the first call per user and match in the window publishes a typing event."""
+    alice = make_user(db, "alice@example.com", UserRole.HIRER)
+    bob = make_user(db, "bob@example.com")
+    carol = make_user(db, "carol@example.com")
+    match = make_match(alice, bob)
+    db.add(match)
+    db.commit()
+    match_id, alice_id, bob_id = match.id, alice.id, bob.id
+
+    with patch("app.routers.messages.publish_event") as publish:
+        for headers in (auth_headers(alice), auth_headers(alice), auth_headers(bob)):
+            response = client.post(f"/messages/match/{match_id}/typing", headers=headers)
+            assert response.status_code == 204
+
+        # Non-members are rejected on every call and do not use up the window
+        carol_headers = auth_headers(carol)
+        for _ in range(2):
+            response = client.post(f"/messages/match/{match_id}/typing", headers=carol_headers)
+            assert response.status_code == 403
+        response = client.post("/messages/match/9999/typing", headers=carol_headers)
+        assert response.status_code == 404
+
+    assert [c.args[:2] for c in publish.call_args_list] == [
+        ([bob_id], "typing"),
+        ([alice_id], "typing"),
+    ]
+    assert all(c.kwargs == {"ephemeral": True} for c in publish.call_args_list)
+    assert 0 < redis.ttl(f"{TYPING_PREFIX}{match_id}:{alice_id}") <= TYPING_COALESCE_SECONDS
+    assert redis.keys(f"{TYPING_PREFIX}*:{carol.id}") == []
+
+
+def test_ephemeral_events_skip_replay_stream(redis):
+    """Typing events reach connected clients but never enter the Last-Event-ID stream."""
+    pubsub = redis.pubsub()
+    pubsub.subscribe(user_channel(5))
+    pubsub.get_message()
+
+    publish_event([5], "typing", {"match_id": 1}, ephemeral=True)
+    publish_event([5], "message", {"id": 1})
+
+    assert [fields for _, fields in redis.xrange(user_stream(5))] == [
+        {b"payload": b'{"type": "message", "data": {"id": 1}}'}
+    ]
+    published = [pubsub.get_message()["data"] for _ in range(2)]
+    assert is_ephemeral(published[0]) and not is_ephemeral(published[1])
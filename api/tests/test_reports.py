@@ -0,0 +1,54 @@
+"""Tests for report endpoints."""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.targets import invalidate_target
+from app.models.user import UserRole
+from tests.conftest import auth_headers, make_user
+
+
+@pytest.fixture
+def reporter(db: Session):
+    return make_user(db, "reporter@example.com", UserRole.HIRER)
+
+
+@pytest.fixture
+def designer(db: Session):
+    return make_user(db, "designer@example.com")
+
+
+def report(client, user, target_id: int, report_type: str = "profile"):
+    return client.post(
+        "/reports",
+        json={"report_type": report_type, "target_id": target_id, "reason": "spam"},
+        headers=auth_headers(user),
+    )
+
+
+def test_report_profile(client, reporter, designer):
+    """Reporting another user's profile is accepted."""
+    assert report(client, reporter, designer.profile.id).status_code == 201
+
+
+def test_report_missing_target(client, reporter):
+    """Reports on profiles and listings that do not exist are rejected."""
+    assert report(client, reporter, 9999).status_code == 404
+    assert report(client, reporter, 9999, "listing").status_code == 404
+
+
+def test_report_inactive_target(client, db: Session, reporter, designer):
+    """Reports on a deactivated profile are rejected as not found."""
+    designer.profile.is_active = False
+    db.commit()
+    invalidate_target("profile", designer.profile.id)
+
+    assert report(client, reporter, designer.profile.id).status_code == 404
+
+
+def test_report_own_content(client, reporter):
+    """Users cannot report their own profile."""
+    response = report(client, reporter, reporter.profile.id)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "You cannot report your own profile"
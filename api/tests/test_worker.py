@@ -0,0 +1,40 @@
+"""Tests for the periodic job scheduler."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.worker import PERIODIC_JOBS, schedule_periodic_jobs
+
+
+@pytest.fixture
+def task_queue(redis):
+    """Run the scheduler against the test's Redis with a recording queue."""
+    with patch("app.worker.redis_conn", redis), patch("app.worker.task_queue") as queue:
+        yield queue
+
+
+def enqueued(task_queue) -> list:
+    return [c.args[0] for c in task_queue.enqueue.call_args_list]
+
+
+def test_each_job_is_enqueued_once_per_interval(task_queue, redis):
+    """Scheduler ticks within a job's interval do not enqueue it again."""
+    tasks = [task for task, _ in PERIODIC_JOBS.values()]
+
+    for _ in range(3):
+        schedule_periodic_jobs()
+    assert enqueued(task_queue) == tasks
+
+    for name, (_, interval) in PERIODIC_JOBS.items():
+        assert 0 < redis.ttl(f"periodic:{name}") <= interval
+
+
+def test_job_is_enqueued_again_after_its_interval(task_queue, redis):
+    """Once a job's guard key expires the next tick enqueues it again."""
+    schedule_periodic_jobs()
+    redis.delete("periodic:expire_boosts")
+    schedule_periodic_jobs()
+
+    assert enqueued(task_queue).count(PERIODIC_JOBS["expire_boosts"][0]) == 2
+    assert len(enqueued(task_queue)) == len(PERIODIC_JOBS) + 1
@@ -0,0 +1,50 @@
+"""Add annualized compensation columns to listings
+
+Revision ID: a63df53b4874
+Revises: 2e63e3bee402
+Create Date: 2026-10-19 09:00:12.418253
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a63df53b4874"
+down_revision = "2e63e3bee402"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("listings", sa.Column("comp_annual_min", sa.Numeric(12, 2), nullable=True))
+    op.add_column("listings", sa.Column("comp_annual_max", sa.Numeric(12, 2), nullable=True))
+
+    # Backfill from the existing compensation fields (40h/week * 50 weeks for hourly rates).
+    # LEAST/GREATEST ignore NULL arguments, matching annualize_compensation().
+    op.execute("""
+        UPDATE listings
+        SET comp_annual_min = LEAST(salary_min, hourly_rate * 2000),
+            comp_annual_max = GREATEST(salary_max, hourly_rate * 2000)
+        """)
+
+    op.create_index(
+        "idx_listings_status_active_comp_max",
+        "listings",
+        ["status", "is_active", "comp_annual_max"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_listings_status_active_comp_min",
+        "listings",
+        ["status", "is_active", "comp_annual_min"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_listings_status_active_comp_min", table_name="listings")
+    op.drop_index("idx_listings_status_active_comp_max", table_name="listings")
+    op.drop_column("listings", "comp_annual_max")
+    op.drop_column("listings", "comp_annual_min")
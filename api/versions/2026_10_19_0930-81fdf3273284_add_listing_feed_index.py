@@ -0,0 +1,31 @@
+"""Add partial index matching the listing feed ordering
+
+Revision ID: 81fdf3273284
+Revises: a63df53b4874
+Create Date: 2026-10-19 09:30:41.902114
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "81fdf3273284"
+down_revision = "a63df53b4874"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_listings_active_feed",
+        "listings",
+        ["status", sa.text("is_boosted DESC"), sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_listings_active_feed", table_name="listings")
@@ -0,0 +1,57 @@
+"""Index boosted listings by boosted_until and reorder the feed index
+
+Revision ID: 4e982fd969bf
+Revises: 81fdf3273284
+Create Date: 2026-10-19 10:00:27.551380
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4e982fd969bf"
+down_revision = "81fdf3273284"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Boosted listings are now ranked from a small partial index on boosted_until,
+    # and the remaining feed is walked newest first.
+    op.drop_index("idx_listings_active_feed", table_name="listings")
+    op.drop_index("ix_listings_is_boosted", table_name="listings")
+    op.create_index(
+        "idx_listings_active_feed",
+        "listings",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "idx_listings_boosted_until",
+        "listings",
+        ["boosted_until"],
+        unique=False,
+        postgresql_where=sa.text("is_boosted"),
+    )
+
+    # Expire boosts that already ended
+    op.execute(
+        "UPDATE listings SET is_boosted = false"
+        " WHERE is_boosted AND boosted_until <= (now() AT TIME ZONE 'utc')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_listings_boosted_until", table_name="listings")
+    op.drop_index("idx_listings_active_feed", table_name="listings")
+    op.create_index("ix_listings_is_boosted", "listings", ["is_boosted"], unique=False)
+    op.create_index(
+        "idx_listings_active_feed",
+        "listings",
+        ["status", sa.text("is_boosted DESC"), sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
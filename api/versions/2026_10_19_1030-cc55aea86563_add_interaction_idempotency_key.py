@@ -0,0 +1,31 @@
+"""Add idempotency key to interactions
+
+Revision ID: cc55aea86563
+Revises: 4e982fd969bf
+Create Date: 2026-10-19 10:30:12.408215
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "cc55aea86563"
+down_revision = "4e982fd969bf"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Swipes flushed from the interaction log carry a key so that redelivered
+    # events are skipped with ON CONFLICT DO NOTHING.
+    op.add_column("interactions", sa.Column("idempotency_key", sa.String(length=36), nullable=True))
+    op.create_unique_constraint(
+        "uq_interactions_idempotency_key", "interactions", ["idempotency_key"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_interactions_idempotency_key", "interactions", type_="unique")
+    op.drop_column("interactions", "idempotency_key")
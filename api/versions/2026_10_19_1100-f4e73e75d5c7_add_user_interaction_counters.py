@@ -0,0 +1,49 @@
+"""Add per-user interaction counters
+
+Revision ID: f4e73e75d5c7
+Revises: cc55aea86563
+Create Date: 2026-10-19 11:00:41.730952
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f4e73e75d5c7"
+down_revision = "cc55aea86563"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_interaction_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("like_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("skip_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("apply_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("super_like_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # Backfill from existing interactions (actions are stored by enum name)
+    op.execute(
+        """
+        INSERT INTO user_interaction_counters
+            (user_id, like_count, skip_count, apply_count, super_like_count)
+        SELECT user_id,
+               count(*) FILTER (WHERE action = 'LIKE'),
+               count(*) FILTER (WHERE action = 'SKIP'),
+               count(*) FILTER (WHERE action = 'APPLY'),
+               count(*) FILTER (WHERE action = 'SUPER_LIKE')
+        FROM interactions
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_interaction_counters")
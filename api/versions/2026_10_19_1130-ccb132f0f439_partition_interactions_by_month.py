@@ -0,0 +1,168 @@
+"""Partition interactions by month and action
+
+Revision ID: ccb132f0f439
+Revises: f4e73e75d5c7
+Create Date: 2026-10-19 11:30:08.114732
+
+"""
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "ccb132f0f439"
+down_revision = "f4e73e75d5c7"
+branch_labels = None
+depends_on = None
+
+# Future months created up front; afterwards the partition job keeps them ahead
+PARTITIONS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    years, index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def create_month_partition(parent: str, month: date) -> None:
+    name = f"interactions_{month:%Y_%m}"
+    op.execute(
+        f"CREATE TABLE {name} PARTITION OF {parent}"
+        f" FOR VALUES FROM ('{month} 00:00:00+00') TO ('{add_months(month, 1)} 00:00:00+00')"
+        " PARTITION BY LIST (action)"
+    )
+    op.execute(f"CREATE TABLE {name}_skip PARTITION OF {name} FOR VALUES IN ('SKIP')")
+    op.execute(f"CREATE TABLE {name}_other PARTITION OF {name} DEFAULT")
+
+
+def upgrade() -> None:
+    # Monthly RANGE partitions on created_at, each LIST partitioned by action so cold
+    # skips can be detached and archived. The id sequence is kept and moved over.
+    bind = op.get_bind()
+    first = bind.execute(
+        sa.text("SELECT min(created_at) AT TIME ZONE 'UTC' FROM interactions")
+    ).scalar()
+    this_month = date.today().replace(day=1)
+    month = first.date().replace(day=1) if first else this_month
+
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE interactions_partitioned (
+            id integer NOT NULL DEFAULT nextval('interactions_id_seq'),
+            user_id integer NOT NULL,
+            target_type varchar(20) NOT NULL,
+            target_id integer NOT NULL,
+            action varchar(10) NOT NULL,
+            created_at timestamp with time zone NOT NULL DEFAULT now(),
+            idempotency_key varchar(36)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+    while month <= add_months(this_month, PARTITIONS_AHEAD):
+        create_month_partition("interactions_partitioned", month)
+        month = add_months(month, 1)
+
+    op.execute(
+        """
+        INSERT INTO interactions_partitioned
+            (id, user_id, target_type, target_id, action, created_at, idempotency_key)
+        SELECT id, user_id, target_type, target_id, action, COALESCE(created_at, now()),
+               idempotency_key
+        FROM interactions
+        """
+    )
+    op.drop_table("interactions")
+    op.rename_table("interactions_partitioned", "interactions")
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY interactions.id")
+
+    # Keys on a partitioned table must include the partition columns
+    op.create_primary_key("interactions_pkey", "interactions", ["id", "created_at", "action"])
+    op.create_foreign_key(
+        "interactions_user_id_fkey",
+        "interactions",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_unique_constraint(
+        "uq_interactions_idempotency_key",
+        "interactions",
+        ["idempotency_key", "created_at", "action"],
+    )
+
+    # Indexes on id, action and created_at are dropped: the primary key leads with id,
+    # and action and created_at are served by partition pruning.
+    op.create_index(
+        "idx_user_target_type_action",
+        "interactions",
+        ["user_id", "target_type", "target_id", "action"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_interactions_target_id"), "interactions", ["target_id"], unique=False)
+    op.create_index(op.f("ix_interactions_user_id"), "interactions", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    # Skips in archived partitions are not restored
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY NONE")
+    op.create_table(
+        "interactions_unpartitioned",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('interactions_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("target_type", sa.String(length=20), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(length=10), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.Column("idempotency_key", sa.String(length=36), nullable=True),
+    )
+    op.execute(
+        """
+        INSERT INTO interactions_unpartitioned
+            (id, user_id, target_type, target_id, action, created_at, idempotency_key)
+        SELECT id, user_id, target_type, target_id, action, created_at, idempotency_key
+        FROM interactions
+        """
+    )
+    # Dropping the parent drops every partition
+    op.drop_table("interactions")
+    op.rename_table("interactions_unpartitioned", "interactions")
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY interactions.id")
+
+    op.create_primary_key("interactions_pkey", "interactions", ["id"])
+    op.create_foreign_key(
+        "interactions_user_id_fkey",
+        "interactions",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_unique_constraint(
+        "uq_interactions_idempotency_key", "interactions", ["idempotency_key"]
+    )
+    op.create_index(
+        "idx_user_target_type_action",
+        "interactions",
+        ["user_id", "target_type", "target_id", "action"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_interactions_action"), "interactions", ["action"], unique=False)
+    op.create_index(
+        op.f("ix_interactions_created_at"), "interactions", ["created_at"], unique=False
+    )
+    op.create_index(op.f("ix_interactions_id"), "interactions", ["id"], unique=False)
+    op.create_index(op.f("ix_interactions_target_id"), "interactions", ["target_id"], unique=False)
+    op.create_index(op.f("ix_interactions_user_id"), "interactions", ["user_id"], unique=False)
@@ -0,0 +1,148 @@
+"""Store interaction target type and action as smallint codes
+
+Revision ID: 0bad43492c98
+Revises: ccb132f0f439
+Create Date: 2026-10-19 12:00:51.902617
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0bad43492c98"
+down_revision = "ccb132f0f439"
+branch_labels = None
+depends_on = None
+
+# Must match TARGET_TYPE_CODES and ACTION_CODES in app/models/interaction.py
+TARGET_TYPE_CODES = {"profile": 1, "listing": 2}
+ACTION_CODES = {"LIKE": 1, "SKIP": 2, "APPLY": 3, "SUPER_LIKE": 4}
+
+# Widest columns first so rows pack without alignment padding
+CODED_COLUMNS = """
+    id integer NOT NULL DEFAULT nextval('interactions_id_seq'),
+    user_id integer NOT NULL,
+    created_at timestamp with time zone NOT NULL DEFAULT now(),
+    target_id integer NOT NULL,
+    target_type smallint NOT NULL,
+    action smallint NOT NULL,
+    idempotency_key varchar(36)
+"""
+
+TEXT_COLUMNS = """
+    id integer NOT NULL DEFAULT nextval('interactions_id_seq'),
+    user_id integer NOT NULL,
+    target_type varchar(20) NOT NULL,
+    target_id integer NOT NULL,
+    action varchar(10) NOT NULL,
+    created_at timestamp with time zone NOT NULL DEFAULT now(),
+    idempotency_key varchar(36)
+"""
+
+
+def case(column: str, mapping: dict) -> str:
+    whens = " ".join(f"WHEN {k!r} THEN {v!r}" for k, v in mapping.items())
+    return f"CASE {column} {whens} END"
+
+
+def rebuild(columns: str, skip_value, target_type_expr: str, action_expr: str) -> None:
+    """
+    Copy interactions into a new partitioned table with the given column layout.
+
+    Partition keys cannot change type in place, so the table is rebuilt. Every month
+    partition is recreated; a skip sub-partition only where one is still attached,
+    so archived months are not archived again.
+    """
+    bind = op.get_bind()
+    months = bind.execute(
+        sa.text(
+            """
+            SELECT c.relname,
+                   pg_get_expr(c.relpartbound, c.oid),
+                   to_regclass(c.relname || '_skip') IN (
+                       SELECT inhrelid FROM pg_inherits WHERE inhparent = c.oid
+                   )
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'interactions'::regclass
+            ORDER BY c.relname
+            """
+        )
+    ).all()
+
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY NONE")
+    op.execute(f"CREATE TABLE interactions_new ({columns}) PARTITION BY RANGE (created_at)")
+
+    for name, bound, has_skip in months:
+        op.execute(
+            f"CREATE TABLE {name}_new PARTITION OF interactions_new {bound}"
+            " PARTITION BY LIST (action)"
+        )
+        if has_skip:
+            op.execute(
+                f"CREATE TABLE {name}_skip_new PARTITION OF {name}_new"
+                f" FOR VALUES IN ({skip_value!r})"
+            )
+        op.execute(f"CREATE TABLE {name}_other_new PARTITION OF {name}_new DEFAULT")
+
+    op.execute(
+        f"""
+        INSERT INTO interactions_new
+            (id, user_id, created_at, target_id, target_type, action, idempotency_key)
+        SELECT id, user_id, created_at, target_id, {target_type_expr}, {action_expr},
+               idempotency_key
+        FROM interactions
+        """
+    )
+    op.drop_table("interactions")
+
+    op.rename_table("interactions_new", "interactions")
+    for name, _, has_skip in months:
+        op.rename_table(f"{name}_new", name)
+        op.rename_table(f"{name}_other_new", f"{name}_other")
+        if has_skip:
+            op.rename_table(f"{name}_skip_new", f"{name}_skip")
+    op.execute("ALTER SEQUENCE interactions_id_seq OWNED BY interactions.id")
+
+    op.create_primary_key("interactions_pkey", "interactions", ["id", "created_at", "action"])
+    op.create_foreign_key(
+        "interactions_user_id_fkey",
+        "interactions",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_unique_constraint(
+        "uq_interactions_idempotency_key",
+        "interactions",
+        ["idempotency_key", "created_at", "action"],
+    )
+    op.create_index(
+        "idx_user_target_type_action",
+        "interactions",
+        ["user_id", "target_type", "target_id", "action"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_interactions_target_id"), "interactions", ["target_id"], unique=False)
+    op.create_index(op.f("ix_interactions_user_id"), "interactions", ["user_id"], unique=False)
+
+
+def upgrade() -> None:
+    rebuild(
+        CODED_COLUMNS,
+        ACTION_CODES["SKIP"],
+        case("target_type", TARGET_TYPE_CODES),
+        case("action", ACTION_CODES),
+    )
+
+
+def downgrade() -> None:
+    rebuild(
+        TEXT_COLUMNS,
+        "SKIP",
+        case("target_type", {v: k for k, v in TARGET_TYPE_CODES.items()}),
+        case("action", {v: k for k, v in ACTION_CODES.items()}),
+    )
@@ -0,0 +1,92 @@
+"""Covering dedupe index and reverse-direction index on interactions
+
+Revision ID: 23d59764bd4f
+Revises: 0bad43492c98
+Create Date: 2026-10-19 12:30:17.664083
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "23d59764bd4f"
+down_revision = "0bad43492c98"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "idx_interactions_dedupe": "(user_id, target_type, target_id, action) INCLUDE (created_at)",
+    "idx_interactions_reverse": "(target_type, target_id, action, user_id)",
+}
+
+
+def partition_tree():
+    """Partitioned tables (parent first) and leaf partitions under interactions."""
+    rows = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT relid::regclass::text, isleaf, level
+            FROM pg_partition_tree('interactions')
+            ORDER BY level, relid::regclass::text
+            """
+        )
+    ).all()
+    partitioned = [name for name, isleaf, _ in rows if not isleaf]
+    leaves = [name for name, isleaf, _ in rows if isleaf]
+    return partitioned, leaves
+
+
+def parent_of(table: str) -> str:
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT inhparent::regclass::text FROM pg_inherits"
+            " WHERE inhrelid = CAST(:t AS regclass)"
+        ),
+        {"t": table},
+    ).scalar()
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY is not supported on partitioned tables. Instead an
+    # invalid index is created ON ONLY each partitioned table, each leaf partition is
+    # indexed concurrently, and the leaf indexes are attached; a parent index becomes
+    # valid once all its partitions' indexes are attached. Writes are never blocked.
+    partitioned, leaves = partition_tree()
+
+    for name, definition in INDEXES.items():
+        for table in partitioned:
+            index = name if table == "interactions" else f"{table}_{name[4:]}"
+            op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON ONLY {table} {definition}")
+
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            for table in leaves:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_{name[4:]}"
+                    f" ON {table} {definition}"
+                )
+
+    for name in INDEXES:
+        # Leaves first, then month-level indexes, so each attach completes its parent
+        for table in leaves + partitioned[:0:-1]:
+            parent = parent_of(table)
+            parent_index = name if parent == "interactions" else f"{parent}_{name[4:]}"
+            op.execute(f"ALTER INDEX {parent_index} ATTACH PARTITION {table}_{name[4:]}")
+
+    # Superseded: the dedupe index has the same keys, the reverse index serves target_id
+    op.drop_index("idx_user_target_type_action", table_name="interactions")
+    op.drop_index("ix_interactions_target_id", table_name="interactions")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "idx_user_target_type_action",
+        "interactions",
+        ["user_id", "target_type", "target_id", "action"],
+        unique=False,
+    )
+    op.create_index("ix_interactions_target_id", "interactions", ["target_id"], unique=False)
+    op.drop_index("idx_interactions_reverse", table_name="interactions")
+    op.drop_index("idx_interactions_dedupe", table_name="interactions")
@@ -0,0 +1,68 @@
+"""Store matches as a canonical user pair with a unique index
+
+Revision ID: f7c3a1b67ee6
+Revises: 23d59764bd4f
+Create Date: 2026-10-19 13:00:42.318950
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f7c3a1b67ee6"
+down_revision = "23d59764bd4f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Duplicate matches of the same pair (in either order) keep one survivor, active
+    # first then oldest; their messages are moved to it before they are deleted
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE match_survivors ON COMMIT DROP AS
+        SELECT id, first_value(id) OVER (
+                   PARTITION BY least(user1_id, user2_id), greatest(user1_id, user2_id)
+                   ORDER BY is_active IS TRUE DESC, id
+               ) AS survivor_id
+        FROM matches
+        """
+    )
+    op.execute(
+        """
+        UPDATE messages SET match_id = s.survivor_id
+        FROM match_survivors s
+        WHERE messages.match_id = s.id AND s.id <> s.survivor_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM matches
+        USING match_survivors s
+        WHERE matches.id = s.id AND s.id <> s.survivor_id
+        """
+    )
+    # A user cannot match themselves; such rows could only come from the old bug
+    # that compared profile ids with user ids
+    op.execute("DELETE FROM matches WHERE user1_id = user2_id")
+
+    # The right-hand side sees the old row, so this swaps the two columns
+    op.execute(
+        """
+        UPDATE matches SET user1_id = user2_id, user2_id = user1_id
+        WHERE user1_id > user2_id
+        """
+    )
+
+    op.create_unique_constraint("uq_matches_pair", "matches", ["user1_id", "user2_id"])
+    op.create_check_constraint("ck_matches_canonical_pair", "matches", "user1_id < user2_id")
+
+    # Superseded by the unique index, which leads with user1_id
+    op.drop_index("ix_matches_user1_id", table_name="matches")
+
+
+def downgrade() -> None:
+    op.create_index("ix_matches_user1_id", "matches", ["user1_id"], unique=False)
+    op.drop_constraint("ck_matches_canonical_pair", "matches", type_="check")
+    op.drop_constraint("uq_matches_pair", "matches", type_="unique")
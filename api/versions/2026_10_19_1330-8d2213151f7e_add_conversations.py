@@ -0,0 +1,60 @@
+"""Add per-match conversation summaries
+
+Revision ID: 8d2213151f7e
+Revises: f7c3a1b67ee6
+Create Date: 2026-10-19 13:30:08.551274
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8d2213151f7e"
+down_revision = "f7c3a1b67ee6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversations",
+        sa.Column("match_id", sa.Integer(), nullable=False),
+        sa.Column("last_message_id", sa.Integer(), nullable=True),
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_sender_id", sa.Integer(), nullable=True),
+        sa.Column("user1_unread", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("user2_unread", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["match_id"], ["matches.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["last_message_id"], ["messages.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("match_id"),
+    )
+
+    # Backfill from existing messages; the last message is the one with the highest id
+    op.execute(
+        """
+        INSERT INTO conversations
+            (match_id, last_message_id, last_message_at, last_sender_id,
+             user1_unread, user2_unread)
+        SELECT s.match_id, m.id, m.created_at, m.sender_id, s.user1_unread, s.user2_unread
+        FROM (
+            SELECT msg.match_id,
+                   max(msg.id) AS last_message_id,
+                   count(*) FILTER (
+                       WHERE msg.read IS NOT TRUE AND msg.sender_id = mt.user2_id
+                   ) AS user1_unread,
+                   count(*) FILTER (
+                       WHERE msg.read IS NOT TRUE AND msg.sender_id = mt.user1_id
+                   ) AS user2_unread
+            FROM messages msg
+            JOIN matches mt ON mt.id = msg.match_id
+            GROUP BY msg.match_id
+        ) s
+        JOIN messages m ON m.id = s.last_message_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("conversations")
@@ -0,0 +1,46 @@
+"""Add per-user unread message counters
+
+Revision ID: 7f2721179bb8
+Revises: 8d2213151f7e
+Create Date: 2026-10-19 14:00:27.093816
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7f2721179bb8"
+down_revision = "8d2213151f7e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_unread_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # Backfill: unread messages each user received in active matches
+    op.execute(
+        """
+        INSERT INTO user_unread_counters (user_id, unread_count)
+        SELECT CASE WHEN msg.sender_id = mt.user1_id THEN mt.user2_id ELSE mt.user1_id END,
+               count(*)
+        FROM messages msg
+        JOIN matches mt ON mt.id = msg.match_id
+        WHERE msg.read IS NOT TRUE
+          AND mt.is_active IS TRUE
+          AND mt.unmatched IS NOT TRUE
+        GROUP BY 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_unread_counters")
@@ -0,0 +1,28 @@
+"""Keep archived skips in the interaction counters
+
+Revision ID: 822a166e2eb3
+Revises: 7f2721179bb8
+Create Date: 2026-10-19 14:30:11.582304
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "822a166e2eb3"
+down_revision = "7f2721179bb8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user_interaction_counters",
+        sa.Column("archived_skip_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user_interaction_counters", "archived_skip_count")
@@ -0,0 +1,33 @@
+"""Drop the unused reverse-direction index on interactions
+
+Revision ID: cf46df388482
+Revises: 822a166e2eb3
+Create Date: 2026-10-19 15:00:42.917310
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "cf46df388482"
+down_revision = "822a166e2eb3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reverse likes are found by swapping the pair and probing idx_interactions_dedupe
+    # (find_reverse_likes), so nothing reads this index; dropping it on the parent
+    # drops every partition's index too
+    op.drop_index("idx_interactions_reverse", table_name="interactions")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "idx_interactions_reverse",
+        "interactions",
+        ["target_type", "target_id", "action", "user_id"],
+        unique=False,
+    )
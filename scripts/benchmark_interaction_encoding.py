@@ -0,0 +1,135 @@
+"""
+Benchmark string vs smallint encoding of the interactions table.
+
+Builds two copies of a synthetic interactions table in a scratch schema, one with
+the old varchar target_type/action columns and one with the smallint codes and
+alignment-friendly column order, then reports table and index sizes and the
+execution time of the dedupe and per-action stats queries on each.
+
+Usage (from api/, against a scratch database):
+    PYTHONPATH=. python ../scripts/benchmark_interaction_encoding.py --rows 1000000
+"""
+
+import argparse
+import json
+import random
+import statistics
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+SCHEMA = "interaction_encoding_bench"
+
+LAYOUTS = {
+    "varchar": {
+        "columns": """
+            id integer PRIMARY KEY,
+            user_id integer NOT NULL,
+            target_type varchar(20) NOT NULL,
+            target_id integer NOT NULL,
+            action varchar(10) NOT NULL,
+            created_at timestamp with time zone NOT NULL
+        """,
+        "target_type": "(ARRAY['profile', 'listing'])[1 + (g % 2)]",
+        "action": "(ARRAY['LIKE', 'SKIP', 'SKIP', 'SKIP', 'APPLY'])[1 + (g % 5)]",
+        "profile": "'profile'",
+        "like": "'LIKE'",
+    },
+    "smallint": {
+        "columns": """
+            id integer PRIMARY KEY,
+            user_id integer NOT NULL,
+            created_at timestamp with time zone NOT NULL,
+            target_id integer NOT NULL,
+            target_type smallint NOT NULL,
+            action smallint NOT NULL
+        """,
+        "target_type": "(1 + (g % 2))::smallint",
+        "action": "(ARRAY[1, 2, 2, 2, 3])[1 + (g % 5)]::smallint",
+        "profile": "1",
+        "like": "1",
+    },
+}
+
+
+def build(conn, name: str, layout: dict, rows: int, users: int) -> None:
+    table = f"{SCHEMA}.{name}"
+    conn.execute(text(f"CREATE TABLE {table} ({layout['columns']})"))
+    conn.execute(
+        text(f"""
+            INSERT INTO {table} (id, user_id, target_type, target_id, action, created_at)
+            SELECT g, 1 + (hashint4(g) & 2147483647) % :users, {layout['target_type']},
+                   1 + (hashint4(g + 1) & 2147483647) % 100000, {layout['action']},
+                   now() - (g % 2592000) * interval '1 second'
+            FROM generate_series(1, :rows) AS g
+            """),
+        {"rows": rows, "users": users},
+    )
+    conn.execute(text(f"CREATE INDEX ON {table} (user_id, target_type, target_id, action)"))
+    conn.execute(text(f"CREATE INDEX ON {table} (target_id)"))
+    conn.execute(text(f"CREATE INDEX ON {table} (user_id)"))
+
+
+def time_query(conn, sql: str, samples: list) -> float:
+    """Median execution time in milliseconds over the sample parameters."""
+    timings = []
+    for params in samples:
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()
+        timings.append(plan[0]["Execution Time"])
+    return round(statistics.median(timings), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.postgres_url, isolation_level="AUTOCOMMIT")
+    report = {}
+
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        try:
+            for name, layout in LAYOUTS.items():
+                build(conn, name, layout, args.rows, args.users)
+                conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.{name}"))
+
+            rng = random.Random(0)
+            samples = [
+                {
+                    "user_id": rng.randint(1, args.users),
+                    "target_id": rng.randint(1, 100000),
+                }
+                for _ in range(args.samples)
+            ]
+
+            for name, layout in LAYOUTS.items():
+                table = f"{SCHEMA}.{name}"
+                dedupe = (
+                    f"SELECT 1 FROM {table} WHERE user_id = :user_id"
+                    f" AND target_type = {layout['profile']} AND target_id = :target_id"
+                    f" AND action = {layout['like']}"
+                    " AND created_at >= now() - interval '24 hours' LIMIT 1"
+                )
+                stats = (
+                    f"SELECT action, count(*) FROM {table} WHERE user_id = :user_id GROUP BY action"
+                )
+
+                report[name] = {
+                    "table_bytes": conn.scalar(text(f"SELECT pg_table_size('{table}')")),
+                    "index_bytes": conn.scalar(text(f"SELECT pg_indexes_size('{table}')")),
+                    "dedupe_ms": time_query(conn, dedupe, samples),
+                    "stats_ms": time_query(conn, stats, samples),
+                }
+        finally:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print(json.dumps({"rows": args.rows, **report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
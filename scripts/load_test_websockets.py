@@ -0,0 +1,150 @@
+"""
+Load test idle connections on the real-time event socket.
+
+Opens many WebSocket connections to /events/ws at a fixed rate, holds them idle
+(with periodic pings, like backgrounded mobile clients) and reports how many were
+established, failed or dropped by the server, connect latency, and optionally the
+server process's memory per connection.
+
+Tokens are minted with the API's JWT secret for user ids 1..--users, which must exist
+and be active. A client IP can only hold ~28k connections to one server port, so
+50k connections need two or more --source-ips (e.g. addresses added to lo).
+
+Both sides need enough file descriptors (ulimit -n 100000 or more), and the server
+should run one uvicorn worker per core; each process holds a single Redis
+subscription however many sockets it serves.
+
+Usage (from api/, against a running API):
+    PYTHONPATH=. python ../scripts/load_test_websockets.py --connections 50000 \\
+        --users 1000 --source-ips 127.0.0.2,127.0.0.3 --server-pid 1234
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import time
+from typing import Optional
+
+import websockets
+
+from app.core.security import create_access_token
+
+
+def server_rss(pid: Optional[int]) -> Optional[int]:
+    """Resident memory of the server process in bytes (Linux only)."""
+    if pid is None:
+        return None
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+class Stats:
+    def __init__(self):
+        self.open = 0
+        self.failed = 0
+        self.dropped = 0
+        self.connect_ms = []
+
+
+async def hold_connection(url: str, source_ip: Optional[str], args, stats: Stats, stop):
+    started = time.perf_counter()
+    try:
+        async with websockets.connect(
+            url,
+            ping_interval=args.ping_interval,
+            open_timeout=args.open_timeout,
+            local_addr=(source_ip, 0) if source_ip else None,
+        ) as websocket:
+            stats.connect_ms.append((time.perf_counter() - started) * 1000)
+            stats.open += 1
+            try:
+                closed = asyncio.ensure_future(websocket.wait_closed())
+                await asyncio.wait([closed, stop], return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    stats.dropped += 1
+                closed.cancel()
+            finally:
+                stats.open -= 1
+    except (OSError, asyncio.TimeoutError, websockets.WebSocketException):
+        stats.failed += 1
+
+
+async def report(stats: Stats, interval: float = 5.0):
+    while True:
+        await asyncio.sleep(interval)
+        print(
+            f"open={stats.open} failed={stats.failed} dropped={stats.dropped}",
+            flush=True,
+        )
+
+
+async def run(args) -> dict:
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in range(1, args.users + 1)]
+    source_ips = args.source_ips.split(",") if args.source_ips else [None]
+    stats = Stats()
+    stop = asyncio.get_running_loop().create_future()
+    rss_before = server_rss(args.server_pid)
+
+    reporter = asyncio.create_task(report(stats))
+    tasks = []
+    for i in range(args.connections):
+        url = f"{args.url}?token={tokens[i % len(tokens)]}"
+        tasks.append(
+            asyncio.create_task(
+                hold_connection(url, source_ips[i % len(source_ips)], args, stats, stop)
+            )
+        )
+        await asyncio.sleep(1 / args.rate)
+
+    await asyncio.sleep(args.hold)
+    established = stats.open
+    rss_after = server_rss(args.server_pid)
+
+    stop.set_result(None)
+    await asyncio.gather(*tasks)
+    reporter.cancel()
+
+    latencies = sorted(stats.connect_ms)
+    result = {
+        "target": args.connections,
+        "established_at_end_of_hold": established,
+        "failed": stats.failed,
+        "dropped_by_server": stats.dropped,
+        "connect_ms_p50": round(statistics.median(latencies), 1) if latencies else None,
+        "connect_ms_p99": (
+            round(latencies[int(len(latencies) * 0.99) - 1], 1) if latencies else None
+        ),
+    }
+    if rss_before is not None and rss_after is not None and established:
+        result["server_rss_bytes"] = rss_after
+        result["server_bytes_per_connection"] = (rss_after - rss_before) // established
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="ws://localhost:8000/events/ws")
+    parser.add_argument("--connections", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=1000, help="New connections per second")
+    parser.add_argument("--hold", type=float, default=60, help="Seconds to hold all connections")
+    parser.add_argument("--ping-interval", type=float, default=30)
+    parser.add_argument("--open-timeout", type=float, default=30)
+    parser.add_argument("--source-ips", help="Comma-separated local addresses to connect from")
+    parser.add_argument("--server-pid", type=int, help="Server process to sample memory of")
+    args = parser.parse_args()
+
+    # One descriptor per connection
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()